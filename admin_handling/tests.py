@@ -1,3 +1,46 @@
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from event.models import Club, Department, Event
+from signup.models import Coordinator
+
+HEADER = b"event_name,event_start_date,event_end_date,event_time,event_venue,registration_link\n"
+
+
+@override_settings(STORAGES={
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+})
+class BulkImportTests(TestCase):
+    def setUp(self):
+        cs = Department.objects.create(department_name="CS", password="x", department_description="d")
+        ee = Department.objects.create(department_name="EE", password="x", department_description="d")
+        self.club = Club.objects.create(club_name="GDSC", department_name=cs, club_description="c")
+        Club.objects.create(club_name="IEEE", department_name=ee, club_description="c")
+        Coordinator.objects.create(
+            coordinator_name="lead", coordinator_type="club", club_name=self.club,
+            department_name=cs, email="lead@x.in", password="x",
+        )
+        session = self.client.session
+        session["coordinator_name"] = "lead"
+        session.save()
+
+    def upload(self, body):
+        return self.client.post(reverse("bulk_import_events"), {"file": SimpleUploadedFile("events.csv", body)})
+
+    def test_rows_land_in_the_coordinators_club(self):
+        body = HEADER + b"".join(
+            b"Session %d,2025-03-0%d,2025-03-0%d,10:00,Lab,\n" % (i, i, i) for i in range(1, 4)
+        )
+        response = self.upload(body)
+        self.assertRedirects(response, reverse("coordinator_dashboard"), fetch_redirect_response=False)
+        self.assertEqual(Event.objects.filter(club_name=self.club, department_name="CS").count(), 3)
+
+    def test_errors_are_listed_per_row(self):
+        body = HEADER + b"Ok,2025-03-01,2025-03-01,10:00,Lab,\nBad,not-a-date,2025-03-01,10:00,Lab,\n"
+        response = self.upload(body)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["result"]["errors"][0]["row"], 2)
+        self.assertContains(response, "event_start_date")
+        self.assertFalse(Event.objects.exists())
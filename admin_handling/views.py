@@ -1,6 +1,6 @@
 from django.contrib.auth import logout
-from signup.models import Coordinator
-from event.models import Event,Department
+from signup.coordinators import coordinator_required
+from event.models import Event
 from department.models import Fest,dEvent
 from django.contrib import messages
 from django.shortcuts import render, redirect, get_object_or_404
@@ -8,21 +8,15 @@ from .forms import EventForm
 from .forms1 import EventForm1
 from .forms2 import dEventForm
 
+@coordinator_required
 def create_event(request):
-    if "coordinator_name" not in request.session:
-        return redirect("coordinator_login")  # Redirect to login if not authenticated
+    coordinator = request.coordinator
 
-    try:
-        coordinator = Coordinator.objects.get(coordinator_name=request.session["coordinator_name"])
-
-        if coordinator.coordinator_type != "club" or not coordinator.club_name:
-             messages.error(request, "You are not authorized to access this page.")
-
-        club_instance = coordinator.club_name
-        department_instance = coordinator.department_name  # Get department
+    if coordinator.coordinator_type != "club" or not coordinator.club_name:
+         messages.error(request, "You are not authorized to access this page.")
 
-    except Coordinator.DoesNotExist:
-        return redirect("coordinator_login")
+    club_instance = coordinator.club_name
+    department_instance = coordinator.department_name  # Get department
 
     if request.method == "POST":
         title = request.POST["title"]
@@ -48,20 +42,16 @@ def create_event(request):
 
     return render(request, "event_creation_form.html")
 
+@coordinator_required
 def create_dept_event(request):
-    if "coordinator_name" not in request.session:
-        return redirect("coordinator_login")
-
     try:
-        # Get coordinator and ensure they have a department
-        coordinator = Coordinator.objects.get(coordinator_name=request.session["coordinator_name"])
+        # Ensure the coordinator has a department
+        coordinator = request.coordinator
         if not coordinator.department_name:
             return render(request, "fest_event_form.html", {"error": "You are not linked to a department."})
 
-        department_name = coordinator.department_name.department_name
-        
-        # Fetch department and its related fests
-        department = Department.objects.get(department_name=department_name)
+        # Department comes loaded with the coordinator; fetch its fests
+        department = coordinator.department_name
         fests = Fest.objects.filter(department_name=department)
 
         if request.method == "POST":
@@ -102,18 +92,54 @@ def create_dept_event(request):
         return render(request, "fest_event_form.html", {"error": str(e)})
 
 
+@coordinator_required
+def bulk_import_events(request):
+    """Create many events at once from an uploaded CSV or JSON file."""
+    # The importer validates rows with DRF serializers; keep DRF out of the
+    # imports every page pays for.
+    from event.importer import ImportFileError, MAX_IMPORT_ROWS, import_events, parse_rows
 
+    coordinator = request.coordinator
 
-def events_page1(request):
-    if "coordinator_name" not in request.session:
-        return redirect("coordinator_login")  # Redirect to login if not authenticated
-
-    try:
-        coordinator = Coordinator.objects.get(coordinator_name=request.session["coordinator_name"])
-    except Coordinator.DoesNotExist:
-        messages.error(request, "Coordinator not found.")
+    # Rows always land in the coordinator's own club or department.
+    if coordinator.coordinator_type == "club" and coordinator.club_name:
+        model = Event
+        overrides = {"club_name": coordinator.club_name_id,
+                     "department_name": coordinator.club_name.department_name_id}
+        columns = ["event_name", "event_start_date", "event_end_date", "event_time", "event_venue", "registration_link"]
+    elif coordinator.coordinator_type == "department" and coordinator.department_name:
+        model = dEvent
+        overrides = {"department_name": coordinator.department_name_id}
+        columns = ["event_name", "event_start_date", "event_end_date", "event_time", "event_venue", "registration_link", "fest_name"]
+    else:
+        messages.error(request, "You are not authorized to access this page.")
         return redirect("coordinator_login")
 
+    context = {"coordinator": coordinator, "columns": columns, "max_rows": MAX_IMPORT_ROWS}
+    if request.method == "POST":
+        upload = request.FILES.get("file")
+        if upload is None:
+            context["error"] = "Choose a CSV or JSON file to import."
+            return render(request, "bulk_import.html", context)
+        try:
+            rows = parse_rows(upload)
+        except ImportFileError as error:
+            context["error"] = str(error)
+            return render(request, "bulk_import.html", context)
+
+        result = import_events(model, rows, overrides)
+        if not result["errors"]:
+            messages.success(request, f"Imported {result['created']} events.")
+            return redirect("coordinator_dashboard")
+        context.update(result=result, row_count=len(rows))
+
+    return render(request, "bulk_import.html", context)
+
+
+@coordinator_required
+def events_page1(request):
+    coordinator = request.coordinator
+
     # Determine the coordinator type and fetch corresponding events
     if coordinator.coordinator_type == "club" and coordinator.club_name:
         events = Event.objects.filter(club_name=coordinator.club_name)
@@ -125,15 +151,9 @@ def events_page1(request):
 
     return render(request, "eventspage1.html", {"eve": events, "coordinator": coordinator})
 
+@coordinator_required
 def modify_event(request, event_id):
-    if "coordinator_name" not in request.session:
-        return redirect("coordinator_login")  # Redirect if not authenticated
-
-    try:
-        coordinator = Coordinator.objects.get(coordinator_name=request.session["coordinator_name"])
-    except Coordinator.DoesNotExist:
-        messages.error(request, "Coordinator not found.")
-        return redirect("coordinator_login")
+    coordinator = request.coordinator
 
     # Check coordinator type and use the correct form and event model
     if coordinator.coordinator_type == "club" and coordinator.club_name:
@@ -162,15 +182,9 @@ def modify_event(request, event_id):
 
     return render(request, template_name, {"form": form, "event": event, "coordinator": coordinator})
 
+@coordinator_required
 def delete_event(request, event_id):
-    if "coordinator_name" not in request.session:
-        return redirect("coordinator_login")  # Redirect to login if not authenticated
-
-    try:
-        coordinator = Coordinator.objects.get(coordinator_name=request.session["coordinator_name"])
-    except Coordinator.DoesNotExist:
-        messages.error(request, "Coordinator not found.")
-        return redirect("coordinator_login")
+    coordinator = request.coordinator
 
     # Determine the event type based on the coordinator's type
     if coordinator.coordinator_type == "club" and coordinator.club_name:
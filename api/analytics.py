@@ -1,69 +1,102 @@
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
+from django.core.cache import cache
 from django.db.models import Count, Q
+from django.db.models.functions import TruncMonth
 from django.utils import timezone
-from datetime import datetime, timedelta
-from event.models import Event, Department
+from datetime import date
+from event.models import Event
 from department.models import dEvent
+from clue.db_pool import database_stats
+from clue.timing import view_stats
 
+STATS_CACHE_TIMEOUT = 60 * 10
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def get_event_stats(request):
-    """Get comprehensive event statistics"""
-    
-    # Get total counts
-    total_events = Event.objects.count() + dEvent.objects.count()
-    
-    # Get upcoming and past events
-    now = timezone.now().date()
-    upcoming_events = Event.objects.filter(event_start_date__gte=now).count() + \
-                     dEvent.objects.filter(event_start_date__gte=now).count()
-    past_events = Event.objects.filter(event_end_date__lt=now).count() + \
-                 dEvent.objects.filter(event_end_date__lt=now).count()
-    
-    # Events by department
-    events_by_dept = []
-    departments = Department.objects.all()
-    for dept in departments:
-        dept_event_count = Event.objects.filter(department_name=dept).count() + \
-                          dEvent.objects.filter(department_name=dept).count()
-        if dept_event_count > 0:
-            events_by_dept.append({
-                'department': dept.department_name,
-                'count': dept_event_count
-            })
-    
-    # Events by month (last 12 months)
-    events_by_month = []
-    for i in range(12):
-        month_start = (timezone.now() - timedelta(days=30*i)).replace(day=1)
-        month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
-        
-        month_count = Event.objects.filter(
-            event_start_date__gte=month_start,
-            event_start_date__lte=month_end
-        ).count() + dEvent.objects.filter(
-            event_start_date__gte=month_start,
-            event_start_date__lte=month_end
-        ).count()
-        
-        events_by_month.append({
-            'month': month_start.strftime('%b %Y'),
-            'count': month_count
-        })
-    
-    events_by_month.reverse()
-    
-    return Response({
+
+def stats_cache_key(today: date) -> str:
+    # Upcoming/past counts and the month window move with the date, so a new
+    # day starts from a fresh entry.
+    return f"analytics:event_stats:{today.isoformat()}"
+
+
+def invalidate_event_stats() -> None:
+    cache.delete(stats_cache_key(timezone.now().date()))
+
+
+def _last_months(today: date, count: int = 12):
+    """First day of each of the last ``count`` months, oldest first."""
+    months = []
+    year, month = today.year, today.month
+    for _ in range(count):
+        months.append(date(year, month, 1))
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    months.reverse()
+    return months
+
+
+def _build_event_stats(today: date) -> dict:
+    months = _last_months(today)
+    total_events = upcoming_events = past_events = 0
+    dept_counts = {}
+    month_counts = dict.fromkeys(months, 0)
+
+    for model in (Event, dEvent):
+        per_dept = (
+            model.objects.order_by()
+            .values("department_name")
+            .annotate(
+                count=Count("id"),
+                upcoming=Count("id", filter=Q(event_start_date__gte=today)),
+                past=Count("id", filter=Q(event_end_date__lt=today)),
+            )
+        )
+        for row in per_dept:
+            total_events += row["count"]
+            upcoming_events += row["upcoming"]
+            past_events += row["past"]
+            dept = row["department_name"]
+            dept_counts[dept] = dept_counts.get(dept, 0) + row["count"]
+
+        per_month = (
+            model.objects.filter(event_start_date__gte=months[0])
+            .order_by()
+            .annotate(month=TruncMonth("event_start_date"))
+            .values("month")
+            .annotate(count=Count("id"))
+        )
+        for row in per_month:
+            if row["month"] in month_counts:
+                month_counts[row["month"]] += row["count"]
+
+    return {
         'total_events': total_events,
         'upcoming_events': upcoming_events,
         'past_events': past_events,
         'total_participants': 0,  # Placeholder - implement based on your participant tracking
-        'events_by_department': events_by_dept,
-        'events_by_month': events_by_month
-    })
+        'events_by_department': [
+            {'department': name, 'count': count}
+            for name, count in sorted(dept_counts.items())
+            if count > 0
+        ],
+        'events_by_month': [
+            {'month': month.strftime('%b %Y'), 'count': month_counts[month]}
+            for month in months
+        ],
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_event_stats(request):
+    """Get comprehensive event statistics"""
+    today = timezone.now().date()
+    key = stats_cache_key(today)
+    stats = cache.get(key)
+    if stats is None:
+        stats = _build_event_stats(today)
+        cache.set(key, stats, STATS_CACHE_TIMEOUT)
+    return Response(stats)
 
 
 @api_view(['GET'])
@@ -87,3 +120,18 @@ def get_event_analytics(request, event_id):
     }
     
     return Response(analytics)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_view_timings(request):
+    """Rolling p50/p95/p99 response times per view, from this worker's samples."""
+    return Response(view_stats.summary())
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_db_pool_stats(request):
+    """Connection pool and server connection usage; 503 when the database is unreachable."""
+    healthy, stats = database_stats()
+    return Response(stats, status=200 if healthy else 503)
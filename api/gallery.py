@@ -1,97 +1,200 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.files.images import get_image_dimensions
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db import IntegrityError, transaction
+from django.shortcuts import get_object_or_404
 from rest_framework.decorators import api_view, permission_classes, parser_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
-from django.core.files.storage import default_storage
-from django.conf import settings
-import os
-import json
+
+from event.models import Event, GalleryImage
+from .pagination import KeysetPagination
+from .serializers import GalleryImageSerializer
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.webp')
+
+
+class GalleryPagination(KeysetPagination):
+    ordering = ("-id",)
+    page_size = 50
+    max_page_size = 200
+
+
+class SpooledMultiPartParser(MultiPartParser):
+    """
+    Multipart parser that streams every uploaded file to a temporary file,
+    so a request holds at most one upload chunk per file in memory however
+    many photos it carries.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = parser_context['request']._request
+        request.upload_handlers = [TemporaryFileUploadHandler(request)]
+        return super().parse(stream, media_type, parser_context)
+
+
+def gallery_path(event_id) -> str:
+    return f'event_gallery/{event_id}/'
+
+
+def stored_name(event_id, info, filename) -> str:
+    """
+    Storage name for an image: its content hash, so two different photos
+    that share a file name never land on the same object.
+    """
+    return gallery_path(event_id) + info['content_hash'] + os.path.splitext(filename)[1].lower()
+
+
+def content_hash(file) -> str:
+    digest = hashlib.sha256()
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def describe_image(file) -> dict:
+    """Dimensions, byte size and content hash of an image file."""
+    width, height = get_image_dimensions(file)
+    file.seek(0)
+    return {
+        'width': width,
+        'height': height,
+        'size': file.size,
+        'content_hash': content_hash(file),
+    }
+
+
+def record_gallery_image(event, path, info, caption=''):
+    """Create the GalleryImage row for a file stored at ``path``."""
+    return GalleryImage.objects.create(event=event, path=path, caption=caption, **info)
+
+
+def _rejection(file):
+    if not file.name.lower().endswith(IMAGE_EXTENSIONS):
+        return 'Unsupported file type'
+    if file.size > settings.GALLERY_MAX_FILE_SIZE:
+        return f'File larger than {settings.GALLERY_MAX_FILE_SIZE} bytes'
+    return None
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_event_gallery(request, event_id):
-    """Get all images for an event"""
-    # This is a placeholder implementation
-    # In production, you should have a Gallery model to track images
-    
-    gallery_path = f'event_gallery/{event_id}/'
-    
-    try:
-        if settings.USE_S3:
-            # If using S3/Supabase Storage, list files from bucket
-            # Implementation depends on your storage backend
-            images = []
-        else:
-            # Local storage
-            full_path = os.path.join(settings.MEDIA_ROOT, gallery_path)
-            if os.path.exists(full_path):
-                images = [
-                    {
-                        'id': idx,
-                        'event_id': event_id,
-                        'image_url': f"{settings.MEDIA_URL}{gallery_path}{filename}",
-                        'caption': '',
-                        'uploaded_at': ''
-                    }
-                    for idx, filename in enumerate(os.listdir(full_path))
-                    if filename.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.webp'))
-                ]
-            else:
-                images = []
-        
-        return Response({'images': images})
-    except Exception as e:
-        return Response({'error': str(e)}, status=500)
+    """Get the images for an event, newest first, keyset paginated."""
+    images = GalleryImage.objects.filter(event_id=event_id)
+    paginator = GalleryPagination()
+    page = paginator.paginate_queryset(images, request)
+    return paginator.get_paginated_response(GalleryImageSerializer(page, many=True).data)
 
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
-@parser_classes([MultiPartParser, FormParser])
+@parser_classes([SpooledMultiPartParser, FormParser])
 def upload_gallery_image(request, event_id):
-    """Upload images to event gallery"""
+    """
+    Upload images to event gallery.
+
+    Files are pushed to storage concurrently and deduplicated by content
+    hash, so retrying a partly failed upload only stores what is missing.
+    Returns one result per file, in request order.
+    """
+    event = get_object_or_404(Event, pk=event_id)
     files = request.FILES.getlist('images')
-    
+
     if not files:
         return Response({'error': 'No files provided'}, status=400)
-    
-    uploaded = []
-    gallery_path = f'event_gallery/{event_id}/'
-    
-    try:
-        for file in files:
-            # Save file
-            file_path = f"{gallery_path}{file.name}"
-            saved_path = default_storage.save(file_path, file)
-            
-            uploaded.append({
-                'filename': file.name,
-                'url': default_storage.url(saved_path)
-            })
-        
-        return Response({
-            'success': True,
-            'uploaded': uploaded
-        })
-    except Exception as e:
-        return Response({'error': str(e)}, status=500)
+    if len(files) > settings.GALLERY_MAX_FILES:
+        return Response({'error': f'At most {settings.GALLERY_MAX_FILES} files per upload'}, status=400)
+
+    caption = request.data.get('caption', '')
+    results = []
+    accepted = []
+    for file in files:
+        result = {'filename': file.name}
+        results.append(result)
+        error = _rejection(file)
+        info = None if error else describe_image(file)
+        if info and info['width'] is None:
+            error = 'Not an image'
+        if error:
+            result.update(status='rejected', error=error)
+        else:
+            accepted.append((result, file, info))
+
+    hashes = {info['content_hash'] for _result, _file, info in accepted}
+    images = {
+        image.content_hash: image
+        for image in GalleryImage.objects.filter(event=event, content_hash__in=hashes)
+    }
+
+    # Store each new content once; identical files in one request share it.
+    to_store = {}
+    for _result, file, info in accepted:
+        if info['content_hash'] not in images:
+            to_store.setdefault(info['content_hash'], (file, info))
+
+    created = set()
+    errors = {}
+    if to_store:
+        workers = min(settings.GALLERY_UPLOAD_WORKERS, len(to_store))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='gallery-upload') as pool:
+            futures = {
+                pool.submit(default_storage.save, stored_name(event.pk, info, file.name), file): info
+                for file, info in to_store.values()
+            }
+            # Rows are written here, on the request thread, as each PUT lands.
+            for future in as_completed(futures):
+                info = futures[future]
+                digest = info['content_hash']
+                try:
+                    saved_path = future.result()
+                except Exception as error:
+                    errors[digest] = str(error)
+                    continue
+                try:
+                    with transaction.atomic():
+                        images[digest] = record_gallery_image(event, saved_path, info, caption)
+                    created.add(digest)
+                except IntegrityError:
+                    # A concurrent retry stored the same bytes first.
+                    existing = GalleryImage.objects.filter(event=event, content_hash=digest).first()
+                    if existing is None:
+                        errors[digest] = 'Could not record the image'
+                        continue
+                    images[digest] = existing
+                    if not GalleryImage.objects.filter(path=saved_path).exists():
+                        default_storage.delete(saved_path)
+
+    for result, _file, info in accepted:
+        digest = info['content_hash']
+        if digest in errors:
+            result.update(status='error', error=errors[digest])
+            continue
+        status = 'created' if digest in created else 'duplicate'
+        created.discard(digest)  # later copies in the same request are duplicates
+        result.update(status=status, image=GalleryImageSerializer(images[digest]).data)
+
+    stored = any(result['status'] in ('created', 'duplicate') for result in results)
+    return Response({
+        'success': stored,
+        'results': results,
+    }, status=201 if stored else 400)
 
 
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
 def delete_gallery_image(request, image_id):
     """Delete an image from gallery"""
-    # Implementation depends on how you track images
-    # This is a placeholder
-    
-    try:
-        # Get image path from request or database
-        image_path = request.data.get('image_path')
-        
-        if image_path and default_storage.exists(image_path):
-            default_storage.delete(image_path)
-            return Response({'success': True})
-        else:
-            return Response({'error': 'Image not found'}, status=404)
-    except Exception as e:
-        return Response({'error': str(e)}, status=500)
+    image = get_object_or_404(GalleryImage, pk=image_id)
+    path = image.path
+    with transaction.atomic():
+        image.delete()
+        transaction.on_commit(lambda: default_storage.delete(path))
+    return Response({'success': True})
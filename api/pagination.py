@@ -0,0 +1,153 @@
+import base64
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a composite, unique ordering such as
+    ``("event_start_date", "id")``.
+
+    The cursor stores the ordering values of the last row on the page, and
+    the next page is fetched with a ``WHERE (a, b) > (x, y)`` style filter
+    instead of an OFFSET, so every page costs the same however deep it is.
+    Views pick the ordering with a ``keyset_ordering`` attribute or a
+    ``get_keyset_ordering()`` method; the last field must be unique.
+    """
+    page_size = api_settings.PAGE_SIZE or 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    ordering = ("event_start_date", "id")
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_ordering(self, view):
+        if hasattr(view, "get_keyset_ordering"):
+            return tuple(view.get_keyset_ordering())
+        return tuple(getattr(view, "keyset_ordering", self.ordering))
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    # -- cursor encoding -------------------------------------------------
+
+    def encode_cursor(self, values, reverse):
+        payload = json.dumps({"v": values, "r": reverse}, cls=DjangoJSONEncoder)
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        raw = request.query_params.get(self.cursor_query_param)
+        if not raw:
+            return None, False
+        try:
+            padded = raw + "=" * (-len(raw) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            values, reverse = data["v"], bool(data.get("r"))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering_fields):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    # -- queryset --------------------------------------------------------
+
+    def _after(self, values, reverse):
+        """Q matching rows strictly after ``values`` in the walk direction."""
+        clauses = []
+        for i, (field, descending) in enumerate(self.ordering_fields):
+            lookup = "lt" if descending != reverse else "gt"
+            eq = {name: values[j] for j, (name, _desc) in enumerate(self.ordering_fields[:i])}
+            clauses.append(Q(**eq, **{f"{field}__{lookup}": values[i]}))
+        return reduce(or_, clauses)
+
+    def _order_by(self, reverse):
+        return [
+            F(field).desc() if descending != reverse else F(field).asc()
+            for field, descending in self.ordering_fields
+        ]
+
+    def _page_query(self, queryset, request, view):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering_fields = [
+            (name.lstrip("-"), name.startswith("-")) for name in self.get_ordering(view)
+        ]
+        page_size = self.get_page_size(request)
+        values, reverse = self.decode_cursor(request)
+
+        queryset = queryset.order_by(*self._order_by(reverse))
+        if values is not None:
+            queryset = queryset.filter(self._after(values, reverse))
+        # One extra row tells whether there is a further page.
+        return queryset[:page_size + 1], page_size, values, reverse
+
+    def _page(self, rows, page_size, values, reverse):
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        has_prev_rows = has_more if reverse else values is not None
+        has_next_rows = values is not None if reverse else has_more
+        self.next_cursor = self._cursor_for(rows[-1], False) if rows and has_next_rows else None
+        self.previous_cursor = self._cursor_for(rows[0], True) if rows and has_prev_rows else None
+        return rows
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset, *page = self._page_query(queryset, request, view)
+        return self._page(list(queryset), *page)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset, *page = self._page_query(queryset, request, view)
+        return self._page([row async for row in queryset], *page)
+
+    def _cursor_for(self, row, reverse):
+        values = []
+        for field, _descending in self.ordering_fields:
+            value = getattr(row, field)
+            # Foreign keys are compared on their key value.
+            values.append(getattr(value, "pk", value))
+        return self.encode_cursor(values, reverse)
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        return self._link(self.next_cursor)
+
+    def get_previous_link(self):
+        return self._link(self.previous_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
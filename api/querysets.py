@@ -0,0 +1,61 @@
+"""
+Queryset builders shared by the ``api.views`` viewsets.
+
+Each builder loads exactly the columns its serializer renders: plain fields
+through ``only()``, and every ``SlugRelatedField`` through ``select_related``
+plus its slug column, so listing N rows costs one query instead of 1 + N
+per relation.
+"""
+from rest_framework import serializers
+
+from event.models import Department, Club, Event, Notice
+from department.models import Fest, dEvent
+from .serializers import (
+    DepartmentSerializer,
+    ClubSerializer,
+    EventSerializer,
+    FestSerializer,
+    DepartmentEventSerializer,
+    NoticeSerializer,
+)
+
+
+def for_serializer(queryset, serializer_class):
+    """Restrict ``queryset`` to the columns ``serializer_class`` reads."""
+    related = []
+    columns = []
+    for name, field in serializer_class().fields.items():
+        source = field.source or name
+        if isinstance(field, serializers.SlugRelatedField):
+            related.append(source)
+            columns.append(f"{source}__{field.slug_field}")
+        elif source != "*" and "." not in source:
+            columns.append(source)
+        columns.extend(getattr(field, "extra_columns", ()))
+    if related:
+        queryset = queryset.select_related(*related)
+    return queryset.only(*columns)
+
+
+def department_queryset():
+    return for_serializer(Department.objects.all(), DepartmentSerializer)
+
+
+def club_queryset():
+    return for_serializer(Club.objects.all(), ClubSerializer)
+
+
+def event_queryset():
+    return for_serializer(Event.objects.all(), EventSerializer)
+
+
+def fest_queryset():
+    return for_serializer(Fest.objects.all(), FestSerializer)
+
+
+def devent_queryset():
+    return for_serializer(dEvent.objects.all(), DepartmentEventSerializer)
+
+
+def notice_queryset():
+    return for_serializer(Notice.objects.all(), NoticeSerializer)
@@ -0,0 +1,11 @@
+from rest_framework.renderers import JSONRenderer
+
+from clue.timing import serializing
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSON renderer that adds its time to the request's ``serialize`` timing."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with serializing():
+            return super().render(data, accepted_media_type, renderer_context)
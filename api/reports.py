@@ -1,19 +1,353 @@
+import csv
+import hashlib
+import heapq
+import io
+import json
+import logging
+import tempfile
+import time
+from datetime import timedelta
+
+from rest_framework import serializers
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.http import HttpResponse
-from event.models import Event
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models import Q
+from django.http import FileResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from clue.cron import cron_job
+from event.models import Event, Report
+from event.versions import last_changed
+from .serializers import ReportSerializer
 from department.models import dEvent
-import json
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 2000
+
+# (header, Event column, dEvent column); None leaves the cell empty. Every
+# row starts with a "Type" cell naming its model.
+REPORT_COLUMNS = [
+    ("ID", "id", "id"),
+    ("Event", "event_name", "event_name"),
+    ("Start date", "event_start_date", "event_start_date"),
+    ("End date", "event_end_date", "event_end_date"),
+    ("Time", "event_time", "event_time"),
+    ("Venue", "event_venue", "event_venue"),
+    ("Department", "department_name_id", "department_name_id"),
+    ("Club", "club_name_id", None),
+    ("Fest", None, "fest_name_id"),
+    ("Registration link", "registration_link", "registration_link"),
+]
+
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+class ReportFilterSerializer(serializers.Serializer):
+    department = serializers.CharField(required=False)
+    club = serializers.CharField(required=False)
+    fest = serializers.CharField(required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get("date_from") and attrs.get("date_to") and attrs["date_from"] > attrs["date_to"]:
+            raise serializers.ValidationError("date_from must not be after date_to")
+        return attrs
+
+
+def _filtered(queryset, filters):
+    if "department" in filters:
+        queryset = queryset.filter(department_name_id=filters["department"])
+    if "date_from" in filters:
+        queryset = queryset.filter(event_end_date__gte=filters["date_from"])
+    if "date_to" in filters:
+        queryset = queryset.filter(event_start_date__lte=filters["date_to"])
+    return queryset
+
+
+def _rows(queryset, label, columns):
+    fields = [column for column in columns if column]
+    for values in queryset.values_list(*fields).iterator(chunk_size=CHUNK_SIZE):
+        record = dict(zip(fields, values))
+        yield [label] + [record[column] if column else None for column in columns]
+
+
+def _start_date(row):
+    return row[1 + [header for header, *_ in REPORT_COLUMNS].index("Start date")]
+
+
+def report_rows(filters):
+    """
+    Yield report rows for every Event and dEvent matching ``filters``,
+    ordered by start date, without loading the result set into memory.
+
+    Each model is read through a server-side iterator and the two ordered
+    streams are merged, so memory stays flat however many rows match.
+    """
+    streams = []
+    if "fest" not in filters:
+        events = _filtered(Event.objects.all(), filters)
+        if "club" in filters:
+            events = events.filter(club_name_id=filters["club"])
+        events = events.order_by("event_start_date", "id")
+        streams.append(_rows(events, "Club event", [column for _h, column, _d in REPORT_COLUMNS]))
+    if "club" not in filters:
+        devents = _filtered(dEvent.objects.all(), filters)
+        if "fest" in filters:
+            devents = devents.filter(fest_name_id=filters["fest"])
+        devents = devents.order_by("event_start_date", "id")
+        streams.append(_rows(devents, "Department event", [column for _h, _e, column in REPORT_COLUMNS]))
+    return heapq.merge(*streams, key=_start_date)
+
+
+def report_header():
+    return ["Type"] + [header for header, *_ in REPORT_COLUMNS]
+
+
+class _Echo:
+    """File-like object whose ``write`` hands the line back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(report_header())
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def write_csv(rows, file):
+    writer = csv.writer(file)
+    writer.writerow(report_header())
+    writer.writerows(rows)
+
+
+def write_xlsx(rows, file):
+    """Write an XLSX workbook in openpyxl write-only mode (constant memory)."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Events")
+    sheet.append(report_header())
+    for row in rows:
+        sheet.append(row)
+    workbook.save(file)
+
+
+def report_filename(filters, extension):
+    parts = ["events"] + [str(filters[key]) for key in ("department", "club", "fest", "date_from", "date_to") if key in filters]
+    return f"{'-'.join(parts)}-{timezone.localdate():%Y%m%d}.{extension}"
+
+
+# ---------------------------------------------------------------------------
+# Stored reports
+# ---------------------------------------------------------------------------
+
+# A running report older than this is assumed to belong to a dead worker.
+REPORT_RUNNING_TIMEOUT = timedelta(hours=1)
+
+
+def report_request_key(filters, file_format, user=None) -> str:
+    # The requester is part of the key: only they (and staff) may list or
+    # download the artifact, so it is never handed to another user.
+    canonical = json.dumps(
+        {"filters": filters, "format": file_format, "user": user.pk if user else None},
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def source_version():
+    """Change stamp covering every row a report can contain."""
+    return last_changed(Event, dEvent)
+
+
+def find_or_queue_report(filters, file_format, user=None):
+    """
+    ``user``'s stored report for these filters if it is still current, else
+    an in-flight one, else a newly queued one. Returns ``(report, queued)``.
+    """
+    filters = json.loads(json.dumps(filters, default=str))
+    key = report_request_key(filters, file_format, user)
+    current = source_version()
+    reports = Report.objects.filter(request_key=key).order_by("-created_at")
+
+    ready = reports.filter(status="ready", source_version__gte=current).first()
+    if ready:
+        return ready, False
+    in_flight = reports.filter(
+        Q(status="pending")
+        | Q(status="running", source_version__gte=current,
+            started_at__gte=timezone.now() - REPORT_RUNNING_TIMEOUT)
+    ).first()
+    if in_flight:
+        return in_flight, False
+    report = Report.objects.create(
+        filters=filters, file_format=file_format, request_key=key, requested_by=user,
+    )
+    return report, True
+
+
+def _claim_report():
+    # A worker that died mid-build never finishes its report.
+    Report.objects.filter(
+        status="running", started_at__lt=timezone.now() - REPORT_RUNNING_TIMEOUT,
+    ).update(status="failed", error="Abandoned by its worker")
+    with transaction.atomic():
+        queryset = Report.objects.filter(status="pending").order_by("created_at", "pk")
+        if connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        report = queryset.first()
+        if report is None:
+            return None
+        # Stamp before reading any rows: a write during the build leaves the
+        # artifact older than the data, so the next request rebuilds it.
+        report.status = "running"
+        report.started_at = timezone.now()
+        report.source_version = source_version()
+        report.save(update_fields=["status", "started_at", "source_version"])
+    return report
+
+
+class _Counter:
+    def __init__(self, rows):
+        self.rows = rows
+        self.count = 0
+
+    def __iter__(self):
+        for row in self.rows:
+            self.count += 1
+            yield row
+
+
+def build_report(report) -> None:
+    """Write ``report``'s artifact to storage and mark it ready (or failed)."""
+    serializer = ReportFilterSerializer(data=report.filters)
+    try:
+        serializer.is_valid(raise_exception=True)
+        filters = serializer.validated_data
+        rows = _Counter(report_rows(filters))
+        with tempfile.TemporaryFile() as file:
+            if report.file_format == "xlsx":
+                write_xlsx(rows, file)
+            else:
+                text = io.TextIOWrapper(file, encoding="utf-8", newline="")
+                write_csv(rows, text)
+                text.flush()
+                text.detach()
+            file.seek(0)
+            name = f"reports/{report.pk}/{report_filename(filters, report.file_format)}"
+            report.path = default_storage.save(name, File(file))
+    except Exception as error:
+        logger.exception("Report %s failed", report.pk)
+        report.status = "failed"
+        report.error = repr(error)
+        report.save(update_fields=["status", "error"])
+        return
+
+    report.status = "ready"
+    report.generated_at = timezone.now()
+    report.row_count = rows.count
+    report.save(update_fields=["status", "generated_at", "row_count", "path"])
+
+    # Older artifacts for the same request can never be served again.
+    for old in Report.objects.filter(request_key=report.request_key, status="ready", pk__lt=report.pk):
+        if old.path:
+            default_storage.delete(old.path)
+        old.delete()
+
+
+def run_pending_reports(limit=None, budget_seconds=None) -> int:
+    """
+    Build queued reports one at a time; returns how many were processed.
+    With ``budget_seconds`` no new report is started once that time is up.
+    """
+    deadline = None if budget_seconds is None else time.monotonic() + budget_seconds
+    done = 0
+    while (limit is None or done < limit) and (deadline is None or time.monotonic() < deadline):
+        report = _claim_report()
+        if report is None:
+            break
+        build_report(report)
+        done += 1
+    return done
+
+
+@cron_job
+def build_queued_reports(request):
+    """
+    Build queued reports for up to ``REPORT_CRON_BUDGET`` seconds.
+
+    Called by the Vercel cron job in vercel.json, see ``clue.cron``; hosts
+    running the ``generate_reports --loop`` worker leave ``CRON_SECRET`` unset.
+    """
+    built = run_pending_reports(settings.REPORT_CRON_LIMIT, settings.REPORT_CRON_BUDGET)
+    return JsonResponse({"built": built})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_events_report(request):
+    """
+    Download Event and dEvent rows as CSV or XLSX.
+
+    Query parameters: ``file_format`` (csv or xlsx; ``format`` is taken by
+    DRF), ``department``, ``club``, ``fest``, ``date_from`` and ``date_to``.
+    CSV is streamed row by row; XLSX is written to a temporary file in
+    write-only mode and streamed from disk.
+    """
+    report_format = request.query_params.get('file_format', 'csv')
+    if report_format not in CONTENT_TYPES:
+        return Response({'error': 'Invalid file_format. Use "csv" or "xlsx"'}, status=400)
+    serializer = ReportFilterSerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    filters = serializer.validated_data
+    filename = report_filename(filters, report_format)
+
+    if report_format == 'csv':
+        response = StreamingHttpResponse(iter_csv(report_rows(filters)), content_type=CONTENT_TYPES['csv'])
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    file = tempfile.TemporaryFile(suffix='.xlsx')
+    write_xlsx(report_rows(filters), file)
+    file.seek(0)
+    return FileResponse(file, as_attachment=True, filename=filename, content_type=CONTENT_TYPES['xlsx'])
 
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def generate_event_report(request):
-    """Generate event report in PDF or Excel format"""
-    event_id = request.data.get('event_id')
+    """
+    Generate event report in PDF or Excel format.
+
+    With ``format`` csv or xlsx, a department/club/fest/date-range report is
+    queued for ``manage.py generate_reports`` instead; the same user's identical
+    request is answered with the stored artifact until an Event or dEvent changes.
+    """
     report_format = request.data.get('format', 'pdf')
-    
+    if report_format in CONTENT_TYPES:
+        serializer = ReportFilterSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        report, _queued = find_or_queue_report(serializer.validated_data, report_format, request.user)
+        return Response(
+            {'success': True, 'report': ReportSerializer(report, context={'request': request}).data},
+            status=200 if report.status == 'ready' else 202,
+        )
+
+    event_id = request.data.get('event_id')
+
     if not event_id:
         return Response({'error': 'event_id is required'}, status=400)
     
@@ -55,18 +389,35 @@ def generate_event_report(request):
         })
     
     else:
-        return Response({'error': 'Invalid format. Use "pdf" or "excel"'}, status=400)
+        return Response({'error': 'Invalid format. Use "pdf", "excel", "csv" or "xlsx"'}, status=400)
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_event_reports(request):
-    """Get list of generated reports"""
-    event_id = request.GET.get('event_id')
-    
-    # Placeholder implementation
-    # In production, you should have a Report model to track generated reports
-    
-    reports = []
-    
-    return Response({'reports': reports})
+    """Get list of generated reports, newest first"""
+    reports = Report.objects.order_by('-created_at')
+    if not request.user.is_staff:
+        reports = reports.filter(requested_by=request.user)
+    status = request.GET.get('status')
+    if status:
+        reports = reports.filter(status=status)
+
+    context = {'request': request, 'source_version': source_version()}
+    return Response({'reports': ReportSerializer(reports[:50], many=True, context=context).data})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def download_report(request, report_id):
+    """Stream a ready report artifact from storage."""
+    reports = Report.objects.filter(status='ready')
+    if not request.user.is_staff:
+        reports = reports.filter(requested_by=request.user)
+    report = get_object_or_404(reports, pk=report_id)
+    return FileResponse(
+        default_storage.open(report.path, 'rb'),
+        as_attachment=True,
+        filename=report.path.rsplit('/', 1)[-1],
+        content_type=CONTENT_TYPES[report.file_format],
+    )
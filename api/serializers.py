@@ -1,25 +1,67 @@
+from django.core.files.storage import default_storage
+from django.urls import reverse
 from rest_framework import serializers
-from event.models import Department, Club, Event, Notice
+from event.models import Department, Club, Event, Notice, GalleryImage, Report
 from department.models import Fest, dEvent
+from event.posters import variant_urls, variants_ready
+from home.models import EventIndex
+
+
+class SparseFieldsMixin:
+    """
+    Let clients request a subset of fields with ``?fields=a,b,c``.
+
+    Only applies to the top-level serializer of a request; unknown names are
+    ignored and an empty selection falls back to every field.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or self.parent is not None:
+            return
+        raw = request.query_params.get("fields") if hasattr(request, "query_params") else None
+        if not raw:
+            return
+        wanted = {name.strip() for name in raw.split(",") if name.strip()}
+        if wanted & set(self.fields):
+            for name in set(self.fields) - wanted:
+                self.fields.pop(name)
+
+
+class PosterVariantsField(serializers.ReadOnlyField):
+    """
+    URLs of the resized renditions of an image field, see ``event.posters``;
+    null until they have been rendered.
+    """
+    # Read from the same row by variants_ready; see api.querysets.
+    extra_columns = ("poster_rendered",)
+
+    def to_representation(self, value):
+        return variant_urls(value.name) if variants_ready(value) else None
 
 
 class DepartmentSerializer(serializers.ModelSerializer):
+    department_poster_variants = PosterVariantsField(source="department_poster")
+
     class Meta:
         model = Department
-        fields = ["department_name", "department_description", "department_poster"]
+        fields = ["department_name", "department_description", "department_poster", "department_poster_variants"]
 
 
 class ClubSerializer(serializers.ModelSerializer):
     department_name = serializers.SlugRelatedField(slug_field="department_name", queryset=Department.objects.all())
+    club_poster_variants = PosterVariantsField(source="club_poster")
 
     class Meta:
         model = Club
-        fields = ["club_name", "club_description", "club_poster", "department_name"]
+        fields = ["club_name", "club_description", "club_poster", "club_poster_variants", "department_name"]
 
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     department_name = serializers.SlugRelatedField(slug_field="department_name", queryset=Department.objects.all())
     club_name = serializers.SlugRelatedField(slug_field="club_name", queryset=Club.objects.all(), allow_null=True, required=False)
+    event_poster_variants = PosterVariantsField(source="event_poster")
 
     class Meta:
         model = Event
@@ -32,6 +74,7 @@ class EventSerializer(serializers.ModelSerializer):
             "event_venue",
             "registration_link",
             "event_poster",
+            "event_poster_variants",
             "department_name",
             "club_name",
         ]
@@ -39,15 +82,17 @@ class EventSerializer(serializers.ModelSerializer):
 
 class FestSerializer(serializers.ModelSerializer):
     department_name = serializers.SlugRelatedField(slug_field="department_name", queryset=Department.objects.all())
+    fest_poster_variants = PosterVariantsField(source="fest_poster")
 
     class Meta:
         model = Fest
-        fields = ["fest_name", "department_name", "event_start_date", "event_end_date", "fest_poster"]
+        fields = ["fest_name", "department_name", "event_start_date", "event_end_date", "fest_poster", "fest_poster_variants"]
 
 
-class DepartmentEventSerializer(serializers.ModelSerializer):
+class DepartmentEventSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     department_name = serializers.SlugRelatedField(slug_field="department_name", queryset=Department.objects.all())
     fest_name = serializers.SlugRelatedField(slug_field="fest_name", queryset=Fest.objects.all(), allow_null=True, required=False)
+    event_poster_variants = PosterVariantsField(source="event_poster")
 
     class Meta:
         model = dEvent
@@ -60,15 +105,76 @@ class DepartmentEventSerializer(serializers.ModelSerializer):
             "event_venue",
             "registration_link",
             "event_poster",
+            "event_poster_variants",
             "department_name",
             "fest_name",
         ]
 
 
-class NoticeSerializer(serializers.ModelSerializer):
+class NoticeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     club_name = serializers.SlugRelatedField(slug_field="club_name", queryset=Club.objects.all(), allow_null=True, required=False)
     department_name = serializers.SlugRelatedField(slug_field="department_name", queryset=Department.objects.all(), allow_null=True, required=False)
 
     class Meta:
         model = Notice
         fields = ["id", "title", "description", "date_posted", "club_name", "department_name"]
+
+
+class EventIndexSerializer(serializers.ModelSerializer):
+    # Department, Club and Fest are keyed by their names, so the raw FK
+    # columns already hold the slugs and no join is needed.
+    department_name = serializers.CharField(source="department_name_id", read_only=True)
+    club_name = serializers.CharField(source="club_name_id", read_only=True)
+    fest_name = serializers.CharField(source="fest_name_id", read_only=True)
+
+    class Meta:
+        model = EventIndex
+        fields = [
+            "event_type",
+            "source_id",
+            "event_name",
+            "event_start_date",
+            "event_end_date",
+            "event_venue",
+            "department_name",
+            "club_name",
+            "fest_name",
+        ]
+
+
+class GalleryImageSerializer(serializers.ModelSerializer):
+    event_id = serializers.IntegerField(read_only=True)
+    image_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = GalleryImage
+        fields = ["id", "event_id", "image_url", "caption", "width", "height", "size", "content_hash", "uploaded_at"]
+
+    def get_image_url(self, obj):
+        return default_storage.url(obj.path)
+
+
+class ReportSerializer(serializers.ModelSerializer):
+    """Pass ``source_version`` in the context to get the ``stale`` flag."""
+    download_url = serializers.SerializerMethodField()
+    stale = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Report
+        fields = [
+            "id", "status", "file_format", "filters", "created_at", "generated_at",
+            "row_count", "error", "download_url", "stale",
+        ]
+
+    def get_download_url(self, obj):
+        if obj.status != "ready":
+            return None
+        url = reverse("api:download-report", args=[obj.pk])
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+    def get_stale(self, obj):
+        current = self.context.get("source_version")
+        if obj.status != "ready" or current is None:
+            return None
+        return obj.source_version < current
@@ -0,0 +1,18 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from event.models import Event
+from event.signals import bulk_created
+from department.models import dEvent
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=dEvent)
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=dEvent)
+@receiver(bulk_created, sender=Event)
+@receiver(bulk_created, sender=dEvent)
+def invalidate_stats_on_event_change(sender, **kwargs):
+    # Imported here so loading the app does not import DRF.
+    from .analytics import invalidate_event_stats
+    invalidate_event_stats()
@@ -0,0 +1,669 @@
+import csv
+import datetime
+import io
+import re
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import as_completed
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from openpyxl import load_workbook
+from PIL import Image
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from event.models import Department, Club, Event, Notice, GalleryImage, Report
+from department.models import Fest, dEvent
+from clue.timing import percentile, view_stats
+from home.models import EventIndex
+from .gallery import record_gallery_image
+from .reports import REPORT_RUNNING_TIMEOUT, run_pending_reports
+from .serializers import ClubSerializer
+
+
+class ListQueryCountTests(TestCase):
+    """The number of queries behind a list call must not grow with its rows."""
+
+    endpoints = [
+        "/api/departments/",
+        "/api/clubs/",
+        "/api/events/",
+        "/api/fests/",
+        "/api/department-events/",
+        "/api/notices/",
+    ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.created = 0
+
+    def add_rows(self, count):
+        for _ in range(count):
+            i = self.created
+            self.created += 1
+            day = datetime.date(2025, 1, 1) + datetime.timedelta(days=i)
+            dept = Department.objects.create(
+                department_name=f"Dept{i}", password="x", department_description="d"
+            )
+            club = Club.objects.create(club_name=f"Club{i}", department_name=dept, club_description="c")
+            fest = Fest.objects.create(
+                fest_name=f"Fest{i}", department_name=dept, event_start_date=day, event_end_date=day
+            )
+            Event.objects.create(
+                event_name=f"Event{i}", event_start_date=day, event_end_date=day, event_time="10:00",
+                department_name=dept, club_name=club, event_venue="Hall",
+            )
+            dEvent.objects.create(
+                event_name=f"dEvent{i}", event_start_date=day, event_end_date=day, event_time="10:00",
+                department_name=dept, fest_name=fest, event_venue="Hall",
+            )
+            Notice.objects.create(title=f"Notice{i}", description="n", club_name=club, department_name=dept)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), len(response.json()["results"])
+
+    def test_list_query_count_is_constant(self):
+        self.add_rows(2)
+        baseline = {url: self.count_queries(url) for url in self.endpoints}
+
+        self.add_rows(8)
+        for url in self.endpoints:
+            with self.subTest(url=url):
+                queries, rows = self.count_queries(url)
+                self.assertEqual(rows, 10)
+                self.assertEqual(queries, baseline[url][0])
+                # One change-stamp lookup for the validators, one for the rows.
+                self.assertLessEqual(queries, 2)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.dept = Department.objects.create(department_name="CS", password="x", department_description="d")
+
+    def add_event(self, name):
+        return Event.objects.create(
+            event_name=name, event_start_date=datetime.date(2025, 1, 1), event_end_date=datetime.date(2025, 1, 1),
+            event_time="10:00", department_name=self.dept, event_venue="Hall",
+        )
+
+    def test_unchanged_list_is_not_modified(self):
+        self.add_event("First")
+        etag = self.client.get("/api/events/")["ETag"]
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/events/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_write_invalidates_etag(self):
+        self.add_event("First")
+        etag = self.client.get("/api/events/")["ETag"]
+        self.add_event("Second")
+
+        response = self.client.get("/api/events/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    async def test_async_list_pages_and_validates(self):
+        for day in range(1, 4):
+            await Event.objects.acreate(
+                event_name=f"Event {day}", event_start_date=datetime.date(2025, 1, day),
+                event_end_date=datetime.date(2025, 1, day), event_time="10:00",
+                department_name=self.dept, event_venue="Hall",
+            )
+        response = await self.async_client.get("/api/events/?page_size=2", headers={"accept": "application/json"})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual([e["event_name"] for e in body["results"]], ["Event 1", "Event 2"])
+        self.assertIsNotNone(body["next"])
+
+        response = await self.async_client.get(
+            "/api/events/?page_size=2", headers={"accept": "application/json", "if-none-match": response["ETag"]},
+        )
+        self.assertEqual(response.status_code, 304)
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        dept = Department.objects.create(department_name="CS", password="x", department_description="d")
+        club = Club.objects.create(club_name="GDSC", department_name=dept, club_description="c")
+        for i in range(7):
+            # Pairs of events share a date, so pages split on the id tie-breaker.
+            day = datetime.date(2025, 1, 1 + i // 2)
+            Event.objects.create(
+                event_name=f"Event {i}", event_start_date=day, event_end_date=day, event_time="10:00",
+                department_name=dept, event_venue="Hall",
+            )
+            Notice.objects.create(title=f"Notice {i}", description="n", club_name=club, department_name=dept)
+
+    def walk(self, url, link):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            pages.append(body["results"])
+            url = body[link]
+        return pages
+
+    def test_walks_forward_and_back_without_duplicates(self):
+        for url, key, expected in [
+            ("/api/events/?page_size=3", "event_name", [f"Event {i}" for i in range(7)]),
+            ("/api/notices/?page_size=3", "title", [f"Notice {i}" for i in reversed(range(7))]),
+        ]:
+            with self.subTest(url=url):
+                forward = self.walk(url, "next")
+                self.assertEqual([len(page) for page in forward], [3, 3, 1])
+                self.assertEqual([row[key] for page in forward for row in page], expected)
+
+                last = self.client.get(url).json()
+                while last["next"]:
+                    last = self.client.get(last["next"]).json()
+                self.assertIsNone(last["next"])
+                backward = self.walk(last["previous"], "previous")
+                self.assertEqual([row[key] for page in reversed(backward) for row in page], expected[:-1])
+
+    def test_invalid_cursor_is_not_found(self):
+        for cursor in ("not-a-cursor", "eyJ2IjogWzFdfQ", "bnVsbA"):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.client.get(f"/api/events/?cursor={cursor}").status_code, 404)
+
+    def test_page_size_is_clamped(self):
+        with mock.patch("api.pagination.KeysetPagination.max_page_size", 4):
+            self.assertEqual(len(self.client.get("/api/events/?page_size=1000").json()["results"]), 4)
+        self.assertEqual(len(self.client.get("/api/events/?page_size=0").json()["results"]), 1)
+        self.assertEqual(len(self.client.get("/api/events/?page_size=abc").json()["results"]), 7)
+
+    def test_sparse_fields(self):
+        full = self.client.get("/api/events/").json()["results"][0]
+        response = self.client.get("/api/events/?fields=event_name,event_start_date,nope")
+        self.assertEqual(set(response.json()["results"][0]), {"event_name", "event_start_date"})
+        # Only unknown names: every field.
+        response = self.client.get("/api/events/?fields=nope")
+        self.assertEqual(response.json()["results"][0], full)
+
+
+def png(color="red", size=(4, 3), name="photo.png"):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+class TempMediaMixin:
+    """Point default_storage at a throwaway local MEDIA_ROOT."""
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        overrides = override_settings(
+            MEDIA_ROOT=self.media_root,
+            STORAGES={
+                "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+                "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+            },
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+
+class GalleryTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("uploader"))
+        dept = Department.objects.create(department_name="CS", password="x", department_description="d")
+        self.event = Event.objects.create(
+            event_name="Fest", event_start_date=datetime.date(2025, 1, 1), event_end_date=datetime.date(2025, 1, 1),
+            event_time="10:00", department_name=dept, event_venue="Hall",
+        )
+        self.url = f"/api/gallery/{self.event.pk}/"
+
+    def upload(self, *files):
+        return self.client.post(self.url + "upload/", {"images": list(files)}, format="multipart")
+
+    def test_upload_records_metadata(self):
+        response = self.upload(png(size=(4, 3)))
+        self.assertEqual(response.status_code, 201)
+        image = GalleryImage.objects.get()
+        self.assertEqual((image.width, image.height), (4, 3))
+        self.assertEqual(len(image.content_hash), 64)
+        self.assertTrue(default_storage.exists(image.path))
+
+    def test_duplicate_upload_is_not_stored_twice(self):
+        self.upload(png())
+        response = self.upload(png(name="copy.png"))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["results"][0]["status"], "duplicate")
+        self.assertEqual(GalleryImage.objects.count(), 1)
+
+    def test_batch_is_spooled_and_stored_concurrently(self):
+        saved = []
+        real_save = default_storage.save
+
+        def save(name, content, *args, **kwargs):
+            saved.append((threading.current_thread().name, type(content)))
+            return real_save(name, content, *args, **kwargs)
+
+        files = [png(color, name=f"{color}.png") for color in ("red", "green", "blue")]
+        files.insert(1, png("red", name="again.png"))
+        files.append(SimpleUploadedFile("notes.txt", b"text"))
+        with mock.patch.object(default_storage, "save", side_effect=save):
+            response = self.upload(*files)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [(r["filename"], r["status"]) for r in response.json()["results"]],
+            [("red.png", "created"), ("again.png", "duplicate"), ("green.png", "created"),
+             ("blue.png", "created"), ("notes.txt", "rejected")],
+        )
+        self.assertEqual(len(saved), 3)
+        for thread_name, file_type in saved:
+            self.assertTrue(thread_name.startswith("gallery-upload"))
+            self.assertIs(file_type, TemporaryUploadedFile)
+
+    def test_failed_store_is_reported_per_file(self):
+        real_save = default_storage.save
+
+        def save(name, content, *args, **kwargs):
+            if content.name == "green.png":
+                raise OSError("timeout")
+            return real_save(name, content, *args, **kwargs)
+
+        with mock.patch.object(default_storage, "save", side_effect=save):
+            response = self.upload(png("red", name="red.png"), png("green", name="green.png"))
+        statuses = [r["status"] for r in response.json()["results"]]
+        self.assertEqual(statuses, ["created", "error"])
+
+        # Retrying the whole batch only stores what is missing.
+        response = self.upload(png("red", name="red.png"), png("green", name="green.png"))
+        self.assertEqual([r["status"] for r in response.json()["results"]], ["duplicate", "created"])
+        self.assertEqual(GalleryImage.objects.count(), 2)
+
+    def test_same_file_name_different_photos_overwriting_storage(self):
+        storages = {
+            "default": {
+                "BACKEND": "django.core.files.storage.FileSystemStorage",
+                "OPTIONS": {"allow_overwrite": True},
+            },
+            "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+        }
+        with override_settings(STORAGES=storages):
+            first = self.upload(png("red", name="image.png"))
+            second = self.upload(png("green", name="image.png"))
+            self.assertEqual(first.json()["results"][0]["status"], "created")
+            self.assertEqual(second.json()["results"][0]["status"], "created")
+            paths = list(GalleryImage.objects.values_list("path", flat=True))
+            self.assertEqual(len(set(paths)), 2)
+            for image in GalleryImage.objects.all():
+                self.assertEqual(image.path, f"event_gallery/{self.event.pk}/{image.content_hash}.png")
+                self.assertTrue(default_storage.exists(image.path))
+
+    def test_concurrent_duplicate_keeps_the_shared_file(self):
+        real_as_completed = as_completed
+
+        def racing(futures):
+            # Another request records the same bytes as each store lands.
+            for future in real_as_completed(futures):
+                record_gallery_image(self.event, future.result(), futures[future])
+                yield future
+
+        with mock.patch("api.gallery.as_completed", side_effect=racing):
+            response = self.upload(png())
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["results"][0]["status"], "duplicate")
+        image = GalleryImage.objects.get()
+        self.assertTrue(default_storage.exists(image.path))
+
+    def test_non_image_is_rejected(self):
+        response = self.upload(SimpleUploadedFile("notes.png", b"not an image"))
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(GalleryImage.objects.exists())
+
+    def test_list_is_paginated_from_the_database(self):
+        for color in ("red", "green", "blue"):
+            self.upload(png(color))
+
+        with CaptureQueriesContext(connection) as ctx:
+            first = self.client.get(self.url, {"page_size": 2}).json()
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(len(first["results"]), 2)
+        second = self.client.get(first["next"]).json()
+        ids = [row["id"] for row in first["results"] + second["results"]]
+        self.assertEqual(ids, sorted(GalleryImage.objects.values_list("id", flat=True), reverse=True))
+
+    def test_delete_removes_row_and_file(self):
+        self.upload(png())
+        image = GalleryImage.objects.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f"/api/gallery/image/{image.pk}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(GalleryImage.objects.exists())
+        self.assertFalse(default_storage.exists(image.path))
+
+
+class ReportExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("reporter"))
+        cs = Department.objects.create(department_name="CS", password="x", department_description="d")
+        ee = Department.objects.create(department_name="EE", password="x", department_description="d")
+        club = Club.objects.create(club_name="GDSC", department_name=cs, club_description="c")
+        fest = Fest.objects.create(
+            fest_name="Techfest", department_name=cs,
+            event_start_date=datetime.date(2025, 2, 1), event_end_date=datetime.date(2025, 2, 3),
+        )
+        for name, day, dept, extra in [
+            ("Hack", 5, cs, {"club_name": club}),
+            ("Talk", 1, cs, {}),
+            ("Circuit", 20, ee, {}),
+        ]:
+            date = datetime.date(2025, 1, day)
+            Event.objects.create(
+                event_name=name, event_start_date=date, event_end_date=date, event_time="10:00",
+                department_name=dept, event_venue="Hall", **extra,
+            )
+        date = datetime.date(2025, 1, 3)
+        dEvent.objects.create(
+            event_name="Robo", event_start_date=date, event_end_date=date, event_time="10:00",
+            department_name=cs, fest_name=fest, event_venue="Lab",
+        )
+
+    def export(self, **params):
+        return self.client.get("/api/reports/export/", params)
+
+    def csv_rows(self, response):
+        self.assertTrue(response.streaming)
+        content = b"".join(response.streaming_content).decode()
+        return list(csv.reader(io.StringIO(content)))
+
+    def test_csv_merges_models_in_date_order(self):
+        rows = self.csv_rows(self.export(department="CS"))
+        self.assertEqual(rows[0][:3], ["Type", "ID", "Event"])
+        self.assertEqual([row[2] for row in rows[1:]], ["Talk", "Robo", "Hack"])
+        self.assertEqual(rows[2][0], "Department event")
+
+    def test_filters(self):
+        self.assertEqual([r[2] for r in self.csv_rows(self.export(club="GDSC"))[1:]], ["Hack"])
+        self.assertEqual([r[2] for r in self.csv_rows(self.export(fest="Techfest"))[1:]], ["Robo"])
+        rows = self.csv_rows(self.export(date_from="2025-01-02", date_to="2025-01-10"))
+        self.assertEqual([r[2] for r in rows[1:]], ["Robo", "Hack"])
+        self.assertEqual(self.export(date_from="2025-02-01", date_to="2025-01-01").status_code, 400)
+
+    def test_xlsx(self):
+        response = self.export(file_format="xlsx")
+        self.assertEqual(response.status_code, 200)
+        workbook = load_workbook(io.BytesIO(b"".join(response.streaming_content)), read_only=True)
+        rows = list(workbook["Events"].values)
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[-1][2], "Circuit")
+
+
+class StoredReportTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("reporter"))
+        self.dept = Department.objects.create(department_name="CS", password="x", department_description="d")
+        self.event = Event.objects.create(
+            event_name="Talk", event_start_date=datetime.date(2025, 1, 1), event_end_date=datetime.date(2025, 1, 1),
+            event_time="10:00", department_name=self.dept, event_venue="Hall",
+        )
+
+    def request_report(self):
+        return self.client.post("/api/reports/generate/", {"format": "csv", "department": "CS"}, format="json")
+
+    def test_identical_request_is_served_from_the_artifact(self):
+        response = self.request_report()
+        self.assertEqual(response.status_code, 202)
+        report_id = response.json()["report"]["id"]
+        # Still queued: asking again does not queue a second build.
+        self.assertEqual(self.request_report().json()["report"]["id"], report_id)
+
+        self.assertEqual(run_pending_reports(), 1)
+        response = self.request_report()
+        self.assertEqual(response.status_code, 200)
+        report = response.json()["report"]
+        self.assertEqual((report["id"], report["status"], report["row_count"]), (report_id, "ready", 1))
+        self.assertEqual(Report.objects.count(), 1)
+
+        download = self.client.get(report["download_url"])
+        rows = list(csv.reader(io.StringIO(b"".join(download.streaming_content).decode())))
+        self.assertEqual([row[2] for row in rows], ["Event", "Talk"])
+
+    def test_artifact_is_not_shared_between_users(self):
+        self.request_report()
+        run_pending_reports()
+
+        other = APIClient()
+        other.force_authenticate(User.objects.create_user("other"))
+        response = other.post("/api/reports/generate/", {"format": "csv", "department": "CS"}, format="json")
+        self.assertEqual(response.status_code, 202)
+        run_pending_reports()
+        report = other.get("/api/reports/").json()["reports"][0]
+        self.assertEqual(other.get(report["download_url"]).status_code, 200)
+        self.assertEqual(Report.objects.filter(status="ready").count(), 2)
+
+    def test_event_change_invalidates_the_artifact(self):
+        self.request_report()
+        run_pending_reports()
+        old = Report.objects.get()
+
+        self.event.event_name = "Keynote"
+        self.event.save()
+        listed = self.client.get("/api/reports/").json()["reports"]
+        self.assertTrue(listed[0]["stale"])
+
+        response = self.request_report()
+        self.assertEqual(response.status_code, 202)
+        run_pending_reports()
+        new = Report.objects.get()
+        self.assertNotEqual(new.pk, old.pk)
+        self.assertFalse(default_storage.exists(old.path))
+
+    def test_abandoned_report_fails_and_is_queued_again(self):
+        self.request_report()
+        Report.objects.update(status="running", started_at=timezone.now() - REPORT_RUNNING_TIMEOUT * 2)
+        response = self.request_report()
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(run_pending_reports(), 1)
+        self.assertEqual(
+            sorted(Report.objects.values_list("status", flat=True)), ["failed", "ready"],
+        )
+
+    @override_settings(CRON_SECRET="s3cret")
+    def test_cron_endpoint_builds_queued_reports(self):
+        self.request_report()
+        url = reverse("api:build-queued-reports")
+        self.assertEqual(self.client.get(url).status_code, 401)
+        response = self.client.get(url, HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(response.json(), {"built": 1})
+        self.assertEqual(Report.objects.get().status, "ready")
+
+    def test_budget_stops_new_builds(self):
+        self.request_report()
+        self.assertEqual(run_pending_reports(budget_seconds=0), 0)
+        self.assertEqual(Report.objects.get().status, "pending")
+
+
+class BulkCreateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("staff", is_staff=True))
+        cs = Department.objects.create(department_name="CS", password="x", department_description="d")
+        Department.objects.create(department_name="EE", password="x", department_description="d")
+        Club.objects.create(club_name="GDSC", department_name=cs, club_description="c")
+        Fest.objects.create(
+            fest_name="Techfest", department_name=cs,
+            event_start_date=datetime.date(2025, 2, 1), event_end_date=datetime.date(2025, 2, 3),
+        )
+
+    def rows(self, count, **extra):
+        return [
+            {"event_name": f"Event {i}", "event_start_date": "2025-02-01", "event_end_date": "2025-02-02",
+             "event_time": "10:00", "event_venue": "Hall", "department_name": "CS", **extra}
+            for i in range(count)
+        ]
+
+    def test_rows_are_inserted_in_bulk(self):
+        # Warm up the one-off change-stamp and cache rows.
+        self.client.post("/api/events/", self.rows(1, club_name="GDSC"), format="json")
+        with CaptureQueriesContext(connection) as small:
+            self.client.post("/api/events/", self.rows(2, club_name="GDSC"), format="json")
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.post("/api/events/", self.rows(40, club_name="GDSC"), format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {"created": 40, "errors": []})
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+        self.assertEqual(EventIndex.objects.filter(event_type=EventIndex.CLUB).count(), 43)
+
+    def test_invalid_rows_are_reported_and_nothing_is_created(self):
+        rows = self.rows(4, fest_name="Techfest")
+        rows[1]["fest_name"] = "Nofest"
+        rows[2]["event_end_date"] = "2025-01-01"
+        rows[3]["department_name"] = "EE"
+        response = self.client.post("/api/department-events/", rows, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        errors = {error["row"]: set(error["errors"]) for error in response.json()["errors"]}
+        self.assertEqual(errors, {2: {"fest_name"}, 3: {"event_end_date"}, 4: {"fest_name"}})
+        self.assertFalse(dEvent.objects.exists())
+
+    def test_array_of_non_objects_is_rejected(self):
+        for body in ([1, 2], [self.rows(1)[0], "row"]):
+            response = self.client.post("/api/events/", body, format="json")
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {"error": "JSON must be an array of objects."})
+        self.assertFalse(Event.objects.exists())
+
+    def test_csv_upload(self):
+        upload = SimpleUploadedFile(
+            "events.csv",
+            b"event_name,event_start_date,event_end_date,event_time,event_venue,department_name,fest_name\n"
+            b"Robo,2025-02-01,2025-02-01,10:00,Lab,CS,Techfest\n"
+            b"Quiz,2025-02-02,2025-02-02,11:00,Hall,CS,\n",
+        )
+        response = self.client.post("/api/department-events/", {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            sorted(dEvent.objects.values_list("event_name", "fest_name")),
+            [("Quiz", None), ("Robo", "Techfest")],
+        )
+
+
+class ServerTimingTests(TestCase):
+    def setUp(self):
+        view_stats.clear()
+        self.client = APIClient()
+        dept = Department.objects.create(department_name="CS", password="x", department_description="d")
+        Club.objects.create(club_name="GDSC", department_name=dept, club_description="c")
+
+    def test_header_reports_queries_and_phases(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/clubs/")
+        header = response["Server-Timing"]
+        for metric in ("total;dur=", "db;dur=", "tpl;dur=", "serialize;dur=", "app;dur="):
+            self.assertIn(metric, header)
+        self.assertIn(f'desc="{len(queries)} queries"', header)
+
+    def test_serializer_data_counts_as_serialize_time(self):
+        real = ClubSerializer.to_representation
+
+        def slow(serializer, instance):
+            time.sleep(0.03)
+            return real(serializer, instance)
+
+        with mock.patch.object(ClubSerializer, "to_representation", slow):
+            for url in ("/api/clubs/", "/api/clubs/GDSC/"):
+                header = self.client.get(url)["Server-Timing"]
+                serialize_ms = float(re.search(r"serialize;dur=([\d.]+)", header).group(1))
+                self.assertGreaterEqual(serialize_ms, 30, url)
+
+    def test_percentile_is_nearest_rank(self):
+        hundred = list(range(1, 101))
+        self.assertEqual(percentile(hundred, 0.95), 95)
+        self.assertEqual(percentile(hundred, 0.99), 99)
+        self.assertEqual(percentile(hundred, 0.07), 7)
+        self.assertEqual(percentile(list(range(1, 11)), 0.50), 5)
+        self.assertEqual(percentile([4], 0.99), 4)
+
+    def test_view_timings_are_staff_only(self):
+        for _ in range(3):
+            self.client.get("/api/clubs/")
+        self.assertEqual(self.client.get("/api/perf/views/").status_code, 403)
+
+        staff = User.objects.create_user("ops", password="x", is_staff=True)
+        self.client.force_authenticate(staff)
+        views = self.client.get("/api/perf/views/").json()["views"]
+        self.assertEqual(views["api:club-list"]["count"], 3)
+        self.assertLessEqual(views["api:club-list"]["p50_ms"], views["api:club-list"]["p99_ms"])
+
+
+    def test_db_pool_stats_are_staff_only(self):
+        self.assertEqual(self.client.get("/api/perf/db/").status_code, 403)
+
+        staff = User.objects.create_user("ops", password="x", is_staff=True)
+        self.client.force_authenticate(staff)
+        stats = self.client.get("/api/perf/db/").json()
+        self.assertEqual(stats["vendor"], connection.vendor)
+        self.assertIn(stats["mode"], ("persistent", "pool", "transaction"))
+        if connection.vendor == "postgresql":
+            self.assertGreaterEqual(stats["server"]["open"], 1)
+            self.assertLessEqual(stats["server"]["open"], stats["server"]["max_connections"])
+
+
+class LazyImportTests(TestCase):
+    def test_lazy_include_loads_on_first_namespaced_reverse(self):
+        from django.http import HttpResponse
+        from django.urls import path
+        from django.urls.resolvers import RegexPattern, URLResolver
+        from clue.lazy import lazy_include
+
+        api = lazy_include("api/", "api.urls", "api")
+        root = URLResolver(RegexPattern(r"^/"), [path("page/", HttpResponse, name="page"), api])
+        self.assertEqual(root.reverse("page"), "page/")
+        self.assertNotIn("urlconf_module", api.__dict__)
+
+        prefix, resolver = root.namespace_dict["api"]
+        self.assertEqual(prefix + resolver.reverse("event-stats"), "api/analytics/stats/")
+        self.assertIn("urlconf_module", api.__dict__)
+
+    def test_lazy_view_imports_on_first_call(self):
+        from clue.lazy import lazy_view
+
+        view = lazy_view("api.analytics.get_event_stats", csrf_exempt=True)
+        self.assertTrue(view.csrf_exempt)
+        self.assertEqual(view.__name__, "get_event_stats")
+        request = APIRequestFactory().get("/api/analytics/stats/")
+        force_authenticate(request, User.objects.create_user("ops", password="x", is_staff=True))
+        self.assertEqual(view(request).status_code, 200)
+
+    @override_settings(
+        AWS_S3_CUSTOM_DOMAIN="bucket.s3.amazonaws.com", AWS_LOCATION="media",
+        AWS_STORAGE_BUCKET_NAME="bucket",
+    )
+    def test_lazy_s3_urls_match_s3boto3(self):
+        from storages.backends.s3boto3 import S3Boto3Storage
+        from clue.lazy import LazyS3Storage
+
+        lazy = LazyS3Storage()
+        for name in ("posters/a b.webp", "gallery/1/ü.jpg"):
+            self.assertEqual(lazy.url(name), S3Boto3Storage().url(name))
+        self.assertIsNone(lazy._storage)
+        self.assertEqual(lazy.location, "media")
+        self.assertIsNotNone(lazy._storage)
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
@@ -7,10 +8,29 @@ from .views import (
     FestViewSet,
     DepartmentEventViewSet,
     NoticeViewSet,
+    EventIndexViewSet,
 )
-from .analytics import get_event_stats, get_event_analytics
-from .gallery import get_event_gallery, upload_gallery_image, delete_gallery_image
-from .reports import generate_event_report, get_event_reports
+from clue.lazy import lazy_view
+from .analytics import get_db_pool_stats, get_event_stats, get_event_analytics, get_view_timings
+
+app_name = 'api'
+
+# Reports and the gallery are rarely used; with LAZY_IMPORTS their modules
+# (PDF/Excel export, the upload pool) load on their first request.
+if settings.LAZY_IMPORTS:
+    get_event_gallery = lazy_view('api.gallery.get_event_gallery', csrf_exempt=True)
+    upload_gallery_image = lazy_view('api.gallery.upload_gallery_image', csrf_exempt=True)
+    delete_gallery_image = lazy_view('api.gallery.delete_gallery_image', csrf_exempt=True)
+    generate_event_report = lazy_view('api.reports.generate_event_report', csrf_exempt=True)
+    get_event_reports = lazy_view('api.reports.get_event_reports', csrf_exempt=True)
+    export_events_report = lazy_view('api.reports.export_events_report', csrf_exempt=True)
+    download_report = lazy_view('api.reports.download_report', csrf_exempt=True)
+    build_queued_reports = lazy_view('api.reports.build_queued_reports', csrf_exempt=True)
+else:
+    from .gallery import get_event_gallery, upload_gallery_image, delete_gallery_image
+    from .reports import (
+        generate_event_report, get_event_reports, export_events_report, download_report, build_queued_reports,
+    )
 
 router = DefaultRouter()
 router.register(r'departments', DepartmentViewSet)
@@ -19,6 +39,7 @@ router.register(r'events', EventViewSet)
 router.register(r'fests', FestViewSet)
 router.register(r'department-events', DepartmentEventViewSet)
 router.register(r'notices', NoticeViewSet)
+router.register(r'all-events', EventIndexViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -34,5 +55,12 @@ urlpatterns = [
     
     # Report endpoints
     path('reports/generate/', generate_event_report, name='generate-report'),
+    path('reports/export/', export_events_report, name='export-events-report'),
+    path('reports/<int:report_id>/download/', download_report, name='download-report'),
     path('reports/', get_event_reports, name='event-reports'),
+    path('cron/build-reports/', build_queued_reports, name='build-queued-reports'),
+
+    # Performance
+    path('perf/views/', get_view_timings, name='view-timings'),
+    path('perf/db/', get_db_pool_stats, name='db-pool-stats'),
 ]
@@ -1,6 +1,14 @@
-from rest_framework import viewsets, permissions
+from adrf.viewsets import GenericViewSet as AsyncGenericViewSet
+from asgiref.sync import sync_to_async
+from django.utils.timezone import now
+from clue.timing import serializing
+from rest_framework import mixins, permissions
+from rest_framework.response import Response
+from event.importer import ImportFileError, check_rows, import_events, parse_rows
 from event.models import Department, Club, Event, Notice
+from event.versions import conditional_response, last_changed, make_etag, set_validators, start_of_today
 from department.models import Fest, dEvent
+from home.models import EventIndex
 from .serializers import (
     DepartmentSerializer,
     ClubSerializer,
@@ -8,6 +16,15 @@ from .serializers import (
     FestSerializer,
     DepartmentEventSerializer,
     NoticeSerializer,
+    EventIndexSerializer,
+)
+from .querysets import (
+    department_queryset,
+    club_queryset,
+    event_queryset,
+    fest_queryset,
+    devent_queryset,
+    notice_queryset,
 )
 
 
@@ -18,37 +35,186 @@ class ReadOnlyUnlessStaff(permissions.BasePermission):
         return bool(request.user and request.user.is_staff)
 
 
-class DepartmentViewSet(viewsets.ModelViewSet):
-    queryset = Department.objects.all().order_by("department_name")
+class ConditionalGetMixin:
+    """
+    ETag/Last-Modified for list and detail responses.
+
+    Validators come from the change stamps of ``version_models`` plus the
+    request path, so an unchanged resource is answered with a 304 before the
+    queryset is touched. Filters such as ``when=upcoming`` move with the
+    date, so nothing is treated as older than the start of today. The
+    browsable API is left alone since it renders per-user HTML.
+
+    ``list`` is async: the viewsets below are adrf viewsets, so under ASGI a
+    list request waits on the database without holding a worker thread. The
+    other actions stay synchronous and adrf runs them in a thread.
+    """
+    version_models = ()
+
+    def _validators(self, request):
+        changed = max(last_changed(*self.version_models), start_of_today())
+        return make_etag(changed.isoformat(), request.get_full_path()), changed
+
+    def _conditional(self, handler, request, *args, **kwargs):
+        if getattr(request.accepted_renderer, "format", None) != "json":
+            return handler(request, *args, **kwargs)
+        etag, changed = self._validators(request)
+        response = conditional_response(request, etag, changed)
+        if response is None:
+            response = set_validators(handler(request, *args, **kwargs), etag, changed)
+        return response
+
+    def _serialize(self, instance, **kwargs):
+        with serializing():
+            return self.get_serializer(instance, **kwargs).data
+
+    async def _alist(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.paginator is None:
+            rows = [row async for row in queryset]
+        else:
+            rows = await self.paginator.apaginate_queryset(queryset, request, view=self)
+        # Serializers may still follow a relation lazily, which the async
+        # ORM guard refuses outside a thread.
+        data = await sync_to_async(self._serialize)(rows, many=True)
+        if self.paginator is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+    async def list(self, request, *args, **kwargs):
+        if getattr(request.accepted_renderer, "format", None) != "json":
+            return await self._alist(request)
+        etag, changed = await sync_to_async(self._validators)(request)
+        response = conditional_response(request, etag, changed)
+        if response is None:
+            response = set_validators(await self._alist(request), etag, changed)
+        return response
+
+    def _retrieve(self, request, *args, **kwargs):
+        return Response(self._serialize(self.get_object()))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(self._retrieve, request, *args, **kwargs)
+
+
+class ModelViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.UpdateModelMixin,
+    mixins.DestroyModelMixin,
+    mixins.ListModelMixin,
+    AsyncGenericViewSet,
+):
+    """DRF's ``ModelViewSet`` on adrf's async-capable ``GenericViewSet``."""
+
+
+class ReadOnlyModelViewSet(mixins.RetrieveModelMixin, mixins.ListModelMixin, AsyncGenericViewSet):
+    """DRF's ``ReadOnlyModelViewSet`` on adrf's async-capable ``GenericViewSet``."""
+
+
+class DepartmentViewSet(ConditionalGetMixin, ModelViewSet):
+    queryset = department_queryset().order_by("department_name")
     serializer_class = DepartmentSerializer
     permission_classes = [ReadOnlyUnlessStaff]
+    keyset_ordering = ("department_name",)
+    version_models = (Department,)
 
 
-class ClubViewSet(viewsets.ModelViewSet):
-    queryset = Club.objects.all().order_by("club_name")
+class ClubViewSet(ConditionalGetMixin, ModelViewSet):
+    queryset = club_queryset().order_by("club_name")
     serializer_class = ClubSerializer
     permission_classes = [ReadOnlyUnlessStaff]
+    keyset_ordering = ("club_name",)
+    version_models = (Club,)
+
 
+class BulkCreateMixin:
+    """
+    ``POST`` a JSON array, or a CSV/JSON ``file`` upload, to the list endpoint
+    to create many rows in one transaction via ``event.importer``; a single
+    object is still created the usual way. Invalid rows are reported per row
+    and nothing is created.
+    """
 
-class EventViewSet(viewsets.ModelViewSet):
-    queryset = Event.objects.all().order_by("-event_start_date")
+    def create(self, request, *args, **kwargs):
+        try:
+            if isinstance(request.data, list):
+                rows = check_rows(request.data)
+            elif "file" in request.FILES:
+                rows = parse_rows(request.FILES["file"])
+            else:
+                return super().create(request, *args, **kwargs)
+        except ImportFileError as error:
+            return Response({"error": str(error)}, status=400)
+        result = import_events(self.queryset.model, rows)
+        return Response(result, status=400 if result["errors"] else 201)
+
+
+class EventViewSet(BulkCreateMixin, ConditionalGetMixin, ModelViewSet):
+    queryset = event_queryset().order_by("-event_start_date")
     serializer_class = EventSerializer
     permission_classes = [ReadOnlyUnlessStaff]
+    keyset_ordering = ("event_start_date", "id")
+    version_models = (Event,)
 
 
-class FestViewSet(viewsets.ModelViewSet):
-    queryset = Fest.objects.all().order_by("-event_start_date")
+class FestViewSet(ConditionalGetMixin, ModelViewSet):
+    queryset = fest_queryset().order_by("-event_start_date")
     serializer_class = FestSerializer
     permission_classes = [ReadOnlyUnlessStaff]
+    keyset_ordering = ("event_start_date", "fest_name")
+    version_models = (Fest,)
 
 
-class DepartmentEventViewSet(viewsets.ModelViewSet):
-    queryset = dEvent.objects.all().order_by("-event_start_date")
+class DepartmentEventViewSet(BulkCreateMixin, ConditionalGetMixin, ModelViewSet):
+    queryset = devent_queryset().order_by("-event_start_date")
     serializer_class = DepartmentEventSerializer
     permission_classes = [ReadOnlyUnlessStaff]
+    keyset_ordering = ("event_start_date", "id")
+    version_models = (dEvent,)
 
 
-class NoticeViewSet(viewsets.ModelViewSet):
-    queryset = Notice.objects.all().order_by("-date_posted")
+class NoticeViewSet(ConditionalGetMixin, ModelViewSet):
+    queryset = notice_queryset().order_by("-date_posted")
     serializer_class = NoticeSerializer
     permission_classes = [ReadOnlyUnlessStaff]
+    keyset_ordering = ("-date_posted", "-id")
+    version_models = (Notice,)
+
+
+class EventIndexViewSet(ConditionalGetMixin, ReadOnlyModelViewSet):
+    """Club and department events in one ordered, paginated listing."""
+    queryset = EventIndex.objects.all().order_by("event_start_date", "id")
+    serializer_class = EventIndexSerializer
+    permission_classes = [permissions.AllowAny]
+    keyset_ordering = ("event_start_date", "id")
+    version_models = (Event, dEvent)
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        params = self.request.query_params
+
+        event_type = params.get("type")
+        if event_type in (EventIndex.CLUB, EventIndex.DEPARTMENT):
+            qs = qs.filter(event_type=event_type)
+
+        department = params.get("department")
+        if department:
+            qs = qs.filter(department_name=department)
+        club = params.get("club")
+        if club:
+            qs = qs.filter(club_name=club)
+        fest = params.get("fest")
+        if fest:
+            qs = qs.filter(fest_name=fest)
+
+        when = params.get("when")
+        today = now().date()
+        if when == "upcoming":
+            qs = qs.filter(event_start_date__gte=today)
+        elif when == "past":
+            qs = qs.filter(event_end_date__lt=today)
+        elif when == "today":
+            qs = qs.filter(event_start_date__lte=today, event_end_date__gte=today)
+
+        return qs
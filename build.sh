@@ -7,6 +7,12 @@ echo "Installing dependencies..."
 pip install --upgrade pip
 pip install -r requirements.txt
 
+# The React app is served by Django under /app/, its bundle from /static/app/.
+if [ -f frontend/package.json ] && command -v npm >/dev/null 2>&1; then
+    echo "Building frontend..."
+    (cd frontend && npm ci && VITE_BASE=/static/app/ VITE_ROUTER_BASENAME=/app VITE_API_URL=/api npm run build)
+fi
+
 echo "Collecting static files..."
 python manage.py collectstatic --noinput --clear
 
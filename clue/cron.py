@@ -0,0 +1,28 @@
+"""
+Endpoints for scheduled jobs, such as the ``crons`` in vercel.json.
+
+Hosts without worker processes call these URLs on a schedule with
+``Authorization: Bearer <CRON_SECRET>``. Hosts that run the workers leave
+``CRON_SECRET`` unset, which turns every such endpoint off (404).
+"""
+import hmac
+from functools import wraps
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+
+def cron_job(view):
+    """Guard ``view`` with the ``CRON_SECRET`` bearer token."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not settings.CRON_SECRET:
+            raise Http404
+        expected = f"Bearer {settings.CRON_SECRET}"
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), expected):
+            return HttpResponse(status=401)
+        return view(request, *args, **kwargs)
+
+    return csrf_exempt(require_http_methods(["GET", "POST"])(wrapper))
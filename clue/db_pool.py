@@ -0,0 +1,77 @@
+"""
+Database connection usage for the staff endpoint ``api/perf/db/``.
+
+Reports the ``DB_POOL_MODE`` in effect, this process's psycopg pool (when
+``DB_POOL_MODE=pool``) and, on Postgres, how many server connections the
+database has open against its ``max_connections``. The server numbers cover
+every process and lambda instance, which is what runs out under bursts.
+"""
+import os
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+
+def pool_stats(connection):
+    """Size and utilization of ``connection``'s pool, or None without one."""
+    pool = getattr(connection, "pool", None)
+    if pool is None:
+        return None
+    stats = pool.get_stats()
+    in_use = stats.get("pool_size", 0) - stats.get("pool_available", 0)
+    return {
+        "min_size": stats.get("pool_min"),
+        "max_size": stats.get("pool_max"),
+        "size": stats.get("pool_size"),
+        "available": stats.get("pool_available"),
+        "in_use": in_use,
+        "utilization": round(in_use / stats["pool_max"], 3) if stats.get("pool_max") else None,
+        "requests_waiting": stats.get("requests_waiting", 0),
+        "requests": stats.get("requests_num", 0),
+        "requests_queued": stats.get("requests_queued", 0),
+        "requests_wait_ms": stats.get("requests_wait_ms", 0),
+        "requests_errors": stats.get("requests_errors", 0),
+        "connections_opened": stats.get("connections_num", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+    }
+
+
+def server_connections(connection):
+    """Open connections to this database and the server's limit (Postgres only)."""
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT state, count(*) FROM pg_stat_activity "
+            "WHERE datname = current_database() GROUP BY state"
+        )
+        by_state = {state or "unknown": count for state, count in cursor.fetchall()}
+        cursor.execute("SHOW max_connections")
+        max_connections = int(cursor.fetchone()[0])
+    total = sum(by_state.values())
+    return {
+        "open": total,
+        "by_state": by_state,
+        "max_connections": max_connections,
+        "utilization": round(total / max_connections, 3),
+    }
+
+
+def database_stats(alias="default"):
+    """``(healthy, stats)`` for the database ``alias``."""
+    connection = connections[alias]
+    stats = {
+        "pid": os.getpid(),
+        "vendor": connection.vendor,
+        "mode": getattr(settings, "DB_POOL_MODE", "persistent"),
+        "conn_max_age": connection.settings_dict.get("CONN_MAX_AGE"),
+        "pool": pool_stats(connection),
+    }
+    try:
+        stats["server"] = server_connections(connection)
+        if stats["server"] is None:
+            connection.ensure_connection()
+    except DatabaseError as error:
+        stats["error"] = str(error)
+        return False, stats
+    return True, stats
@@ -0,0 +1,25 @@
+"""
+Gunicorn settings for serving ``clue.asgi`` with uvicorn workers.
+
+    gunicorn clue.asgi:application -c clue/gunicorn_asgi.py
+
+Each worker runs an event loop, so the async views (home, calendar, search
+and the API lists) keep serving other requests while theirs wait on the
+database. ``WEB_CONCURRENCY`` sets the worker count and ``PORT`` the port.
+
+Django's persistent connections belong to a thread, and under ASGI each
+request's queries run on a thread of their own, so kept-alive connections
+would pile up until the database refuses new ones. They are turned off here;
+set ``DB_POOL_MODE=pool`` to reuse connections through a per-worker pool.
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "uvicorn_worker.UvicornWorker"
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+keepalive = 5
+raw_env = ["DB_CONN_MAX_AGE=0"]
+accesslog = "-"
+errorlog = "-"
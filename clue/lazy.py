@@ -0,0 +1,112 @@
+"""
+Deferred imports for cold starts (``LAZY_IMPORTS``).
+
+A serverless instance pays for every import before its first response. With
+``LAZY_IMPORTS`` on, code most requests never need is imported on first use:
+
+* ``lazy_include`` - the ``api/`` URLconf, and with it DRF, is imported on
+  the first API request or the first reverse of an ``api:`` URL name. The
+  root resolver populates every include the first time any URL is reversed
+  (``{% url %}`` in the base template); a namespaced include only needs its
+  own names once one of them is reversed, so it can wait until then.
+* ``lazy_view`` - views of rarely used modules (reports, gallery).
+* ``LazyS3Storage`` - boto3 and django-storages are imported on the first file
+  operation; URLs on a custom domain are built without them.
+
+``manage.py coldstart_profile`` measures what this saves.
+"""
+from django.conf import settings
+from django.urls import URLResolver
+from django.urls.resolvers import RoutePattern
+from django.utils.encoding import filepath_to_uri
+from django.utils.module_loading import import_string
+
+
+class LazyURLResolver(URLResolver):
+    """A namespaced include that imports its URLconf when first used."""
+
+    def _loaded(self):
+        return "urlconf_module" in self.__dict__
+
+    def _populate(self):
+        # Called by the parent resolver for every include; skip until loaded.
+        if self._loaded():
+            super()._populate()
+
+    @property
+    def reverse_dict(self):
+        self.urlconf_module
+        return super().reverse_dict
+
+    @property
+    def namespace_dict(self):
+        self.urlconf_module
+        return super().namespace_dict
+
+    @property
+    def app_dict(self):
+        self.urlconf_module
+        return super().app_dict
+
+
+def lazy_include(route, urlconf_name, namespace):
+    """``path(route, include((urlconf_name, namespace)))``, imported on first use."""
+    return LazyURLResolver(
+        RoutePattern(route, is_endpoint=False), urlconf_name,
+        app_name=namespace, namespace=namespace,
+    )
+
+
+def lazy_view(dotted_path, csrf_exempt=False):
+    """A view that imports ``dotted_path`` on its first request.
+
+    Django reads ``csrf_exempt`` before the view runs, so it has to be
+    given here: pass True for DRF views, which do their own CSRF checks.
+    """
+    view = None
+
+    def wrapped(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(dotted_path)
+        return view(request, *args, **kwargs)
+
+    wrapped.__name__ = wrapped.__qualname__ = dotted_path.rsplit(".", 1)[1]
+    wrapped.__module__ = dotted_path.rsplit(".", 1)[0]
+    wrapped.csrf_exempt = csrf_exempt
+    return wrapped
+
+
+class LazyS3Storage:
+    """``S3Boto3Storage``, constructed on the first call that needs it."""
+
+    def __init__(self, **options):
+        self._options = options
+        self._storage = None
+
+    def _setting(self, option, name, default=None):
+        return self._options.get(option, getattr(settings, name, default))
+
+    def _backend(self):
+        if self._storage is None:
+            from storages.backends.s3boto3 import S3Boto3Storage
+            self._storage = S3Boto3Storage(**self._options)
+        return self._storage
+
+    def __getattr__(self, name):
+        return getattr(self._backend(), name)
+
+    def url(self, name, *args, **kwargs):
+        # Same URL S3Storage.url builds for a custom domain without signing.
+        domain = self._setting("custom_domain", "AWS_S3_CUSTOM_DOMAIN")
+        signed = self._setting("querystring_auth", "AWS_QUERYSTRING_AUTH", True) and (
+            self._setting("cloudfront_key_id", "AWS_CLOUDFRONT_KEY_ID")
+            or self._setting("cloudfront_signer", "AWS_CLOUDFRONT_SIGNER")
+        )
+        if self._storage is not None or not domain or signed or args or kwargs:
+            return self._backend().url(name, *args, **kwargs)
+
+        from storages.utils import clean_name, safe_join
+        path = safe_join(self._setting("location", "AWS_LOCATION", ""), clean_name(name))
+        protocol = self._setting("url_protocol", "AWS_S3_URL_PROTOCOL", "https:")
+        return f"{protocol}//{domain}/{filepath_to_uri(path)}"
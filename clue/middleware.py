@@ -0,0 +1,44 @@
+"""
+Async-capable versions of third-party middleware.
+
+Under ASGI, Django wraps every sync-only middleware in a thread hop, once on
+the way in and once on the way out. WhiteNoise 6 is sync-only, so this
+subclass adds an async path that looks the file up without leaving the event
+loop and only uses a thread to open and serve a static file.
+
+It also marks the Vite bundle's ``assets/`` as immutable. WhiteNoise only
+recognises Django's own hashed names, and ``clue.staticfiles`` keeps Vite's.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def immutable_file_test(self, path, url):
+        # Vite names every file it writes to assets/ after its content.
+        frontend_assets = self.static_prefix + getattr(settings, "FRONTEND_STATIC_PREFIX", "app/") + "assets/"
+        return url.startswith(frontend_assets) or super().immutable_file_test(path, url)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
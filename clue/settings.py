@@ -6,6 +6,8 @@ import json
 from urllib.parse import urlparse
 from typing import List
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Ensure CSS served with correct mimetype
 mimetypes.add_type("text/css", ".css", True)
 
@@ -46,6 +48,13 @@ ALLOWED_HOSTS = [
 CSRF_TRUSTED_ORIGINS = _csv_env("CSRF_TRUSTED_ORIGINS", [])
 
 # ====== APPLICATION ======
+# Serverless cold starts: import the API, reports, gallery and the S3 client
+# on first use rather than at startup (clue.lazy). The API is then served as
+# JSON only: the browsable API needs "rest_framework" as an app, and the
+# template engine imports every app's tag libraries on the first page render.
+# Measure with ``manage.py coldstart_profile --compare``.
+LAZY_IMPORTS = os.getenv("LAZY_IMPORTS", "1" if os.getenv("VERCEL") else "0").lower() in ("1", "true", "yes")
+
 INSTALLED_APPS = [
     "whitenoise.runserver_nostatic",
     "django.contrib.admin",
@@ -54,7 +63,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "rest_framework",
+    *([] if LAZY_IMPORTS else ["rest_framework"]),
     "signup",
     "home",
     "event",
@@ -64,8 +73,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "clue.timing.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "clue.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -86,7 +96,7 @@ ROOT_URLCONF = "clue.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "clue.timing.TimedDjangoTemplates",
         "DIRS": ['template'],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -105,13 +115,16 @@ WSGI_APPLICATION = "clue.wsgi.application"
 # ====== DATABASE ======
 # PostgreSQL Configuration using dj-database-url
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Persistent connections are per thread. Under ASGI every request runs its
+# queries on a fresh thread, so clue/gunicorn_asgi.py sets this to 0.
+DB_CONN_MAX_AGE = int(os.getenv("DB_CONN_MAX_AGE", "600"))
 
 if DATABASE_URL:
     import dj_database_url
     DATABASES = {
         "default": dj_database_url.config(
             default=DATABASE_URL,
-            conn_max_age=600,
+            conn_max_age=DB_CONN_MAX_AGE,
             conn_health_checks=True,
         )
     }
@@ -125,19 +138,98 @@ else:
             "PASSWORD": os.getenv("DB_PASSWORD", "postgres"),
             "HOST": os.getenv("DB_HOST", "localhost"),
             "PORT": os.getenv("DB_PORT", "5432"),
+            "CONN_MAX_AGE": DB_CONN_MAX_AGE,
         }
     }
 
+# How Postgres connections are reused (DB_POOL_MODE):
+#   persistent  - one connection per thread, kept for DB_CONN_MAX_AGE seconds.
+#   pool        - a psycopg connection pool per process, DB_POOL_MIN_SIZE to
+#                 DB_POOL_MAX_SIZE connections; a request waits up to
+#                 DB_POOL_TIMEOUT seconds for one. Suits long-lived servers,
+#                 including the ASGI profile.
+#   transaction - for a transaction-mode pooler in front of Postgres
+#                 (PgBouncer, Supabase's pooler on port 6543): connect per
+#                 request, no server-side cursors, no prepared statements.
+# Every Vercel lambda instance would otherwise hold its own connections, so
+# Vercel defaults to "transaction".
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "transaction" if os.getenv("VERCEL") else "persistent")
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+
+if DB_POOL_MODE not in ("persistent", "pool", "transaction"):
+    raise ImproperlyConfigured(f"Unknown DB_POOL_MODE {DB_POOL_MODE!r}.")
+if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql" and DB_POOL_MODE != "persistent":
+    _db = DATABASES["default"]
+    _db["CONN_MAX_AGE"] = 0
+    _db["CONN_HEALTH_CHECKS"] = False
+    _db.setdefault("OPTIONS", {})
+    if DB_POOL_MODE == "pool":
+        _db["OPTIONS"]["pool"] = {
+            "min_size": DB_POOL_MIN_SIZE,
+            "max_size": DB_POOL_MAX_SIZE,
+            "timeout": DB_POOL_TIMEOUT,
+        }
+    else:
+        _db["DISABLE_SERVER_SIDE_CURSORS"] = True
+        # psycopg 3 prepares repeated statements on the server, which a
+        # transaction pooler may hand to a different backend.
+        _db["OPTIONS"]["prepare_threshold"] = None
 
 
 # ====== CACHE ======
+# Shared across workers and lambdas: Redis (redis package) or Memcached
+# (pymemcache package) when configured, otherwise the database cache table
+# created by the home app migrations. CACHE_BACKEND=file|locmem picks a
+# local-only stand-in for development.
+REDIS_URL = os.getenv("REDIS_URL", "")
+MEMCACHED_LOCATION = os.getenv("MEMCACHED_LOCATION", "")
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "").lower() or (
+    "redis" if REDIS_URL else "memcached" if MEMCACHED_LOCATION else "database"
+)
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "clue")
+CACHE_DEFAULT_TIMEOUT = int(os.getenv("CACHE_DEFAULT_TIMEOUT", "300"))
+
+if CACHE_BACKEND == "redis":
+    _cache = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL or "redis://127.0.0.1:6379/0",
+    }
+elif CACHE_BACKEND == "memcached":
+    _cache = {
+        "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+        "LOCATION": _split_env_list(MEMCACHED_LOCATION or "127.0.0.1:11211"),
+    }
+elif CACHE_BACKEND == "file":
+    _cache = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv("CACHE_DIR", os.path.join("/tmp", "clue-cache")),
+    }
+elif CACHE_BACKEND == "locmem":
+    _cache = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "unique-cache-name",
+    }
+else:
+    _cache = {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": os.getenv("CACHE_TABLE", "clue_cache"),
+    }
+
 CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-cache-name',
+    "default": {
+        **_cache,
+        "KEY_PREFIX": CACHE_KEY_PREFIX,
+        "TIMEOUT": CACHE_DEFAULT_TIMEOUT,
     }
 }
 
+# ====== SEARCH ======
+# Dotted path to a home.search backend; empty picks one from the database
+# vendor (PostgreSQL tsvector, SQLite FTS5, otherwise icontains).
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "")
+
 # ====== PASSWORD VALIDATION ======
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -155,7 +247,16 @@ USE_TZ = True
 # ====== STATIC / MEDIA ======
 STATIC_URL = "/static/"
 STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
-STATICFILES_DIRS = (os.path.join(BASE_DIR, "static"),)
+STATICFILES_DIRS = [os.path.join(BASE_DIR, "static")]
+
+# The React app in frontend/, built by build.sh with Vite. collectstatic
+# copies the bundle under FRONTEND_STATIC_PREFIX and the ``frontend`` view
+# serves its index page from the Vite manifest.
+FRONTEND_DIST = os.getenv("FRONTEND_DIST", os.path.join(BASE_DIR, "frontend", "dist"))
+FRONTEND_MANIFEST = os.path.join(FRONTEND_DIST, ".vite", "manifest.json")
+FRONTEND_STATIC_PREFIX = "app/"
+if os.path.isdir(FRONTEND_DIST):
+    STATICFILES_DIRS.append((FRONTEND_STATIC_PREFIX.rstrip("/"), FRONTEND_DIST))
 
 # Media Storage Configuration
 USE_S3 = os.getenv("USE_S3", "False").lower() in ("1", "true", "yes")
@@ -175,18 +276,30 @@ if USE_S3:
     DEFAULT_FILE_STORAGE = "storages.backends.s3boto3.S3Boto3Storage"
     
     STORAGES = {
-        "default": {"BACKEND": "storages.backends.s3boto3.S3Boto3Storage"},
-        "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+        "default": {
+            "BACKEND": "clue.lazy.LazyS3Storage" if LAZY_IMPORTS else "storages.backends.s3boto3.S3Boto3Storage",
+        },
+        "staticfiles": {"BACKEND": "clue.staticfiles.StaticFilesStorage"},
     }
 else:
     # Local file storage (default)
     STORAGES = {
         "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
-        "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+        "staticfiles": {"BACKEND": "clue.staticfiles.StaticFilesStorage"},
     }
     MEDIA_URL = "/media/"
     MEDIA_ROOT = os.path.join(BASE_DIR, "static", "media")
 
+# Render poster variants during the request instead of on a background
+# pool, for hosts that freeze the process after the response.
+POSTER_VARIANTS_SYNC = os.getenv("POSTER_VARIANTS_SYNC", "1" if os.getenv("VERCEL") else "0").lower() in ("1", "true", "yes")
+
+# Gallery uploads are spooled to temporary files and pushed to storage by a
+# bounded thread pool (api.gallery).
+GALLERY_UPLOAD_WORKERS = int(os.getenv("GALLERY_UPLOAD_WORKERS", "8"))
+GALLERY_MAX_FILES = int(os.getenv("GALLERY_MAX_FILES", "100"))
+GALLERY_MAX_FILE_SIZE = int(os.getenv("GALLERY_MAX_FILE_SIZE", str(20 * 1024 * 1024)))
+
 # ====== EMAIL ======
 if DEBUG:
     EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
@@ -199,6 +312,14 @@ EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
 EMAIL_USE_TLS = os.getenv("EMAIL_USE_TLS", "True").lower() in ("1", "true", "yes")
 EMAIL_USE_SSL = os.getenv("EMAIL_USE_SSL", "False").lower() in ("1", "true", "yes")
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", EMAIL_HOST_USER or "webmaster@localhost")
+# Bearer token for the Vercel cron jobs (/cron/send-queued-mail/ and
+# /api/cron/build-reports/, see clue.cron); unset where the Procfile
+# workers run.
+CRON_SECRET = os.getenv("CRON_SECRET", "")
+MAIL_CRON_BUDGET = float(os.getenv("MAIL_CRON_BUDGET", "8"))
+# A report is never cut short, so the budget only stops new ones starting.
+REPORT_CRON_BUDGET = float(os.getenv("REPORT_CRON_BUDGET", "5"))
+REPORT_CRON_LIMIT = int(os.getenv("REPORT_CRON_LIMIT", "3"))
 
 # ====== SECURITY ======
 SESSION_COOKIE_SECURE = not DEBUG
@@ -217,6 +338,12 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.TimedJSONRenderer",
+        *([] if LAZY_IMPORTS else ["rest_framework.renderers.BrowsableAPIRenderer"]),
+    ],
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.KeysetPagination",
+    "PAGE_SIZE": 20,
 }
 
 # ====== LOGGING ======
@@ -238,8 +365,23 @@ LOGGING = {
         "handlers": ["console"],
         "level": "DEBUG" if DEBUG else "INFO",
     },
+    "loggers": {
+        # One JSON line per request from clue.timing.ServerTimingMiddleware.
+        "clue.requests": {
+            "handlers": ["console"],
+            "level": os.getenv("REQUEST_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
 }
 
+# ====== PERFORMANCE INSTRUMENTATION ======
+# Server-Timing is harmless to expose but can be switched off per deployment.
+PERF_TIMING_HEADER = os.getenv("PERF_TIMING_HEADER", "True").lower() in ("1", "true", "yes")
+# Rolling window and per-view sample cap behind /api/perf/views/.
+PERF_STATS_WINDOW = int(os.getenv("PERF_STATS_WINDOW", 15 * 60))
+PERF_STATS_SAMPLES = int(os.getenv("PERF_STATS_SAMPLES", 2000))
+
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 LOGIN_URL = "login"
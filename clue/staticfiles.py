@@ -0,0 +1,32 @@
+"""
+Static files storage for the site and the React app's Vite bundle.
+
+``build.sh`` builds ``frontend/`` with Vite into ``frontend/dist``, which
+collectstatic picks up under ``FRONTEND_STATIC_PREFIX``. Vite already puts a
+content hash in every file name under ``assets/`` and its JavaScript imports
+chunks by those names, so the bundle must not be renamed again. This storage
+hashes everything else as ``CompressedManifestStaticFilesStorage`` does,
+copies the bundle as is, and writes ``.gz``/``.br`` variants of both.
+"""
+from django.conf import settings
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+class StaticFilesStorage(CompressedManifestStaticFilesStorage):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.frontend_prefix = getattr(settings, "FRONTEND_STATIC_PREFIX", "app/")
+        self._frontend_files = []
+
+    def post_process(self, paths, dry_run=False, **options):
+        site = {path: value for path, value in paths.items() if not path.startswith(self.frontend_prefix)}
+        self._frontend_files = [path for path in paths if path.startswith(self.frontend_prefix)]
+        yield from super().post_process(site, dry_run=dry_run, **options)
+        if not dry_run:
+            for name, compressed_name in self.compress_files(self._frontend_files):
+                yield name, compressed_name, True
+
+    def save_manifest(self):
+        # List the bundle under its own names so {% static %} resolves them.
+        self.hashed_files.update({self.clean_name(path): self.clean_name(path) for path in self._frontend_files})
+        super().save_manifest()
@@ -0,0 +1,275 @@
+"""
+Per-request performance instrumentation.
+
+``ServerTimingMiddleware`` measures every request and reports
+
+* ``total`` - wall time spent inside Django, up to the first byte for
+  streaming responses,
+* ``db`` - time and number of queries on every database connection, via an
+  execute wrapper that records into the current request's timings, so
+  queries an async view runs on worker threads are counted too,
+* ``tpl`` - time rendering templates (outermost render only, so includes are
+  not counted twice), via the ``TimedDjangoTemplates`` backend,
+* ``serialize`` - time DRF spends building serializer ``.data`` for list
+  and detail responses (``api.views.ConditionalGetMixin``) and rendering it
+  to JSON (``api.renderers.TimedJSONRenderer``), less any queries it ran,
+* ``app`` - whatever is left: view code, middleware.
+
+The numbers go out as a ``Server-Timing`` header, one JSON log line on the
+``clue.requests`` logger, and into rolling per-view samples that the staff
+endpoint ``api/perf/views/`` summarises as p50/p95/p99.
+
+Samples are kept per worker process. Requests are spread over the workers,
+so each worker's percentiles are a fair sample of the whole; the endpoint
+reports the pid it was answered by.
+"""
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger("clue.requests")
+
+_current = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.templates = 0.0
+        self.serialize = 0.0
+        self._template_depth = 0
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - start
+            self.queries += 1
+
+
+def current_timings():
+    """The ``RequestTimings`` of the request being handled, if any."""
+    return _current.get()
+
+
+@contextmanager
+def serializing():
+    """Count the enclosed block as ``serialize`` time, less its queries."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    db = timings.db
+    try:
+        yield
+    finally:
+        timings.serialize += max(0.0, time.perf_counter() - start - (timings.db - db))
+
+
+def _record_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings.execute_wrapper(execute, sql, params, many, context)
+
+
+def _install_wrapper(connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+def _install_on_open_connections():
+    # Connections opened before this module was imported missed the signal.
+    for connection in connections.all(initialized_only=True):
+        _install_wrapper(connection)
+
+
+connection_created.connect(_install_wrapper, dispatch_uid="clue.timing")
+
+
+# ---- template hooks ----
+
+class TimedTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        timings = _current.get()
+        if timings is None:
+            return self.template.render(context, request)
+        timings._template_depth += 1
+        start = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            timings._template_depth -= 1
+            if not timings._template_depth:
+                timings.templates += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, timing every top-level render."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
+
+
+# ---- rolling per-view samples ----
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    # Rounded first so float noise (0.07 * 100 = 7.000000000000001) does not
+    # push the rank up by one.
+    rank = math.ceil(round(fraction * len(ordered), 9))
+    return ordered[max(0, min(len(ordered) - 1, rank - 1))]
+
+
+class ViewStats:
+    """Recent ``(time, duration_ms, queries)`` samples per view."""
+
+    def __init__(self, window, max_samples):
+        self.window = window
+        self.max_samples = max_samples
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def add(self, view, duration_ms, queries):
+        with self._lock:
+            samples = self._samples.get(view)
+            if samples is None:
+                samples = self._samples[view] = deque(maxlen=self.max_samples)
+            samples.append((time.monotonic(), duration_ms, queries))
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    def summary(self):
+        cutoff = time.monotonic() - self.window
+        with self._lock:
+            recent = {
+                view: [sample for sample in samples if sample[0] >= cutoff]
+                for view, samples in self._samples.items()
+            }
+        views = {}
+        for view, samples in recent.items():
+            if not samples:
+                continue
+            durations = sorted(duration for _t, duration, _q in samples)
+            views[view] = {
+                "count": len(samples),
+                "p50_ms": round(percentile(durations, 0.50), 2),
+                "p95_ms": round(percentile(durations, 0.95), 2),
+                "p99_ms": round(percentile(durations, 0.99), 2),
+                "max_ms": round(durations[-1], 2),
+                "avg_queries": round(sum(q for _t, _d, q in samples) / len(samples), 1),
+            }
+        return {"pid": os.getpid(), "window_seconds": self.window, "views": views}
+
+
+view_stats = ViewStats(
+    window=getattr(settings, "PERF_STATS_WINDOW", 15 * 60),
+    max_samples=getattr(settings, "PERF_STATS_SAMPLES", 2000),
+)
+
+
+# ---- middleware ----
+
+def _view_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return None
+    return match.view_name or match._func_path
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2)
+
+
+class ServerTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.header = getattr(settings, "PERF_TIMING_HEADER", True)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        _install_on_open_connections()
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        # The async ORM runs on a per-request thread whose connections are
+        # new, so ``connection_created`` has already covered them.
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings, time.perf_counter() - start)
+
+    def finish(self, request, response, timings, total):
+        app = max(0.0, total - timings.db - timings.templates - timings.serialize)
+        metrics = {
+            "total_ms": _ms(total),
+            "db_ms": _ms(timings.db),
+            "queries": timings.queries,
+            "tpl_ms": _ms(timings.templates),
+            "serialize_ms": _ms(timings.serialize),
+            "app_ms": _ms(app),
+        }
+        if self.header:
+            response["Server-Timing"] = ", ".join([
+                f"total;dur={metrics['total_ms']}",
+                f'db;dur={metrics["db_ms"]};desc="{timings.queries} queries"',
+                f"tpl;dur={metrics['tpl_ms']}",
+                f"serialize;dur={metrics['serialize_ms']}",
+                f"app;dur={metrics['app_ms']}",
+            ])
+
+        view = _view_name(request)
+        if view is not None:
+            view_stats.add(view, metrics["total_ms"], timings.queries)
+        logger.info(json.dumps({
+            "method": request.method,
+            "path": request.path,
+            "view": view,
+            "status": response.status_code,
+            **metrics,
+        }))
+        return response
@@ -2,7 +2,9 @@ from django.contrib import admin
 from django.urls import path, include  # ✅ Include is necessary
 from django.conf import settings
 from django.conf.urls.static import static
+from clue.lazy import lazy_include
 from home import views as home_views
+from home.frontend import frontend
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -13,8 +15,18 @@ urlpatterns = [
     path('event/', include('event.urls')),
     path('department/', include('department.urls')),
     path('admin_handling/', include('admin_handling.urls')),
-    path('api/', include('api.urls')),  # ✅ Keep this unified API route
+    # React app (frontend/); client-side routes all get its index page.
+    path('app/', frontend, name='frontend'),
+    path('app/<path:route>', frontend),
 ]
 
+# The API is namespaced ("api:event-stats"): a namespaced include can wait
+# until one of its own names is reversed, so with LAZY_IMPORTS the API is
+# only imported by the first API request.
+if settings.LAZY_IMPORTS:
+    urlpatterns.append(lazy_include('api/', 'api.urls', 'api'))
+else:
+    urlpatterns.append(path('api/', include('api.urls')))  # ✅ Keep this unified API route
+
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,21 @@
+from django.db import migrations
+
+from home.search_schema import create_search_index, drop_search_index
+
+
+def forwards(apps, schema_editor):
+    create_search_index(schema_editor, "department_devent", ["event_name", "event_venue"])
+
+
+def backwards(apps, schema_editor):
+    drop_search_index(schema_editor, "department_devent")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("department", "0002_alter_devent_fest_name"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.5 on 2026-10-17 19:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('department', '0003_search_index'),
+        ('event', '0009_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='devent',
+            index=models.Index(fields=['event_start_date', 'id'], name='devent_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='devent',
+            index=models.Index(fields=['event_end_date', 'event_start_date'], name='devent_end_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='devent',
+            index=models.Index(fields=['department_name', 'event_start_date'], name='devent_dept_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='devent',
+            index=models.Index(fields=['fest_name', 'event_start_date'], name='devent_fest_start_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.5 on 2026-10-17 20:56
+
+from django.db import migrations, models
+
+from home.search_schema import restore_search_index
+
+
+def restore_search(apps, schema_editor):
+    # Adding a column remakes the table on SQLite (see 0003_search_index).
+    restore_search_index(schema_editor, "department_devent", ["event_name", "event_venue"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('department', '0004_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='devent',
+            name='poster_rendered',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='fest',
+            name='poster_rendered',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+        migrations.RunPython(restore_search, migrations.RunPython.noop),
+    ]
@@ -8,6 +8,8 @@ class Fest(models.Model):
     event_start_date = models.DateField()
     event_end_date = models.DateField()     
     fest_poster = models.ImageField(upload_to='fest_posters/', blank=True)
+    # Poster whose variants are stored (see event.posters); until then pages show the original.
+    poster_rendered = models.CharField(max_length=100, blank=True, default='', editable=False)
     def __str__(self):
         return self.fest_name
 
@@ -19,10 +21,21 @@ class dEvent(models.Model):
     event_time = models.CharField(max_length=100)
     department_name = models.ForeignKey(Department, on_delete=models.CASCADE)
     event_poster = models.ImageField(upload_to='event_posters/', blank=True)
+    # Poster whose variants are stored (see event.posters); until then pages show the original.
+    poster_rendered = models.CharField(max_length=100, blank=True, default='', editable=False)
     event_venue = models.CharField(max_length = 40)
     registration_link = models.URLField(max_length=200, blank=True, null=True)
     fest_name = models.ForeignKey(Fest,null=True,blank=True, on_delete=models.CASCADE)
-    
+
+    class Meta:
+        # Same date-range design as event.Event, plus per-fest listings.
+        indexes = [
+            models.Index(fields=['event_start_date', 'id'], name='devent_start_idx'),
+            models.Index(fields=['event_end_date', 'event_start_date'], name='devent_end_start_idx'),
+            models.Index(fields=['department_name', 'event_start_date'], name='devent_dept_start_idx'),
+            models.Index(fields=['fest_name', 'event_start_date'], name='devent_fest_start_idx'),
+        ]
+
     def __str__(self):
         return self.event_name
    
\ No newline at end of file
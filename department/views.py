@@ -4,13 +4,16 @@ from .models import  Fest, dEvent
 from event.models import Department
 from event.models import Event
 from django.contrib.auth.decorators import login_required
+from event.page_cache import cache_page_versioned
 
 # Home page - Lists all departments
+@cache_page_versioned("departments")
 def home(request):
     departments = Department.objects.all()
     return render(request, 'page_01.html', {'departments': departments})
 
 # List of fests under a department
+@cache_page_versioned("department:{department_name}")
 def department_fests(request, department_name):
     department = get_object_or_404(Department, department_name=department_name)
     
@@ -26,6 +29,7 @@ def department_fests(request, department_name):
         'standalone_events': standalone_events  # Pass standalone events to the template
     })
 
+@cache_page_versioned("department:{department_name}")
 def fest_detail(request, department_name, fest_name):
     try:
         department = get_object_or_404(Department, department_name=department_name)
@@ -3,6 +3,7 @@ from django.utils.timezone import now
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from home.search import search
 from .models import Department, Club, Event, Notice
 from .serializers import (
     DepartmentSerializer,
@@ -16,12 +17,14 @@ class DepartmentViewSet(viewsets.ModelViewSet):
     queryset = Department.objects.all().order_by("department_name")
     serializer_class = DepartmentSerializer
     permission_classes = [permissions.AllowAny]
+    keyset_ordering = ("department_name",)
 
 
 class ClubViewSet(viewsets.ModelViewSet):
     queryset = Club.objects.select_related("department_name").all().order_by("club_name")
     serializer_class = ClubSerializer
     permission_classes = [permissions.AllowAny]
+    keyset_ordering = ("club_name",)
 
 
 class EventViewSet(viewsets.ModelViewSet):
@@ -33,14 +36,20 @@ class EventViewSet(viewsets.ModelViewSet):
     serializer_class = EventSerializer
     permission_classes = [permissions.AllowAny]
 
+    def get_keyset_ordering(self):
+        # Text searches page through results best match first.
+        if self.request.query_params.get("q"):
+            return ("-search_rank", "-id")
+        return ("event_start_date", "id")
+
     def get_queryset(self):
         qs = super().get_queryset()
         params = self.request.query_params
 
-        # Search by query string in name or venue
+        # Full-text search over name and venue, best match first
         q = params.get("q")
         if q:
-            qs = qs.filter(event_name__icontains=q) | qs.filter(event_venue__icontains=q)
+            qs = search(qs, q)
 
         # Filter by department or club (by slug/primary key value)
         department = params.get("department")
@@ -89,3 +98,4 @@ class NoticeViewSet(viewsets.ModelViewSet):
     queryset = Notice.objects.select_related("department_name", "club_name").all().order_by("-date_posted")
     serializer_class = NoticeSerializer
     permission_classes = [permissions.AllowAny]
+    keyset_ordering = ("-date_posted", "-id")
@@ -0,0 +1,209 @@
+"""
+iCalendar (.ics) subscription feeds: every event, and the events of one
+department, club or fest.
+
+Calendar apps poll a subscription every few minutes, so each feed is cached
+whole under a versioned scope (``feed:club:GDSC``, see ``event.page_cache``)
+that ``event.signals`` bumps when one of its events is written. A poll of an
+unchanged feed is one cache round trip for its validators, answered with a
+304 when the client's ETag still matches; only a client without the current
+copy loads the cached body as well. A changed feed is streamed from the
+database one VEVENT at a time and stored once the last one is sent.
+
+Feeds hold events that ended at most ``FEED_PAST_DAYS`` ago, so the cached
+copy is also keyed by the date, and Last-Modified is never before the start
+of the day.
+
+A body larger than ``FEED_BODY_CACHE_MAX_BYTES`` is not cached: memcached
+rejects items over 1 MB and the database cache would move it whole on every
+read. Such a feed keeps its cached validators, so unchanged polls still get
+a 304, but a full download is streamed from the database each time.
+"""
+import hashlib
+from datetime import timedelta, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+
+from department.models import Fest, dEvent
+from .models import Club, Department, Event
+from .page_cache import get_with_version
+from .versions import conditional_response, last_changed, make_etag, set_validators, start_of_today
+
+FEED_CACHE_TIMEOUT = 60 * 60 * 24
+FEED_BODY_CACHE_MAX_BYTES = 512 * 1024
+FEED_PAST_DAYS = 90
+ICS_CONTENT_TYPE = "text/calendar; charset=utf-8"
+
+_EVENT_FIELDS = ("pk", "event_name", "event_start_date", "event_end_date", "event_time",
+                 "event_venue", "registration_link", "department_name_id")
+
+
+def feed_scopes(instance, state):
+    """Scopes of the feeds listing ``instance`` with the foreign keys in ``state``."""
+    if isinstance(instance, Event):
+        scopes = ["feed:all", f"feed:department:{state['department_name_id']}"]
+        if state.get("club_name_id"):
+            scopes.append(f"feed:club:{state['club_name_id']}")
+        return scopes
+    if isinstance(instance, dEvent):
+        scopes = ["feed:all", f"feed:department:{state['department_name_id']}"]
+        if state.get("fest_name_id"):
+            scopes.append(f"feed:fest:{state['fest_name_id']}")
+        return scopes
+    return []
+
+
+# ---- iCalendar text (RFC 5545) ----
+
+def _text(value):
+    return (
+        str(value).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+        .replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def _fold(line):
+    """Split ``line`` into 75-octet lines, continued with a leading space."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts = []
+    start, limit = 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1  # do not split a UTF-8 sequence
+        parts.append(encoded[start:end].decode())
+        start, limit = end, 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _vevent(uid, row, dtstamp, organiser):
+    description = [f"Time: {row['event_time']}", organiser]
+    if row["registration_link"]:
+        description.append(f"Register: {row['registration_link']}")
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}@clue",
+        f"DTSTAMP:{dtstamp}",
+        f"DTSTART;VALUE=DATE:{row['event_start_date']:%Y%m%d}",
+        # All-day events end on the day after, exclusive.
+        f"DTEND;VALUE=DATE:{row['event_end_date'] + timedelta(days=1):%Y%m%d}",
+        f"SUMMARY:{_text(row['event_name'])}",
+        f"LOCATION:{_text(row['event_venue'])}",
+        f"DESCRIPTION:{_text(chr(10).join(description))}",
+    ]
+    if row["registration_link"]:
+        lines.append(f"URL:{row['registration_link']}")
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) for line in lines)
+
+
+def calendar_chunks(title, events, d_events, stamp):
+    """The feed as text chunks: header, one VEVENT per row, footer."""
+    dtstamp = stamp.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield "".join(_fold(line) for line in [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//C.L.U.E//Events//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_text(title)}",
+        "REFRESH-INTERVAL;VALUE=DURATION:PT1H",
+        "X-PUBLISHED-TTL:PT1H",
+    ])
+    for row in events.values(*_EVENT_FIELDS, "club_name_id").iterator(chunk_size=500):
+        organiser = f"{row['club_name_id']}, {row['department_name_id']}" if row["club_name_id"] else row["department_name_id"]
+        yield _vevent(f"event-{row['pk']}", row, dtstamp, organiser)
+    for row in d_events.values(*_EVENT_FIELDS, "fest_name_id").iterator(chunk_size=500):
+        organiser = f"{row['fest_name_id']}, {row['department_name_id']}" if row["fest_name_id"] else row["department_name_id"]
+        yield _vevent(f"devent-{row['pk']}", row, dtstamp, organiser)
+    yield "END:VCALENDAR\r\n"
+
+
+# ---- views ----
+
+def _feed(request, scope, title, filename, events, d_events, exists=None):
+    # The validators are cached apart from the body, so a 304 never loads it.
+    today = timezone.localdate()
+    key = "ics:" + hashlib.md5(scope.encode()).hexdigest()
+    cached, version = get_with_version(key, scope)
+    if cached is not None and cached[:2] == (version, today):
+        _version, _today, etag, stamp = cached
+        not_modified = conditional_response(request, etag, stamp)
+        if not_modified is not None:
+            return not_modified
+        body = cache.get(f"{key}:{etag}")
+        if body is not None:
+            return _with_headers(HttpResponse(body, content_type=ICS_CONTENT_TYPE), filename, etag, stamp)
+
+    if cached is None or cached[:2] != (version, today):
+        if exists is not None:
+            exists()
+        # Old events drop out at midnight without any write.
+        stamp = max(last_changed(Event, dEvent), start_of_today())
+        etag = make_etag(scope, version, today, stamp.timestamp())
+        not_modified = conditional_response(request, etag, stamp)
+        if not_modified is not None:
+            return not_modified
+
+    since = today - timedelta(days=FEED_PAST_DAYS)
+    events = events.filter(event_end_date__gte=since).order_by("event_start_date", "pk")
+    d_events = d_events.filter(event_end_date__gte=since).order_by("event_start_date", "pk")
+
+    def stream():
+        chunks, size = [], 0
+        for chunk in calendar_chunks(title, events, d_events, stamp):
+            if chunks is not None:
+                size += len(chunk.encode())
+                if size > FEED_BODY_CACHE_MAX_BYTES:
+                    chunks = None  # too big to cache; stop collecting
+                else:
+                    chunks.append(chunk)
+            yield chunk
+        values = {key: (version, today, etag, stamp)}
+        if chunks is not None:
+            values[f"{key}:{etag}"] = "".join(chunks)
+        cache.set_many(values, FEED_CACHE_TIMEOUT)
+
+    return _with_headers(StreamingHttpResponse(stream(), content_type=ICS_CONTENT_TYPE), filename, etag, stamp)
+
+
+def _with_headers(response, filename, etag, stamp):
+    response["Content-Disposition"] = f'inline; filename="{filename}"'
+    return set_validators(response, etag, stamp)
+
+
+def events_feed(request):
+    return _feed(
+        request, "feed:all", "C.L.U.E events", "clue-events.ics",
+        Event.objects.all(), dEvent.objects.all(),
+    )
+
+
+def department_feed(request, department_name):
+    return _feed(
+        request, f"feed:department:{department_name}", f"{department_name} events", "department.ics",
+        Event.objects.filter(department_name_id=department_name),
+        dEvent.objects.filter(department_name_id=department_name),
+        exists=lambda: get_object_or_404(Department, pk=department_name),
+    )
+
+
+def club_feed(request, club_name):
+    return _feed(
+        request, f"feed:club:{club_name}", f"{club_name} events", "club.ics",
+        Event.objects.filter(club_name_id=club_name), dEvent.objects.none(),
+        exists=lambda: get_object_or_404(Club, pk=club_name),
+    )
+
+
+def fest_feed(request, fest_name):
+    return _feed(
+        request, f"feed:fest:{fest_name}", fest_name, "fest.ics",
+        Event.objects.none(), dEvent.objects.filter(fest_name_id=fest_name),
+        exists=lambda: get_object_or_404(Fest, pk=fest_name),
+    )
@@ -0,0 +1,180 @@
+"""
+Bulk import of Event and dEvent rows from CSV or JSON.
+
+Every row is validated before anything is written, foreign keys are
+resolved with one query per related model for all distinct names, and the
+rows are inserted with ``bulk_create`` in a single transaction. A run that
+finds any invalid row inserts nothing and reports the errors row by row.
+
+``bulk_create`` does not send ``post_save``, so the importer sends
+``event.signals.bulk_created`` for the caches and tables that listen to
+saves (change stamps, cached pages, EventIndex, calendar, stats).
+"""
+import csv
+import io
+import json
+
+from django.db import connection, transaction
+from rest_framework import serializers
+
+from department.models import Fest, dEvent
+from .models import Club, Department, Event
+from .signals import bulk_created
+
+MAX_IMPORT_ROWS = 1000
+BATCH_SIZE = 500
+
+
+class ImportFileError(ValueError):
+    """The upload could not be read as rows at all."""
+
+
+class EventImportSerializer(serializers.ModelSerializer):
+    department_name = serializers.CharField(required=False)
+    club_name = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    registration_link = serializers.URLField(required=False, allow_blank=True, allow_null=True)
+
+    class Meta:
+        model = Event
+        fields = [
+            "event_name", "event_start_date", "event_end_date", "event_time",
+            "event_venue", "registration_link", "department_name", "club_name",
+        ]
+
+    def validate(self, attrs):
+        if attrs["event_end_date"] < attrs["event_start_date"]:
+            raise serializers.ValidationError({"event_end_date": "Must not be before event_start_date."})
+        return attrs
+
+
+class DepartmentEventImportSerializer(EventImportSerializer):
+    fest_name = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    club_name = None
+
+    class Meta:
+        model = dEvent
+        fields = [
+            "event_name", "event_start_date", "event_end_date", "event_time",
+            "event_venue", "registration_link", "department_name", "fest_name",
+        ]
+
+
+IMPORT_SERIALIZERS = {
+    Event: EventImportSerializer,
+    dEvent: DepartmentEventImportSerializer,
+}
+
+
+def check_rows(rows):
+    """``rows`` if it is a list of dicts, else ``ImportFileError``."""
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ImportFileError("JSON must be an array of objects.")
+    return rows
+
+
+def parse_rows(upload):
+    """Rows (dicts) from an uploaded ``.json`` array or CSV file with a header."""
+    raw = upload.read()
+    try:
+        text = raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ImportFileError("File must be UTF-8 encoded.")
+
+    if upload.name.lower().endswith(".json") or text.lstrip().startswith("["):
+        try:
+            rows = json.loads(text)
+        except ValueError as error:
+            raise ImportFileError(f"Invalid JSON: {error}")
+        return check_rows(rows)
+
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames:
+        raise ImportFileError("CSV file has no header row.")
+    return [
+        {key.strip(): (value or "").strip() for key, value in row.items() if key}
+        for row in reader
+    ]
+
+
+def _names(values):
+    return {value for value in values if value}
+
+
+def import_events(model, rows, overrides=None):
+    """
+    Validate and insert ``rows`` as ``model`` (Event or dEvent) instances.
+
+    ``overrides`` pins columns for every row, e.g. a club coordinator's own
+    club and department. Returns ``{"created": n, "errors": [...]}`` where
+    each error is ``{"row": <1-based row>, "errors": {...}}``; if there are
+    errors nothing is created.
+    """
+    overrides = overrides or {}
+    if len(rows) > MAX_IMPORT_ROWS:
+        return {"created": 0, "errors": [{"row": None, "errors": {
+            "non_field_errors": [f"At most {MAX_IMPORT_ROWS} rows per import."]}}]}
+
+    serializer_class = IMPORT_SERIALIZERS[model]
+    valid = []
+    errors = []
+    for number, row in enumerate(rows, start=1):
+        serializer = serializer_class(data={**row, **overrides})
+        if serializer.is_valid():
+            valid.append((number, serializer.validated_data))
+        else:
+            errors.append({"row": number, "errors": serializer.errors})
+
+    # One query per related model for every distinct name in the upload.
+    departments = Department.objects.in_bulk(_names(data.get("department_name") for _n, data in valid))
+    clubs = Club.objects.in_bulk(_names(data.get("club_name") for _n, data in valid))
+    fests = Fest.objects.in_bulk(_names(data.get("fest_name") for _n, data in valid))
+
+    instances = []
+    for number, data in valid:
+        row_errors = {}
+        club = clubs.get(data.get("club_name")) if data.get("club_name") else None
+        fest = fests.get(data.get("fest_name")) if data.get("fest_name") else None
+        department_name = data.get("department_name") or (club.department_name_id if club else None)
+        department = departments.get(department_name)
+
+        if data.get("club_name") and club is None:
+            row_errors["club_name"] = [f"Unknown club {data['club_name']!r}."]
+        if data.get("fest_name") and fest is None:
+            row_errors["fest_name"] = [f"Unknown fest {data['fest_name']!r}."]
+        if department is None:
+            if department_name:
+                row_errors["department_name"] = [f"Unknown department {department_name!r}."]
+            else:
+                row_errors["department_name"] = ["This field is required."]
+        elif club and club.department_name_id != department.pk:
+            row_errors["club_name"] = [f"Club {club.pk!r} is not in department {department.pk!r}."]
+        elif fest and fest.department_name_id != department.pk:
+            row_errors["fest_name"] = [f"Fest {fest.pk!r} is not in department {department.pk!r}."]
+        if row_errors:
+            errors.append({"row": number, "errors": row_errors})
+            continue
+
+        fields = {key: value for key, value in data.items()
+                  if key not in ("department_name", "club_name", "fest_name")}
+        fields["department_name"] = department
+        if model is Event:
+            fields["club_name"] = club
+        else:
+            fields["fest_name"] = fest
+        instances.append(model(**fields))
+
+    if errors:
+        errors.sort(key=lambda error: error["row"])
+        return {"created": 0, "errors": errors}
+
+    with transaction.atomic():
+        if connection.features.can_return_rows_from_bulk_insert:
+            created = model.objects.bulk_create(instances, batch_size=BATCH_SIZE)
+            bulk_created.send(sender=model, instances=created)
+        else:
+            # Without RETURNING (MySQL) the new pks are unknown, and the
+            # receivers need them; fall back to saves, which send post_save.
+            for instance in instances:
+                instance.save()
+            created = instances
+    return {"created": len(created), "errors": []}
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+from home.search_schema import create_search_index, drop_search_index
+
+SEARCH_TABLES = [
+    ("event_event", ["event_name", "event_venue"], "id"),
+    ("event_notice", ["title", "description"], "id"),
+    ("event_club", ["club_name", "club_description"], "rowid"),
+]
+
+
+def forwards(apps, schema_editor):
+    for table, columns, rowid in SEARCH_TABLES:
+        create_search_index(schema_editor, table, columns, rowid)
+
+
+def backwards(apps, schema_editor):
+    for table, _columns, _rowid in SEARCH_TABLES:
+        drop_search_index(schema_editor, table)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("event", "0003_notice_department_name"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
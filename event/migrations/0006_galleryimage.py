@@ -0,0 +1,32 @@
+# Generated by Django 5.1.5 on 2026-10-17 19:40
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0005_modelversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GalleryImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=255, unique=True)),
+                ('caption', models.CharField(blank=True, default='', max_length=255)),
+                ('width', models.PositiveIntegerField(blank=True, null=True)),
+                ('height', models.PositiveIntegerField(blank=True, null=True)),
+                ('size', models.PositiveBigIntegerField(default=0)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('uploaded_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='gallery_images', to='event.event')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['event', '-id'], name='event_gallery_event_id_idx'), models.Index(fields=['event', 'content_hash'], name='event_gallery_hash_idx')],
+            },
+        ),
+    ]
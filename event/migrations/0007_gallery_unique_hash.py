@@ -0,0 +1,21 @@
+# Generated by Django 5.1.5 on 2026-10-17 19:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0006_galleryimage'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='galleryimage',
+            name='event_gallery_hash_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='galleryimage',
+            constraint=models.UniqueConstraint(fields=('event', 'content_hash'), name='event_gallery_unique_hash'),
+        ),
+    ]
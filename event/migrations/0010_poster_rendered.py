@@ -0,0 +1,42 @@
+# Generated by Django 5.1.5 on 2026-10-17 20:56
+
+from django.db import migrations, models
+
+from home.search_schema import restore_search_index
+
+# Adding a column remakes these tables on SQLite (see 0004_search_index).
+SEARCH_TABLES = [
+    ("event_event", ["event_name", "event_venue"], "id"),
+    ("event_club", ["club_name", "club_description"], "rowid"),
+]
+
+
+def restore_search(apps, schema_editor):
+    for table, columns, rowid in SEARCH_TABLES:
+        restore_search_index(schema_editor, table, columns, rowid)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0009_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='club',
+            name='poster_rendered',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='department',
+            name='poster_rendered',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='poster_rendered',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+        migrations.RunPython(restore_search, migrations.RunPython.noop),
+    ]
@@ -6,6 +6,8 @@ class Department(models.Model):
     password = models.CharField(max_length=25)
     department_description = models.TextField()   
     department_poster = models.ImageField(upload_to='department_posters/', blank=True)
+    # Poster whose variants are stored (see event.posters); until then pages show the original.
+    poster_rendered = models.CharField(max_length=100, blank=True, default='', editable=False)
 
     def __str__(self):
         return self.department_name
@@ -15,6 +17,8 @@ class Club(models.Model):
     department_name = models.ForeignKey(Department,null=True,on_delete=models.CASCADE)
     club_description = models.TextField()
     club_poster = models.ImageField(upload_to='club_posters/', blank=True)
+    # Poster whose variants are stored (see event.posters); until then pages show the original.
+    poster_rendered = models.CharField(max_length=100, blank=True, default='', editable=False)
 
 
     def __str__(self):
@@ -27,8 +31,21 @@ class Event(models.Model):
     department_name = models.ForeignKey('Department', on_delete=models.CASCADE)
     club_name = models.ForeignKey('Club', null=True, blank=True, on_delete=models.CASCADE)
     event_poster = models.ImageField(upload_to='event_posters/', blank=True)
+    # Poster whose variants are stored (see event.posters); until then pages show the original.
+    poster_rendered = models.CharField(max_length=100, blank=True, default='', editable=False)
     event_venue = models.CharField(max_length = 40)
     registration_link = models.URLField(max_length=200, blank=True, null=True)
+
+    class Meta:
+        # Hot filters are date ranges, alone or within one club/department;
+        # event.query_plans checks every listed query stays on an index.
+        indexes = [
+            models.Index(fields=['event_start_date', 'id'], name='event_start_idx'),
+            models.Index(fields=['event_end_date', 'event_start_date'], name='event_end_start_idx'),
+            models.Index(fields=['club_name', 'event_start_date'], name='event_club_start_idx'),
+            models.Index(fields=['department_name', 'event_start_date'], name='event_dept_start_idx'),
+        ]
+
     def __str__(self):
         return self.event_name
 
@@ -42,5 +59,83 @@ class Notice(models.Model):
     club_name = models.ForeignKey('Club', null=True, blank=True, on_delete=models.CASCADE)
     department_name = models.ForeignKey('Department', null=True, blank=True, on_delete=models.CASCADE)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['date_posted', 'id'], name='notice_posted_idx'),
+            models.Index(fields=['club_name', 'date_posted'], name='notice_club_posted_idx'),
+            models.Index(fields=['department_name', 'date_posted'], name='notice_dept_posted_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+class ModelVersion(models.Model):
+    """When rows of a model last changed; backs ETag/Last-Modified headers."""
+    label = models.CharField(max_length=100, primary_key=True)
+    changed_at = models.DateTimeField(default=now)
+
+    def __str__(self):
+        return f"{self.label} @ {self.changed_at}"
+
+
+class GalleryImage(models.Model):
+    """One stored photo in an event's gallery; listing never touches storage."""
+    event = models.ForeignKey('Event', on_delete=models.CASCADE, related_name='gallery_images')
+    path = models.CharField(max_length=255, unique=True)
+    caption = models.CharField(max_length=255, blank=True, default='')
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    size = models.PositiveBigIntegerField(default=0)
+    content_hash = models.CharField(max_length=64)
+    uploaded_at = models.DateTimeField(default=now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['event', '-id'], name='event_gallery_event_id_idx'),
+        ]
+        constraints = [
+            # Retried uploads of the same bytes resolve to the existing row.
+            models.UniqueConstraint(fields=['event', 'content_hash'], name='event_gallery_unique_hash'),
+        ]
+
+    def __str__(self):
+        return self.path
+
+
+class Report(models.Model):
+    """A generated Event/dEvent export, built by ``manage.py generate_reports``."""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('xlsx', 'Excel'),
+    ]
+
+    filters = models.JSONField(default=dict)
+    file_format = models.CharField(max_length=4, choices=FORMAT_CHOICES)
+    # Hash of requester + filters + format; a user's identical requests share one artifact.
+    request_key = models.CharField(max_length=64)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    requested_by = models.ForeignKey('auth.User', null=True, blank=True, on_delete=models.SET_NULL)
+    created_at = models.DateTimeField(default=now)
+    # When a worker claimed it; a report running much longer has been abandoned.
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Change stamp of Event/dEvent the artifact was built from.
+    source_version = models.DateTimeField(null=True, blank=True)
+    generated_at = models.DateTimeField(null=True, blank=True)
+    path = models.CharField(max_length=255, blank=True, default='')
+    row_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['request_key', '-created_at'], name='event_report_key_idx'),
+            models.Index(fields=['status', 'created_at'], name='event_report_status_idx'),
+        ]
+
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return f"{self.file_format} report {self.filters} ({self.status})"
@@ -0,0 +1,102 @@
+"""
+Rendered-page caching with versioned keys.
+
+A cached page is stored under the current version of every scope it depends
+on, e.g. ``department:CSE`` or ``club:GDSC``. ``event.signals`` bumps a scope
+when a row shown on its pages is written, so exactly the affected department
+and club pages miss on the next request; stale entries just age out.
+
+Only anonymous visitors without a coordinator session or pending flash
+messages are served from or stored into the cache, since the navigation bar
+renders those per visitor. Every request through a decorated view also gets
+``request.page_version``, which templates add to their ``{% cache %}``
+fragment keys so fragments expire together with the page.
+"""
+import hashlib
+from functools import wraps
+from urllib.parse import quote
+
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http import HttpResponse
+
+PAGE_CACHE_TIMEOUT = 60 * 15
+
+
+def _version_key(scope: str) -> str:
+    # Department and club names contain spaces, which memcached rejects.
+    return f"page_version:{quote(scope, safe=':')}"
+
+
+def scope_versions(scopes):
+    keys = [_version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    for key in missing:
+        cache.add(key, 1, None)
+    if missing:
+        versions.update(cache.get_many(missing))
+    return [versions.get(key, 1) for key in keys]
+
+
+def get_with_version(key, scope):
+    """``(cache.get(key), version of scope)`` in one cache round trip."""
+    version_key = _version_key(scope)
+    values = cache.get_many([key, version_key])
+    if version_key not in values:
+        values[version_key] = scope_versions([scope])[0]
+    return values.get(key), values[version_key]
+
+
+def bump_scope(*scopes) -> None:
+    """Invalidate every cached page depending on any of ``scopes``."""
+    for scope in scopes:
+        key = _version_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Unknown key: nothing cached under it yet, start a fresh version.
+            cache.set(key, 2, None)
+
+
+def _cacheable(request) -> bool:
+    return (
+        request.method in ("GET", "HEAD")
+        and not request.user.is_authenticated
+        and "coordinator_name" not in request.session
+        and not len(get_messages(request))
+    )
+
+
+def cache_page_versioned(*scope_templates, timeout=PAGE_CACHE_TIMEOUT):
+    """
+    Cache a view's rendered response under versioned scopes.
+
+    Scope templates are formatted with the view's URL kwargs, so
+    ``@cache_page_versioned("department:{department_name}")`` ties a page
+    to the department in its URL.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            scopes = [template.format(**kwargs) for template in scope_templates]
+            versions = scope_versions(scopes)
+            request.page_version = ",".join(f"{s}={v}" for s, v in zip(scopes, versions))
+            if not _cacheable(request):
+                return view(request, *args, **kwargs)
+
+            raw_key = "|".join(
+                [f"{view.__module__}.{view.__name__}", request.get_full_path(), request.page_version]
+            )
+            key = "page:" + hashlib.md5(raw_key.encode()).hexdigest()
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                cache.set(key, (response.content, response["Content-Type"]), timeout)
+            return response
+        return wrapped
+    return decorator
@@ -0,0 +1,158 @@
+"""
+Resized poster variants.
+
+Every uploaded poster gets ``thumb``, ``card`` and ``full`` renditions in
+WebP and JPEG, EXIF stripped, stored next to each other under
+``posters/<original path without extension>/``. Variant paths are derived
+from the original file name, so serializers and templates build their URLs
+without touching storage.
+
+Variants are rendered after the saving transaction commits, on a small
+thread pool, so uploads never wait on Pillow; with ``POSTER_VARIANTS_SYNC``
+(the default on Vercel, which freezes the pool after the response) they are
+rendered in the request instead. ``manage.py build_poster_variants`` renders
+anything missing, e.g. existing media.
+
+Once a poster's variants are stored its name is recorded in the row's
+``poster_rendered`` column. Until then ``variants_ready`` is false and pages
+and the API fall back to the original upload.
+"""
+import io
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Longest edge in pixels.
+VARIANTS = {
+    "thumb": 320,
+    "card": 800,
+    "full": 1600,
+}
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="posters")
+
+
+def variant_path(name: str, variant: str, fmt: str = "jpeg") -> str:
+    stem = posixpath.splitext(name)[0]
+    return f"posters/{stem}/{variant}.{fmt}"
+
+
+def variant_url(name: str, variant: str, fmt: str = "jpeg") -> str:
+    return default_storage.url(variant_path(name, variant, fmt))
+
+
+def variants_ready(image) -> bool:
+    """Whether the variants of ``image`` (a FieldFile) are stored."""
+    instance = getattr(image, "instance", None)
+    return bool(image) and getattr(instance, "poster_rendered", None) == image.name
+
+
+def mark_rendered(name: str) -> None:
+    """Record on every row showing poster ``name`` that its variants exist."""
+    from home.models import EventIndex
+    from .page_cache import bump_scope
+    from .signals import POSTER_FIELDS, cached_scopes
+    from .versions import bump
+
+    # update() skips post_save, so this does not schedule another render,
+    # but the stamps and cached pages of the rows are refreshed here.
+    scopes = set()
+    for model, field in POSTER_FIELDS.items():
+        rows = model.objects.filter(**{field: name}).exclude(poster_rendered=name)
+        touched = list(rows)
+        if not touched:
+            continue
+        rows.update(poster_rendered=name)
+        bump(model)
+        for row in touched:
+            scopes.update(cached_scopes(row))
+    # Index rows are served under the Event and dEvent stamps.
+    EventIndex.objects.filter(event_poster=name).exclude(poster_rendered=name).update(poster_rendered=name)
+    if scopes:
+        bump_scope(*scopes)
+
+
+def variant_urls(name: str):
+    """``{variant: {fmt: url}}`` for a stored poster name, or None if empty."""
+    if not name:
+        return None
+    return {
+        variant: {fmt: variant_url(name, variant, fmt) for fmt in FORMATS}
+        for variant in VARIANTS
+    }
+
+
+def render_variants(image: Image.Image):
+    """Yield ``(variant, fmt, bytes)`` for every rendition of ``image``."""
+    # Apply the camera rotation before the EXIF block is dropped.
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+    for variant, edge in VARIANTS.items():
+        resized = image.copy()
+        resized.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        for fmt, (pil_format, options) in FORMATS.items():
+            if pil_format == "JPEG" or not has_alpha:
+                frame = resized.convert("RGB")
+            else:
+                frame = resized.convert("RGBA")
+            buffer = io.BytesIO()
+            # Saving without ``exif=`` writes no metadata.
+            frame.save(buffer, pil_format, **options)
+            yield variant, fmt, buffer.getvalue()
+
+
+def generate_variants(name: str, force: bool = False) -> int:
+    """Render and store every variant of poster ``name``; returns files written."""
+    if not name:
+        return 0
+    # The last file written doubles as the "already rendered" marker.
+    if not force and default_storage.exists(variant_path(name, "full", "jpeg")):
+        return 0
+    with default_storage.open(name, "rb") as source:
+        with Image.open(source) as image:
+            image.load()
+    written = 0
+    for variant, fmt, data in render_variants(image):
+        path = variant_path(name, variant, fmt)
+        if default_storage.exists(path):
+            default_storage.delete(path)
+        default_storage.save(path, ContentFile(data))
+        written += 1
+    return written
+
+
+def _generate_logged(name: str) -> None:
+    try:
+        generate_variants(name)
+        mark_rendered(name)
+    except Exception:
+        logger.exception("Could not render variants for poster %s", name)
+
+
+def _generate_in_background(name: str) -> None:
+    try:
+        _generate_logged(name)
+    finally:
+        connection.close()  # this pool thread's own connection
+
+
+def schedule_variants(name: str) -> None:
+    """Render variants for ``name`` once the save commits."""
+    if not name:
+        return
+    if settings.POSTER_VARIANTS_SYNC:
+        transaction.on_commit(lambda: _generate_logged(name))
+    else:
+        transaction.on_commit(lambda: _executor.submit(_generate_in_background, name))
@@ -0,0 +1,139 @@
+"""
+EXPLAIN checks for the hot date-range queries.
+
+``HOT_QUERIES`` lists the queries behind the busiest pages and endpoints,
+each built from a ``QuerySample`` of real keys (a club, a department, a fest
+and a reference day). The home, calendar and search entries call the
+functions those views use, so they cannot drift from the code.
+``full_scans`` runs EXPLAIN on a queryset and returns the plan lines that
+read a whole event, index or notices table instead of an index. Only
+PostgreSQL and SQLite plans are understood (``PLAN_VENDORS``).
+
+Plans depend on the data, so run the checks against a realistically sized
+dataset (``manage.py generate_synthetic_data``) after ANALYZE:
+``manage.py check_query_plans`` does this for a live database and the
+event tests do it for a generated one.
+"""
+import re
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from django.db import connection
+from django.db.models import Q
+
+from department.models import Fest, dEvent
+from home import views as home_views
+from home.calendar_grid import _month_bounds, _overlapping
+from home.models import EventIndex
+from .models import Club, Department, Event, Notice
+
+CHECKED_TABLES = {model._meta.db_table for model in (Event, dEvent, Notice, EventIndex)}
+PLAN_VENDORS = ("postgresql", "sqlite")
+
+_SQLITE_SCAN = re.compile(r"\bSCAN (\w+)(?! USING)")
+_POSTGRES_SCAN = re.compile(r"\bSeq Scan on (\w+)")
+
+
+@dataclass
+class QuerySample:
+    today: date
+    club: str
+    department: str
+    fest: str
+
+    @classmethod
+    def pick(cls, today=None):
+        """A sample of keys that have rows, from the current database."""
+        today = today or date.today()
+        club = Event.objects.exclude(club_name=None).values_list("club_name", flat=True).first()
+        department = dEvent.objects.values_list("department_name", flat=True).first()
+        fest = dEvent.objects.exclude(fest_name=None).values_list("fest_name", flat=True).first()
+        return cls(
+            today=today,
+            club=club or Club.objects.values_list("pk", flat=True).first(),
+            department=department or Department.objects.values_list("pk", flat=True).first(),
+            fest=fest or Fest.objects.values_list("pk", flat=True).first(),
+        )
+
+
+def _today(model, day):
+    return model.objects.filter(event_start_date__lte=day, event_end_date__gte=day)
+
+
+def _month(model, day):
+    start = day.replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return model.objects.filter(event_start_date__lte=end, event_end_date__gte=start)
+
+
+# name -> function(sample) returning the queryset as the code runs it
+HOT_QUERIES = {
+    # home.views.home
+    "home_upcoming_events": lambda s: home_views._upcoming(s.today, EventIndex.CLUB, home_views.HOME_EVENTS),
+    "home_upcoming_devents": lambda s: home_views._upcoming(s.today, EventIndex.DEPARTMENT, home_views.HOME_EVENTS),
+    "home_latest_notices": lambda s: Notice.objects.order_by("-date_posted", "-id")[:5],
+    # api events/department-events lists, keyset pages and when= filters
+    "api_events_page": lambda s: Event.objects.filter(
+        Q(event_start_date__gt=s.today) | Q(event_start_date=s.today, id__gt=0)
+    ).order_by("event_start_date", "id")[:21],
+    "api_events_today": lambda s: _today(Event, s.today).order_by("-event_start_date")[:20],
+    "api_devents_today": lambda s: _today(dEvent, s.today).order_by("-event_start_date")[:20],
+    "api_events_upcoming": lambda s: Event.objects.filter(event_start_date__gte=s.today).order_by("event_start_date", "id")[:21],
+    "api_notices_page": lambda s: Notice.objects.filter(date_posted__lt=s.today).order_by("-date_posted", "-id")[:21],
+    # home.views.search with a date and no text query
+    "search_date_events": lambda s: home_views._event_section(
+        home_views._on_date(EventIndex.objects.all(), s.today), EventIndex.CLUB, home_views.SEARCH_DATE_ORDERING, 1,
+    ),
+    "search_date_devents": lambda s: home_views._event_section(
+        home_views._on_date(EventIndex.objects.all(), s.today), EventIndex.DEPARTMENT, home_views.SEARCH_DATE_ORDERING, 1,
+    ),
+    # coordinator listings and dashboard counts
+    "club_events": lambda s: Event.objects.filter(club_name=s.club).order_by("-event_start_date"),
+    "club_upcoming_count": lambda s: Event.objects.filter(club_name=s.club, event_start_date__gte=s.today),
+    "department_devents": lambda s: dEvent.objects.filter(department_name=s.department).order_by("-event_start_date"),
+    "department_upcoming_count": lambda s: dEvent.objects.filter(department_name=s.department, event_start_date__gte=s.today),
+    "department_upcoming_events": lambda s: Event.objects.filter(department_name=s.department, event_start_date__gte=s.today),
+    "fest_devents": lambda s: dEvent.objects.filter(fest_name=s.fest).order_by("event_start_date"),
+    "club_notices": lambda s: Notice.objects.filter(club_name=s.club).order_by("-date_posted"),
+    "department_notices": lambda s: Notice.objects.filter(department_name=s.department).order_by("-date_posted"),
+    # home.calendar_grid month grid, and report date ranges
+    "calendar_month": lambda s: _overlapping(*_month_bounds(s.today.year, s.today.month)),
+    "report_month_events": lambda s: _month(Event, s.today).order_by("event_start_date", "id"),
+    "report_month_devents": lambda s: _month(dEvent, s.today).order_by("event_start_date", "id"),
+}
+
+
+def analyze() -> None:
+    """Refresh planner statistics so EXPLAIN reflects the current data."""
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            for table in sorted(CHECKED_TABLES):
+                cursor.execute(f"ANALYZE {table}")
+        elif connection.vendor == "sqlite":
+            cursor.execute("ANALYZE")
+
+
+def full_scans(queryset):
+    """Plan lines of ``queryset`` that scan a whole events/notices table."""
+    if connection.vendor == "postgresql":
+        pattern = _POSTGRES_SCAN
+    elif connection.vendor == "sqlite":
+        pattern = _SQLITE_SCAN
+    else:
+        raise NotImplementedError(f"No plan checks for {connection.vendor}; see PLAN_VENDORS.")
+    return [
+        line.strip()
+        for line in queryset.explain().splitlines()
+        if (match := pattern.search(line)) and match.group(1) in CHECKED_TABLES
+    ]
+
+
+def check_hot_queries(sample=None):
+    """``{name: offending plan lines}`` for every hot query that full-scans."""
+    sample = sample or QuerySample.pick()
+    failures = {}
+    for name, build in HOT_QUERIES.items():
+        scans = full_scans(build(sample))
+        if scans:
+            failures[name] = scans
+    return failures
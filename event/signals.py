@@ -0,0 +1,112 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import Signal, receiver
+
+from department.models import Fest, dEvent
+from .models import Department, Club, Event, Notice
+from .feeds import feed_scopes
+from .page_cache import bump_scope
+from .posters import schedule_variants
+from .versions import bump
+
+VERSIONED_MODELS = (Department, Club, Event, Notice, Fest, dEvent)
+
+# Sent by event.importer after ``bulk_create``, which skips post_save:
+# ``sender`` is the model and ``instances`` the created rows (with pks).
+# Every post_save receiver for Event/dEvent needs a bulk counterpart here.
+bulk_created = Signal()
+
+# Columns whose stored value receivers need after an update, e.g. to clear
+# the old club page of an event moved to another club.
+TRACKED_FIELDS = {
+    Event: ("event_start_date", "event_end_date", "department_name_id", "club_name_id"),
+    dEvent: ("event_start_date", "event_end_date", "department_name_id", "fest_name_id"),
+}
+
+# Foreign keys that pick the cached pages and feeds a row appears on.
+SCOPE_FIELDS = ("department_name_id", "club_name_id", "fest_name_id")
+
+POSTER_FIELDS = {
+    Department: "department_poster",
+    Club: "club_poster",
+    Event: "event_poster",
+    Fest: "fest_poster",
+    dEvent: "event_poster",
+}
+
+
+def bump_model_version(sender, **kwargs):
+    bump(sender)
+
+
+for _model in VERSIONED_MODELS:
+    post_save.connect(bump_model_version, sender=_model, dispatch_uid=f"version-save-{_model._meta.label_lower}")
+    post_delete.connect(bump_model_version, sender=_model, dispatch_uid=f"version-delete-{_model._meta.label_lower}")
+
+
+@receiver(pre_save, sender=Event)
+@receiver(pre_save, sender=dEvent)
+def remember_previous_state(sender, instance, **kwargs):
+    """Stash the stored values of TRACKED_FIELDS as ``instance._previous_state``."""
+    instance._previous_state = None
+    if instance.pk:
+        instance._previous_state = (
+            sender.objects.filter(pk=instance.pk).values(*TRACKED_FIELDS[sender]).first()
+        )
+
+
+def _page_scopes(instance, state):
+    if isinstance(instance, Department):
+        return ["departments", f"department:{instance.pk}"]
+    if isinstance(instance, Club):
+        return ["clubs", f"club:{instance.pk}"]
+    if isinstance(instance, Fest):
+        return [f"department:{instance.department_name_id}"]
+    if isinstance(instance, dEvent):
+        return [f"department:{state['department_name_id']}"]
+    if isinstance(instance, Event) and state["club_name_id"]:
+        return [f"club:{state['club_name_id']}"]
+    return []
+
+
+def cached_scopes(instance, state=None):
+    """Scopes of the cached pages and feeds showing ``instance``."""
+    if state is None:
+        state = {f: getattr(instance, f, None) for f in SCOPE_FIELDS}
+    return [*_page_scopes(instance, state), *feed_scopes(instance, state)]
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_cached_pages(sender, instance, **kwargs):
+    if sender not in VERSIONED_MODELS:
+        return
+    states = [{f: getattr(instance, f, None) for f in SCOPE_FIELDS}]
+    previous = getattr(instance, "_previous_state", None)
+    if previous:
+        states.append(previous)
+    scopes = set()
+    for state in states:
+        scopes.update(cached_scopes(instance, state))
+    if scopes:
+        bump_scope(*scopes)
+
+
+@receiver(post_save)
+def render_poster_variants(sender, instance, **kwargs):
+    field = POSTER_FIELDS.get(sender)
+    if not field:
+        return
+    name = getattr(instance, field).name
+    # Most saves keep the poster; its variants are then already recorded.
+    if name and name != instance.poster_rendered:
+        schedule_variants(name)
+
+
+@receiver(bulk_created)
+def refresh_after_bulk_create(sender, instances, **kwargs):
+    bump(sender)
+    scopes = set()
+    for instance in instances:
+        scopes.update(cached_scopes(instance))
+    if scopes:
+        bump_scope(*scopes)
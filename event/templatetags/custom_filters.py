@@ -14,3 +14,21 @@ def multiply(value, arg):
         return int(value) * int(arg)
     except (ValueError, TypeError):
         return 0
+
+
+@register.filter(name='poster_variant')
+def poster_variant(image, arg="card"):
+    """
+    URL of a resized rendition of a poster (see ``event.posters``), or of
+    the original until its variants have been rendered.
+    Usage: {{ event.event_poster|poster_variant:"card" }}
+           {{ event.event_poster|poster_variant:"thumb:webp" }}
+    """
+    from event.posters import variant_url, variants_ready
+
+    if not image:
+        return ""
+    if not variants_ready(image):
+        return image.url
+    variant, _sep, fmt = arg.partition(":")
+    return variant_url(image.name, variant, fmt or "jpeg")
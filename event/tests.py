@@ -1,3 +1,346 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from PIL import Image
+
+from api.serializers import PosterVariantsField
+from department.models import Fest, dEvent
+from home.models import EventIndex
+from .models import Club, Department, Event, ModelVersion
+from .page_cache import scope_versions
+from .posters import VARIANTS, render_variants, variant_path, variant_url
+from .templatetags.custom_filters import poster_variant
+from .versions import start_of_today
+from .query_plans import QuerySample, analyze, check_hot_queries, full_scans
+
+
+class PosterVariantTests(SimpleTestCase):
+    def test_variants_are_resized_rotated_and_stripped(self):
+        image = Image.new("RGB", (3000, 2000), "red")
+        exif = image.getexif()
+        exif[0x0112] = 6  # camera held sideways
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", exif=exif)
+        buffer.seek(0)
+
+        rendered = {(variant, fmt): data for variant, fmt, data in render_variants(Image.open(buffer))}
+        self.assertEqual(len(rendered), len(VARIANTS) * 2)
+        for (variant, fmt), data in rendered.items():
+            with Image.open(io.BytesIO(data)) as out:
+                self.assertEqual(out.format, fmt.upper())
+                width, height = out.size
+                self.assertEqual(height, VARIANTS[variant])
+                self.assertLess(width, height)
+                self.assertEqual(len(out.getexif()), 0)
+
+    def test_variant_path_is_derived_from_the_original_name(self):
+        self.assertEqual(
+            variant_path("event_posters/fest.final.PNG", "thumb", "webp"),
+            "posters/event_posters/fest.final/thumb.webp",
+        )
+
+
+class PosterRenderTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        overrides = override_settings(
+            MEDIA_ROOT=media_root,
+            POSTER_VARIANTS_SYNC=True,
+            STORAGES={
+                "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+                "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+            },
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.dept = Department.objects.create(department_name="CS", password="x", department_description="d")
+
+    def poster(self, color="red"):
+        buffer = io.BytesIO()
+        Image.new("RGB", (40, 30), color).save(buffer, "PNG")
+        return SimpleUploadedFile("poster.png", buffer.getvalue(), content_type="image/png")
+
+    def test_original_is_shown_until_variants_are_rendered(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            event = Event.objects.create(
+                event_name="Talk", event_start_date=date(2025, 1, 1), event_end_date=date(2025, 1, 1),
+                event_time="10:00", department_name=self.dept, event_venue="Hall", event_poster=self.poster(),
+            )
+        self.assertEqual(poster_variant(event.event_poster, "card"), event.event_poster.url)
+        self.assertIsNone(PosterVariantsField().to_representation(event.event_poster))
+
+        for callback in callbacks:
+            callback()
+        event.refresh_from_db()
+        self.assertEqual(event.poster_rendered, event.event_poster.name)
+        self.assertTrue(default_storage.exists(variant_path(event.event_poster.name, "card")))
+        self.assertEqual(poster_variant(event.event_poster, "card"), variant_url(event.event_poster.name, "card"))
+        self.assertIn("thumb", PosterVariantsField().to_representation(event.event_poster))
+
+        # A new upload falls back to the original again until it is rendered.
+        event.event_poster = self.poster("blue")
+        with self.captureOnCommitCallbacks():
+            event.save()
+        self.assertEqual(poster_variant(event.event_poster, "card"), event.event_poster.url)
+
+    def test_rendering_refreshes_stamps_and_cached_pages(self):
+        club = Club.objects.create(club_name="GDSC", department_name=self.dept, club_description="c")
+        with self.captureOnCommitCallbacks() as callbacks:
+            event = Event.objects.create(
+                event_name="Talk", event_start_date=date(2025, 1, 1), event_end_date=date(2025, 1, 1),
+                event_time="10:00", department_name=self.dept, club_name=club, event_venue="Hall",
+                event_poster=self.poster(),
+            )
+        etag = self.client.get("/api/events/")["ETag"]
+        club_page, feed = scope_versions(["club:GDSC", "feed:club:GDSC"])
+
+        for callback in callbacks:
+            callback()
+        response = self.client.get("/api/events/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(response.json()["results"][0]["event_poster_variants"])
+        self.assertEqual(scope_versions(["club:GDSC", "feed:club:GDSC"]), [club_page + 1, feed + 1])
+        self.assertEqual(EventIndex.objects.get(source_id=event.pk).poster_rendered, event.event_poster.name)
+
+    def test_saving_a_rendered_poster_does_not_render_again(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            event = Event.objects.create(
+                event_name="Talk", event_start_date=date(2025, 1, 1), event_end_date=date(2025, 1, 1),
+                event_time="10:00", department_name=self.dept, event_venue="Hall", event_poster=self.poster(),
+            )
+        event.refresh_from_db()
+        event.event_name = "Keynote"
+        with mock.patch("event.signals.schedule_variants") as schedule:
+            event.save()
+        schedule.assert_not_called()
+
+    def test_api_queryset_loads_the_rendered_marker(self):
+        from api.querysets import event_queryset
+
+        Event.objects.create(
+            event_name="Talk", event_start_date=date(2025, 1, 1), event_end_date=date(2025, 1, 1),
+            event_time="10:00", department_name=self.dept, event_venue="Hall",
+        )
+        event = event_queryset().get()
+        self.assertNotIn("poster_rendered", event.get_deferred_fields())
+
+
+class QueryPlanTests(TestCase):
+    """The hot date-range queries must stay on an index as data grows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        if connection.vendor not in ("postgresql", "sqlite"):
+            return
+        # Large enough that PostgreSQL prefers an index where one fits.
+        call_command(
+            "generate_synthetic_data", departments=20, clubs=200, fests=40,
+            events=20000, department_events=8000, notices=5000,
+            anchor=date(2025, 3, 1), stdout=io.StringIO(),
+        )
+        analyze()
+
+    def setUp(self):
+        if connection.vendor not in ("postgresql", "sqlite"):
+            self.skipTest(f"No plan checks for {connection.vendor}.")
+
+    def test_detects_full_scans(self):
+        self.assertTrue(full_scans(Event.objects.filter(event_venue="Lab 3")))
+
+    def test_hot_queries_use_indexes(self):
+        failures = check_hot_queries(QuerySample.pick(today=date(2025, 3, 1)))
+        self.assertEqual(failures, {})
+
+    def test_index_table_is_checked(self):
+        self.assertTrue(full_scans(EventIndex.objects.filter(event_venue="Lab 3")))
+
+    def test_command_refuses_other_databases(self):
+        with mock.patch.object(connection, "vendor", "mysql"):
+            with self.assertRaisesMessage(CommandError, "not mysql"):
+                call_command("check_query_plans", stdout=io.StringIO())
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "feeds"}},
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    },
+)
+class FeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        today = date.today()
+        self.dept = Department.objects.create(department_name="CS", password="x", department_description="d")
+        self.club = Club.objects.create(club_name="GDSC", department_name=self.dept, club_description="c")
+        self.other = Club.objects.create(club_name="ACM", department_name=self.dept, club_description="c")
+        self.fest = Fest.objects.create(
+            fest_name="Mayukh", department_name=self.dept, event_start_date=today, event_end_date=today,
+        )
+        self.event = Event.objects.create(
+            event_name="Hack; Night, 2", event_start_date=today, event_end_date=today + timedelta(days=1),
+            event_time="10:00", department_name=self.dept, club_name=self.club, event_venue="Lab 1",
+            registration_link="https://example.com/" + "r" * 80,
+        )
+        Event.objects.create(
+            event_name="Old talk", event_start_date=today - timedelta(days=200),
+            event_end_date=today - timedelta(days=200), event_time="9", department_name=self.dept,
+            club_name=self.club, event_venue="Hall",
+        )
+        self.devent = dEvent.objects.create(
+            event_name="Dance", event_start_date=today, event_end_date=today, event_time="6 PM",
+            department_name=self.dept, fest_name=self.fest, event_venue="Ground",
+        )
+
+    def get(self, url, **headers):
+        response = self.client.get(url, **headers)
+        if response.streaming:
+            response.text = b"".join(response.streaming_content).decode()
+        elif response.status_code == 200:
+            response.text = response.content.decode()
+        return response
+
+    def test_feed_is_valid_icalendar(self):
+        response = self.get("/event/feeds/events.ics")
+        self.assertEqual(response["Content-Type"], "text/calendar; charset=utf-8")
+        body = response.text
+        self.assertTrue(body.startswith("BEGIN:VCALENDAR\r\n"))
+        self.assertTrue(body.endswith("END:VCALENDAR\r\n"))
+        self.assertIn(f"UID:event-{self.event.pk}@clue", body)
+        self.assertIn(f"UID:devent-{self.devent.pk}@clue", body)
+        self.assertNotIn("Old talk", body)
+        self.assertIn("SUMMARY:Hack\\; Night\\, 2", body)
+        end = self.event.event_end_date + timedelta(days=1)
+        self.assertIn(f"DTEND;VALUE=DATE:{end:%Y%m%d}", body)
+        for line in body.split("\r\n"):
+            self.assertLessEqual(len(line.encode()), 75)
+        unfolded = body.replace("\r\n ", "")
+        self.assertIn(f"URL:{self.event.registration_link}", unfolded)
+
+    def test_scoped_feeds(self):
+        self.assertIn("Hack", self.get("/event/feeds/club/GDSC.ics").text)
+        self.assertNotIn("Dance", self.get("/event/feeds/club/GDSC.ics").text)
+        self.assertNotIn("Hack", self.get("/event/feeds/club/ACM.ics").text)
+        fest = self.get("/event/feeds/fest/Mayukh.ics").text
+        self.assertIn("Dance", fest)
+        self.assertNotIn("Hack", fest)
+        department = self.get("/event/feeds/department/CS.ics").text
+        self.assertIn("Dance", department)
+        self.assertIn("Hack", department)
+        self.assertEqual(self.client.get("/event/feeds/club/Nope.ics").status_code, 404)
+
+    def test_unchanged_feed_costs_no_queries(self):
+        first = self.get("/event/feeds/club/GDSC.ics")
+        self.assertTrue(first.streaming)
+        with self.assertNumQueries(0):
+            second = self.get("/event/feeds/club/GDSC.ics")
+        self.assertEqual(second.text, first.text)
+        self.assertEqual(second["ETag"], first["ETag"])
+        with self.assertNumQueries(0):
+            response = self.client.get("/event/feeds/club/GDSC.ics", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_last_modified_moves_at_midnight(self):
+        ModelVersion.objects.update(changed_at=timezone.now() - timedelta(days=3))
+        response = self.get("/event/feeds/events.ics")
+        self.assertEqual(response["Last-Modified"], http_date(start_of_today().timestamp()))
+        stale = http_date((timezone.now() - timedelta(days=2)).timestamp())
+        cache.clear()
+        self.assertEqual(self.client.get("/event/feeds/events.ics", HTTP_IF_MODIFIED_SINCE=stale).status_code, 200)
+
+    def test_large_bodies_are_not_cached(self):
+        with mock.patch("event.feeds.FEED_BODY_CACHE_MAX_BYTES", 100):
+            first = self.get("/event/feeds/club/GDSC.ics")
+            with CaptureQueriesContext(connection) as queries:
+                second = self.get("/event/feeds/club/GDSC.ics")
+            self.assertTrue(queries.captured_queries)
+            self.assertEqual(second.text, first.text)
+            with self.assertNumQueries(0):
+                response = self.client.get("/event/feeds/club/GDSC.ics", HTTP_IF_NONE_MATCH=first["ETag"])
+            self.assertEqual(response.status_code, 304)
+
+    def test_writes_invalidate_only_affected_feeds(self):
+        club = self.get("/event/feeds/club/GDSC.ics")
+        fest = self.get("/event/feeds/fest/Mayukh.ics")
+
+        self.event.club_name = self.other
+        self.event.save()
+        self.assertNotIn("Hack", self.get("/event/feeds/club/GDSC.ics").text)
+        self.assertIn("Hack", self.get("/event/feeds/club/ACM.ics").text)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get("/event/feeds/fest/Mayukh.ics")["ETag"], fest["ETag"])
+        response = self.client.get("/event/feeds/club/GDSC.ics", HTTP_IF_NONE_MATCH=club["ETag"])
+        self.assertEqual(response.status_code, 200)
+
+
+class PageScopeTests(TestCase):
+    """``event.signals`` bumps the page scopes of every row it writes."""
+
+    scopes = ["departments", "clubs", "department:CS", "department:EE", "club:GDSC", "club:ACM"]
+
+    def setUp(self):
+        self.cs = Department.objects.create(department_name="CS", password="x", department_description="d")
+        self.ee = Department.objects.create(department_name="EE", password="x", department_description="d")
+        self.gdsc = Club.objects.create(club_name="GDSC", department_name=self.cs, club_description="c")
+        self.acm = Club.objects.create(club_name="ACM", department_name=self.ee, club_description="c")
+        day = date(2025, 3, 1)
+        self.fest = Fest.objects.create(fest_name="Mayukh", department_name=self.cs, event_start_date=day, event_end_date=day)
+        self.event = Event.objects.create(
+            event_name="Hack", event_start_date=day, event_end_date=day, event_time="10:00",
+            department_name=self.cs, club_name=self.gdsc, event_venue="Hall",
+        )
+        self.devent = dEvent.objects.create(
+            event_name="Dance", event_start_date=day, event_end_date=day, event_time="6 PM",
+            department_name=self.cs, fest_name=self.fest, event_venue="Ground",
+        )
+
+    def bumped(self, write):
+        before = dict(zip(self.scopes, scope_versions(self.scopes)))
+        write()
+        after = dict(zip(self.scopes, scope_versions(self.scopes)))
+        return {scope for scope in self.scopes if after[scope] != before[scope]}
+
+    def test_saves_bump_their_pages(self):
+        self.assertEqual(self.bumped(self.cs.save), {"departments", "department:CS"})
+        self.assertEqual(self.bumped(self.gdsc.save), {"clubs", "club:GDSC"})
+        self.assertEqual(self.bumped(self.fest.save), {"department:CS"})
+        self.assertEqual(self.bumped(self.devent.save), {"department:CS"})
+        self.assertEqual(self.bumped(self.event.save), {"club:GDSC"})
+
+    def test_moves_bump_old_and_new_pages(self):
+        def move_event():
+            self.event.club_name = self.acm
+            self.event.department_name = self.ee
+            self.event.save()
+
+        def move_devent():
+            self.devent.department_name = self.ee
+            self.devent.fest_name = None
+            self.devent.save()
+
+        self.assertEqual(self.bumped(move_event), {"club:GDSC", "club:ACM"})
+        self.assertEqual(self.bumped(move_devent), {"department:CS", "department:EE"})
+
+    def test_deletes_bump_their_pages(self):
+        self.assertEqual(self.bumped(self.event.delete), {"club:GDSC"})
+        self.assertEqual(self.bumped(self.devent.delete), {"department:CS"})
+        # An event without a club lists on no cached page.
+        self.event = Event.objects.create(
+            event_name="Talk", event_start_date=date(2025, 3, 2), event_end_date=date(2025, 3, 2),
+            event_time="10:00", department_name=self.cs, event_venue="Hall",
+        )
+        self.assertEqual(self.bumped(self.event.save), set())
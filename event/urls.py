@@ -1,6 +1,7 @@
 from django.urls import path
 from event.views import club_event
 from .views import *
+from .feeds import club_feed, department_feed, events_feed, fest_feed
 from django.conf import settings
 from django.conf.urls.static import static
 urlpatterns= [
@@ -10,6 +11,12 @@ urlpatterns= [
     path('club/<str:club_name>/<int:event_id>/',event_detail, name='event_detail'),
     path('notices/',notice_view, name='notices'),
     path('notices/delete/<int:notice_id>/', delete_notice, name='delete_notice'),
+
+    # iCalendar subscription feeds
+    path('feeds/events.ics', events_feed, name='events_feed'),
+    path('feeds/department/<str:department_name>.ics', department_feed, name='department_feed'),
+    path('feeds/club/<str:club_name>.ics', club_feed, name='club_feed'),
+    path('feeds/fest/<str:fest_name>.ics', fest_feed, name='fest_feed'),
   
 
 
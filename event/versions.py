@@ -0,0 +1,68 @@
+"""
+Per-model "last changed" stamps for HTTP conditional GET.
+
+``event.signals`` bumps the stamp of a model in event.models or
+department.models whenever one of its rows is saved or deleted. Views build
+an ETag/Last-Modified pair from the stamps of the models they render, so an
+unchanged resource is answered with a 304 after a single small lookup and
+without touching the event tables.
+"""
+import hashlib
+from datetime import datetime
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.utils.http import http_date
+
+from .models import ModelVersion
+
+
+def bump(model) -> None:
+    label = model._meta.label_lower
+    stamp = timezone.now()
+    if not ModelVersion.objects.filter(label=label).update(changed_at=stamp):
+        try:
+            with transaction.atomic():
+                ModelVersion.objects.create(label=label, changed_at=stamp)
+        except IntegrityError:
+            ModelVersion.objects.filter(label=label).update(changed_at=stamp)
+
+
+def last_changed(*models) -> datetime:
+    """Latest change stamp across ``models``.
+
+    A model that has never been stamped is stamped now, so caches that saw
+    it before stamps existed are revalidated rather than trusted.
+    """
+    labels = {model._meta.label_lower for model in models}
+    stamps = dict(ModelVersion.objects.filter(label__in=labels).values_list("label", "changed_at"))
+    for label in labels - set(stamps):
+        version, _created = ModelVersion.objects.get_or_create(label=label)
+        stamps[label] = version.changed_at
+    return max(stamps.values())
+
+
+def start_of_today() -> datetime:
+    return timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()
+    return quote_etag(digest)
+
+
+def conditional_response(request, etag, last_modified=None):
+    """A 304/412 response when the client's validators match, else None."""
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def set_validators(response, etag, last_modified=None):
+    """Attach validators to a 200 response and make caches revalidate it."""
+    if response.status_code == 200:
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        patch_cache_control(response, no_cache=True)
+    return response
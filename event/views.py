@@ -5,13 +5,17 @@ from department.models import *
 from signup.models import *
 from django.utils.timezone import now
 from django.contrib import messages
+from signup.coordinators import coordinator_required
+from .page_cache import cache_page_versioned
 # Create your views here.
 def club_event(request):
     return render(request,'club_event.html')
 
+@cache_page_versioned("clubs")
 def club_list(request):
     clubs = Club.objects.all()
     return render(request, 'event_page.html', {'clubs': clubs})
+@cache_page_versioned("club:{club_name}")
 def club_detail(request, club_name):
     # Get the specific club
     club = get_object_or_404(Club, club_name=club_name)
@@ -23,19 +27,10 @@ def event_detail(request, club_name, event_id):
     event = get_object_or_404(Event, id=event_id)
     return render(request, 'event.html', {'club': club, 'event': event})
 
+@coordinator_required
 def notice_view(request):
     """Show notices for the respective coordinator (Club/Department)."""
-
-    # Check if the coordinator is logged in
-    if "coordinator_name" not in request.session:
-        return redirect("coordinator_login")
-
-    try:
-        # Fetch the coordinator based on session
-        coordinator = Coordinator.objects.get(coordinator_name=request.session["coordinator_name"])
-    except Coordinator.DoesNotExist:
-        messages.error(request, "Coordinator not found.")
-        return redirect("coordinator_login")
+    coordinator = request.coordinator
 
     # Determine whether coordinator is for a club or a department
     if coordinator.coordinator_type == "club" and coordinator.club_name:
@@ -67,24 +62,16 @@ def notice_view(request):
 
     return render(request, "notice.html", {"notices": notices, "coordinator": coordinator})
 
+@coordinator_required
 def delete_notice(request, notice_id):
     """Allow a coordinator to delete only their own notices."""
-
-    # Check if the coordinator is logged in
-    if "coordinator_name" not in request.session:
-        return redirect("coordinator_login")
-
-    try:
-        coordinator = Coordinator.objects.get(coordinator_name=request.session["coordinator_name"])
-    except Coordinator.DoesNotExist:
-        messages.error(request, "Coordinator not found.")
-        return redirect("coordinator_login")
+    coordinator = request.coordinator
 
     notice = get_object_or_404(Notice, id=notice_id)
 
     # Ensure the coordinator can delete only their own notices
-    if (coordinator.coordinator_type == "club" and notice.club_name != coordinator.club_name) or \
-       (coordinator.coordinator_type == "department" and notice.department_name != coordinator.department_name):
+    if (coordinator.coordinator_type == "club" and notice.club_name_id != coordinator.club_name_id) or \
+       (coordinator.coordinator_type == "department" and notice.department_name_id != coordinator.department_name_id):
         messages.error(request, "You are not authorized to delete this notice.")
         return redirect("notices")
 
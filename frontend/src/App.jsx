@@ -32,7 +32,7 @@ function App() {
   return (
     <QueryClientProvider client={queryClient}>
       <ThemeProvider defaultTheme="light" storageKey="clue-ui-theme">
-        <Router>
+        <Router basename={import.meta.env.VITE_ROUTER_BASENAME}>
           <Routes>
             <Route path="/" element={<Home />} />
             <Route path="/clubs" element={<Clubs />} />
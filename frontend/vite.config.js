@@ -8,6 +8,8 @@ const __dirname = path.dirname(__filename)
 
 // https://vite.dev/config/
 export default defineConfig({
+  // build.sh sets VITE_BASE=/static/app/ when Django serves the bundle.
+  base: process.env.VITE_BASE || '/',
   plugins: [react()],
   resolve: {
     alias: {
@@ -26,6 +28,8 @@ export default defineConfig({
   build: {
     outDir: 'dist',
     sourcemap: false,
+    // .vite/manifest.json, read by Django to link the hashed entry chunks.
+    manifest: true,
     rollupOptions: {
       output: {
         manualChunks: {
@@ -0,0 +1,135 @@
+"""
+Month calendar grid for ``home.views.calendar_view``.
+
+Events for a month are fetched with one range query on ``EventIndex``
+(club and department events together), expanded in memory onto every day
+they span, and the finished grid is cached per (year, month);
+``aget_month_grid`` does the same for async views. ``home.signals`` drops the cached months an event touches whenever it
+is saved or deleted.
+"""
+import calendar
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils.dateparse import parse_date
+
+from .models import EventIndex
+
+CALENDAR_CACHE_TIMEOUT = 60 * 60
+
+
+def month_cache_key(year: int, month: int) -> str:
+    return f"calendar:month:{year}:{month:02d}"
+
+
+def _as_date(value):
+    # Views create events straight from POST data, so the instance handed to
+    # a signal may still carry "YYYY-MM-DD" strings instead of dates.
+    if isinstance(value, str):
+        return parse_date(value)
+    return value
+
+
+def _overlapping(month_start: date, month_end: date):
+    """One query for every club and department event that touches the month."""
+    return EventIndex.objects.filter(
+        Q(event_start_date__lte=month_end, event_end_date__gte=month_start)
+        | Q(event_start_date__range=(month_start, month_end))
+    ).order_by("event_type", "event_start_date", "source_id").values(*_FIELDS)
+
+
+def _spread(by_day, start: date, end: date, entry: dict, month_start: date, month_end: date) -> None:
+    # An end date before the start date is treated as a one-day event.
+    day = max(start, month_start)
+    last = min(max(start, end), month_end)
+    while day <= last:
+        by_day[day].append(entry)
+        day += timedelta(days=1)
+
+
+_FIELDS = ("event_type", "source_id", "event_name", "club_name", "department_name",
+           "event_start_date", "event_end_date")
+
+
+def _month_bounds(year: int, month: int):
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def _entry(row):
+    if row["event_type"] == EventIndex.CLUB:
+        return {"name": row["event_name"], "type": "Club", "id": row["source_id"], "club_name": row["club_name"]}
+    return {
+        "name": row["event_name"],
+        "type": "Department",
+        "id": row["source_id"],
+        "department_name": row["department_name"],
+    }
+
+
+def _grid(year: int, month: int, rows):
+    """Lay the ``values()`` rows of ``_overlapping`` out as weeks."""
+    month_start, month_end = _month_bounds(year, month)
+
+    # Rows come club events first, so each day lists them as it always has.
+    by_day = defaultdict(list)
+    for row in rows:
+        _spread(by_day, row["event_start_date"], row["event_end_date"], _entry(row), month_start, month_end)
+
+    weeks = []
+    for week in calendar.Calendar().monthdatescalendar(year, month):
+        week_data = []
+        for day in week:
+            if day.month == month:
+                week_data.append({"date": day, "day": day.day, "events": by_day.get(day, [])})
+            else:
+                week_data.append({"date": day, "day": 0, "events": []})
+        weeks.append(week_data)
+    return weeks
+
+
+def build_month_grid(year: int, month: int):
+    """Build the list of weeks rendered by ``calender.html``."""
+    return _grid(year, month, _overlapping(*_month_bounds(year, month)))
+
+
+async def abuild_month_grid(year: int, month: int):
+    """``build_month_grid`` for async views."""
+    rows = [row async for row in _overlapping(*_month_bounds(year, month))]
+    return _grid(year, month, rows)
+
+
+def get_month_grid(year: int, month: int):
+    """Return the cached grid for a month, building it on a miss."""
+    key = month_cache_key(year, month)
+    weeks = cache.get(key)
+    if weeks is None:
+        weeks = build_month_grid(year, month)
+        cache.set(key, weeks, CALENDAR_CACHE_TIMEOUT)
+    return weeks
+
+
+async def aget_month_grid(year: int, month: int):
+    key = month_cache_key(year, month)
+    weeks = await cache.aget(key)
+    if weeks is None:
+        weeks = await abuild_month_grid(year, month)
+        await cache.aset(key, weeks, CALENDAR_CACHE_TIMEOUT)
+    return weeks
+
+
+def invalidate_months(start, end) -> None:
+    """Drop the cached grid of every month between ``start`` and ``end``."""
+    start, end = _as_date(start), _as_date(end)
+    if start is None:
+        return
+    if end is None or end < start:
+        end = start
+
+    keys = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        keys.append(month_cache_key(year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    cache.delete_many(keys)
@@ -0,0 +1,103 @@
+"""
+The React app's index page, built from the Vite manifest.
+
+``vite build`` (run by build.sh with ``build.manifest``) writes
+``.vite/manifest.json`` mapping each source module to its content-hashed
+output file, the chunks it statically imports and its CSS. The page lists
+the entry script and stylesheets, and preloads every chunk the entry imports
+so the browser fetches them in parallel instead of discovering them one
+import at a time. The same hints go out as a ``Link`` header, which a CDN
+can turn into 103 Early Hints.
+
+The bundle itself is cached forever (its names change with its content), so
+a repeat visit only revalidates this page, which answers 304 until the next
+build.
+"""
+import json
+import os
+import threading
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import Http404
+from django.shortcuts import render
+
+from event.versions import conditional_response, make_etag, set_validators
+
+_lock = threading.Lock()
+_loaded = {}  # path -> (mtime, assets)
+
+
+class FrontendAssets:
+    """Static URLs for the manifest's entry points."""
+
+    def __init__(self, manifest):
+        self.scripts = []
+        self.styles = []
+        self.preloads = []
+        seen = set()
+
+        def visit(key):
+            if key in seen:
+                return
+            seen.add(key)
+            chunk = manifest[key]
+            for css in chunk.get("css", []):
+                if css not in self.styles:
+                    self.styles.append(css)
+            for imported in chunk.get("imports", []):
+                if imported not in seen:
+                    self.preloads.append(manifest[imported]["file"])
+                    visit(imported)
+
+        for key, chunk in manifest.items():
+            if chunk.get("isEntry"):
+                self.scripts.append(chunk["file"])
+                visit(key)
+
+        self.scripts = [_static_url(name) for name in self.scripts]
+        self.styles = [_static_url(name) for name in self.styles]
+        self.preloads = [_static_url(name) for name in self.preloads]
+        self.etag = make_etag(*self.scripts, *self.styles, *self.preloads)
+
+    def link_header(self):
+        links = [f"<{url}>; rel=preload; as=style" for url in self.styles]
+        links += [f"<{url}>; rel=modulepreload" for url in self.scripts + self.preloads]
+        return ", ".join(links)
+
+
+def _static_url(name):
+    return staticfiles_storage.url(settings.FRONTEND_STATIC_PREFIX + name)
+
+
+def frontend_assets():
+    """The current build's ``FrontendAssets``, or None before the first build.
+
+    The manifest is read once per process and again only when it changes.
+    """
+    path = settings.FRONTEND_MANIFEST
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    cached = _loaded.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with _lock:
+        with open(path, encoding="utf-8") as manifest:
+            assets = FrontendAssets(json.load(manifest))
+        _loaded[path] = (mtime, assets)
+    return assets
+
+
+def frontend(request, route=""):
+    """Serve the React app's index page for any of its client-side routes."""
+    assets = frontend_assets()
+    if assets is None:
+        raise Http404("The frontend has not been built.")
+    not_modified = conditional_response(request, assets.etag)
+    if not_modified is not None:
+        return not_modified
+    response = render(request, "frontend.html", {"assets": assets})
+    response["Link"] = assets.link_header()
+    return set_validators(response, assets.etag)
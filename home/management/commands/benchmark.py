@@ -0,0 +1,234 @@
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from clue.timing import percentile
+from department.models import dEvent
+from event.models import Club, Department, Event, Notice
+
+BENCHMARK_USER = "benchmark-staff"
+
+# name -> (URL name or path, query string, needs a staff login)
+ENDPOINTS = {
+    "home": ("home", "", False),
+    "calendar": ("calendar_view", "", False),
+    "search": ("search", "q=workshop", False),
+    "admin_dashboard": ("admin_dashboard", "", True),
+    "api_events": ("/api/events/", "", False),
+    "api_stats": ("api:event-stats", "", True),
+}
+
+
+def _url(target, query):
+    path = target if target.startswith("/") else reverse(target)
+    return f"{path}?{query}" if query else path
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure latency, throughput and query counts of the hot pages and API "
+        "endpoints in-process, and save the results as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--endpoint", action="append", choices=sorted(ENDPOINTS), dest="endpoints",
+            help="Only run this endpoint (repeatable; default: all).",
+        )
+        parser.add_argument("--iterations", type=int, default=50, help="Timed requests per endpoint (default: 50).")
+        parser.add_argument("--warmup", type=int, default=3, help="Untimed requests first (default: 3).")
+        parser.add_argument(
+            "--concurrency", type=int, default=4,
+            help="Threads for the throughput run (default: 4; 0 skips it).",
+        )
+        parser.add_argument(
+            "--cold", action="store_true",
+            help="Clear the cache before every timed request.",
+        )
+        parser.add_argument(
+            "--output", type=Path, default=None,
+            help="JSON file to write (default: benchmarks/<timestamp>-<commit>.json).",
+        )
+        parser.add_argument(
+            "--compare", type=Path, default=None,
+            help="Earlier results file to print p50/p95 changes against.",
+        )
+
+    def handle(self, *args, **options):
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be at least 1.")
+        names = options["endpoints"] or list(ENDPOINTS)
+        staff = User.objects.filter(username=BENCHMARK_USER).first()
+        if staff is None:
+            staff = User.objects.create_user(BENCHMARK_USER, is_staff=True)
+
+        # Every request would otherwise log a line; keep the output readable.
+        quiet = [logging.getLogger(name) for name in ("clue.requests", "django.request")]
+        levels = [logger.level for logger in quiet]
+        for logger in quiet:
+            logger.setLevel(logging.ERROR)
+        try:
+            results = {}
+            for name in names:
+                results[name] = self.run_endpoint(name, staff, options)
+                self.report(name, results[name])
+        finally:
+            for logger, level in zip(quiet, levels):
+                logger.setLevel(level)
+
+        commit = _commit()
+        data = {
+            "meta": {
+                "commit": commit,
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "database": connection.vendor,
+                "cache": settings.CACHES["default"]["BACKEND"],
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "iterations": options["iterations"],
+                "warmup": options["warmup"],
+                "concurrency": options["concurrency"],
+                "cold": options["cold"],
+                "rows": {
+                    model.__name__: model.objects.count()
+                    for model in (Department, Club, Event, dEvent, Notice)
+                },
+            },
+            "results": results,
+        }
+
+        output = options["output"]
+        if output is None:
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            output = Path(settings.BASE_DIR) / "benchmarks" / f"{stamp}-{commit or 'nogit'}.json"
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(data, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
+
+        if options["compare"]:
+            self.compare(json.loads(options["compare"].read_text()), data)
+
+    def client(self, staff, login):
+        client = Client(HTTP_HOST="localhost")
+        if login:
+            client.force_login(staff)
+        return client
+
+    def run_endpoint(self, name, staff, options):
+        target, query, login = ENDPOINTS[name]
+        url = _url(target, query)
+        client = self.client(staff, login)
+
+        for _ in range(options["warmup"]):
+            client.get(url)
+
+        durations = []
+        queries = []
+        status = None
+        for _ in range(options["iterations"]):
+            if options["cold"]:
+                cache.clear()
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = client.get(url)
+                durations.append((time.perf_counter() - start) * 1000)
+            queries.append(len(captured))
+            status = response.status_code
+
+        ordered = sorted(durations)
+        result = {
+            "url": url,
+            "status": status,
+            "mean_ms": round(statistics.fmean(durations), 2),
+            "min_ms": round(ordered[0], 2),
+            "p50_ms": round(percentile(ordered, 0.50), 2),
+            "p95_ms": round(percentile(ordered, 0.95), 2),
+            "p99_ms": round(percentile(ordered, 0.99), 2),
+            "max_ms": round(ordered[-1], 2),
+            "queries_median": statistics.median(queries),
+            "queries_max": max(queries),
+            "rps": round(len(durations) / (sum(durations) / 1000), 1),
+        }
+        if options["concurrency"] > 0:
+            result["concurrent_rps"] = self.throughput(url, staff, login, options)
+        return result
+
+    def throughput(self, url, staff, login, options):
+        """Requests per second with ``concurrency`` threads sharing ``iterations`` requests."""
+        remaining = [options["iterations"]]
+        lock = threading.Lock()
+        errors = []
+
+        def worker():
+            try:
+                client = self.client(staff, login)
+                while True:
+                    with lock:
+                        if not remaining[0]:
+                            return
+                        remaining[0] -= 1
+                    client.get(url)
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker) for _ in range(options["concurrency"])]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        if errors:
+            raise CommandError(f"Throughput run for {url} failed: {errors[0]!r}")
+        return round(options["iterations"] / elapsed, 1)
+
+    def report(self, name, result):
+        line = (
+            f"{name:<16} {result['status']}  p50 {result['p50_ms']:>8.2f} ms  "
+            f"p95 {result['p95_ms']:>8.2f} ms  {result['queries_median']:>4} queries  "
+            f"{result['rps']:>7.1f} rps"
+        )
+        if "concurrent_rps" in result:
+            line += f"  ({result['concurrent_rps']:.1f} rps concurrent)"
+        self.stdout.write(line)
+
+    def compare(self, before, after):
+        self.stdout.write(f"\nAgainst {before['meta'].get('commit')} ({before['meta'].get('timestamp')}):")
+        for name, result in after["results"].items():
+            old = before["results"].get(name)
+            if old is None:
+                continue
+            changes = []
+            for key in ("p50_ms", "p95_ms"):
+                delta = (result[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+                changes.append(f"{key[:3]} {old[key]:.2f} -> {result[key]:.2f} ms ({delta:+.1f}%)")
+            changes.append(f"queries {old['queries_median']} -> {result['queries_median']}")
+            self.stdout.write(f"{name:<16} " + "  ".join(changes))
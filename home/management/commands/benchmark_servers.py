@@ -0,0 +1,281 @@
+import importlib.util
+import json
+import os
+import platform
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+from clue.timing import percentile
+from .benchmark import ENDPOINTS, _commit, _url
+
+# Pages anyone can load; the staff endpoints would need a login per server.
+PUBLIC_ENDPOINTS = [name for name, (_target, _query, login) in ENDPOINTS.items() if not login]
+
+DB_MODES = ("persistent", "pool", "transaction")
+
+# name -> gunicorn arguments after the app module
+SERVERS = {
+    "wsgi": ["clue.wsgi:application"],
+    "asgi": ["clue.asgi:application", "-c", "clue/gunicorn_asgi.py"],
+}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _levels(value):
+    try:
+        levels = sorted({int(level) for level in value.split(",")})
+    except ValueError:
+        raise CommandError("--concurrency takes comma-separated integers, e.g. 1,8,32.")
+    if not levels or levels[0] < 1:
+        raise CommandError("--concurrency levels must be at least 1.")
+    return levels
+
+
+class Command(BaseCommand):
+    help = (
+        "Start the site under gunicorn as WSGI (sync workers) and as ASGI "
+        "(uvicorn workers) on the current database, in each DB_POOL_MODE "
+        "asked for, load the public pages at rising concurrency, and save "
+        "requests/second, latency and peak Postgres connections as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--server", action="append", choices=sorted(SERVERS), dest="servers",
+            help="Only run this server (repeatable; default: both).",
+        )
+        parser.add_argument(
+            "--endpoint", action="append", choices=PUBLIC_ENDPOINTS, dest="endpoints",
+            help="Only load this endpoint (repeatable; default: all public ones).",
+        )
+        parser.add_argument(
+            "--db-mode", action="append", choices=DB_MODES, dest="db_modes",
+            help="Run the servers with this DB_POOL_MODE (repeatable; default: the current one).",
+        )
+        parser.add_argument("--workers", type=int, default=1, help="Gunicorn workers per server (default: 1).")
+        parser.add_argument(
+            "--concurrency", type=_levels, default=[1, 8, 32],
+            help="Comma-separated client concurrency levels (default: 1,8,32).",
+        )
+        parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint and level (default: 200).")
+        parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds (default: 30).")
+        parser.add_argument(
+            "--output", type=Path, default=None,
+            help="JSON file to write (default: benchmarks/<timestamp>-<commit>-servers.json).",
+        )
+
+    def handle(self, *args, **options):
+        if importlib.util.find_spec("gunicorn") is None:
+            raise CommandError("gunicorn is not installed.")
+        if options["workers"] < 1 or options["requests"] < 1:
+            raise CommandError("--workers and --requests must be at least 1.")
+        if connection.vendor == "sqlite" and connection.settings_dict["NAME"] == ":memory:":
+            raise CommandError("The servers cannot share an in-memory database.")
+
+        servers = options["servers"] or list(SERVERS)
+        endpoints = options["endpoints"] or PUBLIC_ENDPOINTS
+        db_modes = options["db_modes"] or [settings.DB_POOL_MODE]
+        results = {}
+        for server in servers:
+            for mode in db_modes:
+                label = f"{server}/{mode}"
+                port = _free_port()
+                with _Server(server, port, options["workers"], {"DB_POOL_MODE": mode}):
+                    results[label] = {}
+                    for name in endpoints:
+                        target, query, _login = ENDPOINTS[name]
+                        url = f"http://127.0.0.1:{port}{_url(target, query)}"
+                        self.load(url, 2 * options["workers"], 1, options["timeout"])  # warm up
+                        results[label][name] = {}
+                        for level in options["concurrency"]:
+                            result = self.load(url, options["requests"], level, options["timeout"])
+                            results[label][name][str(level)] = result
+                            self.report(label, name, level, result)
+
+        commit = _commit()
+        data = {
+            "meta": {
+                "commit": commit,
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "database": connection.vendor,
+                "cache": settings.CACHES["default"]["BACKEND"],
+                "python": platform.python_version(),
+                "cpus": os.cpu_count(),
+                "workers": options["workers"],
+                "requests": options["requests"],
+                "concurrency": options["concurrency"],
+                "pool_size": [settings.DB_POOL_MIN_SIZE, settings.DB_POOL_MAX_SIZE],
+            },
+            "results": results,
+        }
+        output = options["output"]
+        if output is None:
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            output = Path(settings.BASE_DIR) / "benchmarks" / f"{stamp}-{commit or 'nogit'}-servers.json"
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(data, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
+
+    def load(self, url, total, concurrency, timeout):
+        """Issue ``total`` GETs from ``concurrency`` threads; latency and throughput."""
+        remaining = [total]
+        lock = threading.Lock()
+        durations = []
+        errors = []
+
+        def worker():
+            while True:
+                with lock:
+                    if not remaining[0]:
+                        return
+                    remaining[0] -= 1
+                start = time.perf_counter()
+                try:
+                    with urllib.request.urlopen(url, timeout=timeout) as response:
+                        response.read()
+                except (OSError, urllib.error.URLError) as error:
+                    with lock:
+                        errors.append(repr(error))
+                    continue
+                elapsed = (time.perf_counter() - start) * 1000
+                with lock:
+                    durations.append(elapsed)
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        sampler = _ConnectionSampler()
+        sampler.start()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        sampler.stop()
+
+        ordered = sorted(durations)
+        return {
+            "ok": len(durations),
+            "errors": len(errors),
+            "first_error": errors[0] if errors else None,
+            "rps": round(len(durations) / elapsed, 1),
+            "mean_ms": round(statistics.fmean(durations), 2) if durations else None,
+            "p50_ms": round(percentile(ordered, 0.50), 2) if ordered else None,
+            "p95_ms": round(percentile(ordered, 0.95), 2) if ordered else None,
+            "p99_ms": round(percentile(ordered, 0.99), 2) if ordered else None,
+            "peak_connections": sampler.peak,
+        }
+
+    def report(self, label, name, level, result):
+        if not result["ok"]:
+            self.stdout.write(f"{label:<16} {name:<12} c={level:<4} all requests failed: {result['first_error']}")
+            return
+        line = (
+            f"{label:<16} {name:<12} c={level:<4} {result['rps']:>8.1f} rps  "
+            f"p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms"
+        )
+        if result["peak_connections"] is not None:
+            line += f"  {result['peak_connections']:>3} conns"
+        if result["errors"]:
+            line += f"  {result['errors']} errors"
+        self.stdout.write(line)
+
+
+class _Server:
+    """Run one gunicorn server for the duration of a ``with`` block."""
+
+    def __init__(self, name, port, workers, env=None, ready_timeout=30):
+        self.name = name
+        self.port = port
+        self.workers = workers
+        self.env = env or {}
+        self.ready_timeout = ready_timeout
+
+    def __enter__(self):
+        # Request logs would cost the server time; only startup errors matter.
+        self.log = tempfile.TemporaryFile()
+        env = {**os.environ, **self.env, "REQUEST_LOG_LEVEL": "WARNING"}
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "gunicorn", *SERVERS[self.name],
+                "--bind", f"127.0.0.1:{self.port}", "--workers", str(self.workers),
+                "--access-logfile", "/dev/null", "--error-logfile", "-",
+            ],
+            cwd=settings.BASE_DIR, env=env, stdout=self.log, stderr=subprocess.STDOUT,
+        )
+        deadline = time.monotonic() + self.ready_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                break
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=0.5):
+                    return self
+            except OSError:
+                time.sleep(0.2)
+        self.log.seek(0)
+        output = self.log.read().decode(errors="replace")[-2000:]
+        self.stop()
+        raise CommandError(f"{self.name} server did not start:\n{output}")
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def stop(self):
+        if self.process.poll() is None:
+            self.process.send_signal(signal.SIGTERM)
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self.log.close()
+
+
+class _ConnectionSampler:
+    """Track the peak number of Postgres connections to this database."""
+
+    interval = 0.1
+
+    def __init__(self):
+        self.peak = None
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run)
+
+    def start(self):
+        if connection.vendor == "postgresql":
+            self.peak = 0
+            self._thread.start()
+
+    def stop(self):
+        if self._thread.is_alive():
+            self._done.set()
+            self._thread.join()
+
+    def _run(self):
+        try:
+            with connections["default"].cursor() as cursor:
+                while not self._done.is_set():
+                    cursor.execute("SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()")
+                    # Less the sampler's own connection.
+                    self.peak = max(self.peak, cursor.fetchone()[0] - 1)
+                    self._done.wait(self.interval)
+        finally:
+            connections.close_all()
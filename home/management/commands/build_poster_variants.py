@@ -0,0 +1,65 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from event.posters import generate_variants, mark_rendered
+from event.signals import POSTER_FIELDS
+
+
+def _init_worker():
+    # Needed under the "spawn" start method; a no-op for forked workers.
+    django.setup()
+
+
+def _render(name, force):
+    return generate_variants(name, force=force)
+
+
+class Command(BaseCommand):
+    help = "Render thumb/card/full poster variants for every stored poster that lacks them."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int, default=os.cpu_count() or 1,
+            help="Worker processes (default: number of CPUs).",
+        )
+        parser.add_argument(
+            "--force", action="store_true",
+            help="Re-render variants that already exist.",
+        )
+
+    def handle(self, *args, **options):
+        names = set()
+        for model, field in POSTER_FIELDS.items():
+            names.update(
+                model.objects.exclude(**{field: ""}).values_list(field, flat=True).iterator()
+            )
+        names.discard(None)
+        if not names:
+            self.stdout.write("No posters to process.")
+            return
+
+        # Workers only touch storage; don't let them inherit open DB sockets.
+        connections.close_all()
+        rendered = skipped = failed = 0
+        with ProcessPoolExecutor(max_workers=options["workers"], initializer=_init_worker) as pool:
+            futures = {pool.submit(_render, name, options["force"]): name for name in sorted(names)}
+            for future in as_completed(futures):
+                try:
+                    written = future.result()
+                except Exception as error:
+                    failed += 1
+                    self.stderr.write(f"{futures[future]}: {error!r}")
+                    continue
+                mark_rendered(futures[future])
+                if written:
+                    rendered += 1
+                else:
+                    skipped += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rendered {rendered} posters, {skipped} already done, {failed} failed."
+        ))
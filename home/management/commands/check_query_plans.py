@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from event.query_plans import HOT_QUERIES, PLAN_VENDORS, QuerySample, analyze, check_hot_queries
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN the hot date-range queries against this database and fail if "
+        "any of them scans a whole events, index or notices table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-analyze", action="store_true",
+            help="Skip refreshing planner statistics first.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in PLAN_VENDORS:
+            raise CommandError(
+                f"Query plans can only be checked on {' or '.join(PLAN_VENDORS)}, not {connection.vendor}."
+            )
+        if not options["no_analyze"]:
+            analyze()
+        failures = check_hot_queries(QuerySample.pick())
+        for name, scans in failures.items():
+            self.stderr.write(f"{name}: {'; '.join(scans)}")
+        if failures:
+            raise CommandError(f"{len(failures)} of {len(HOT_QUERIES)} hot queries scan a full table.")
+        self.stdout.write(self.style.SUCCESS(f"All {len(HOT_QUERIES)} hot queries use an index."))
@@ -0,0 +1,202 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from .benchmark import _commit
+
+MARKER = "COLDSTART "
+
+# Modules worth knowing about when reading a profile: whether each was loaded
+# by the time the first response went out.
+WATCHED = [
+    "rest_framework", "adrf", "api.views", "api.reports", "api.gallery",
+    "storages.backends.s3boto3", "boto3", "psycopg", "yaml",
+]
+
+# Runs in a fresh interpreter: import the Vercel entry point, then answer one
+# request, the way a new serverless instance does.
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from api.wsgi import app
+imported = time.perf_counter()
+modules_at_import = len(sys.modules)
+
+from wsgiref.util import setup_testing_defaults
+path, _, query = sys.argv[1].partition("?")
+environ = {"PATH_INFO": path, "QUERY_STRING": query, "HTTP_HOST": "localhost"}
+setup_testing_defaults(environ)
+status = []
+body = app(environ, lambda s, headers, exc_info=None: status.append(s))
+try:
+    for _chunk in body:
+        pass
+finally:
+    getattr(body, "close", lambda: None)()
+done = time.perf_counter()
+
+print(MARKER + json.dumps({
+    "import_ms": round((imported - start) * 1000, 2),
+    "first_response_ms": round((done - imported) * 1000, 2),
+    "status": int(status[0].split()[0]),
+    "modules_at_import": modules_at_import,
+    "modules_at_response": len(sys.modules),
+    "loaded": {name: name in sys.modules for name in WATCHED},
+}), flush=True)
+"""
+
+
+def _importtime(stderr):
+    """``[(depth, name, self_us, cumulative_us)]`` from ``-X importtime`` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # the header line
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        rows.append((depth, stripped, int(parts[0]), int(parts[1])))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure a serverless cold start: run fresh interpreters that import "
+        "api/wsgi.py and answer one request, and report import time, time to "
+        "first response and the slowest imports (-X importtime), eager and/or "
+        "with LAZY_IMPORTS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default="/", help="Path of the first request (default: /).")
+        parser.add_argument("--runs", type=int, default=5, help="Cold starts timed per mode (default: 5).")
+        parser.add_argument("--top", type=int, default=15, help="Slowest imports to list (default: 15).")
+        mode = parser.add_mutually_exclusive_group()
+        mode.add_argument("--lazy", action="store_true", help="Profile with LAZY_IMPORTS on.")
+        mode.add_argument("--eager", action="store_true", help="Profile with LAZY_IMPORTS off.")
+        mode.add_argument("--compare", action="store_true", help="Profile both and report the difference.")
+        parser.add_argument(
+            "--output", type=Path, default=None,
+            help="JSON file to write (default: benchmarks/<timestamp>-<commit>-coldstart.json).",
+        )
+
+    def handle(self, *args, **options):
+        if options["runs"] < 1:
+            raise CommandError("--runs must be at least 1.")
+        if options["compare"]:
+            modes = ["eager", "lazy"]
+        elif options["lazy"] or options["eager"]:
+            modes = ["lazy" if options["lazy"] else "eager"]
+        else:
+            modes = ["lazy" if settings.LAZY_IMPORTS else "eager"]
+
+        results = {}
+        for mode in modes:
+            result = results[mode] = self.profile(mode, options["path"], options["runs"], options["top"])
+            self.report(mode, result)
+        if options["compare"]:
+            eager, lazy = results["eager"]["median"], results["lazy"]["median"]
+            saved = eager["total_ms"] - lazy["total_ms"]
+            self.stdout.write(self.style.SUCCESS(
+                f"LAZY_IMPORTS saves {saved:.1f} ms of {eager['total_ms']:.1f} ms "
+                f"({saved / eager['total_ms']:.0%}) before the first response."
+            ))
+
+        commit = _commit()
+        data = {
+            "meta": {
+                "commit": commit,
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "path": options["path"],
+                "runs": options["runs"],
+                "python": sys.version.split()[0],
+                "use_s3": settings.USE_S3,
+            },
+            "results": results,
+        }
+        output = options["output"]
+        if output is None:
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            output = Path(settings.BASE_DIR) / "benchmarks" / f"{stamp}-{commit or 'nogit'}-coldstart.json"
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(data, indent=2))
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
+
+    def probe(self, mode, path, importtime=False):
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "clue.settings",
+            "LAZY_IMPORTS": "1" if mode == "lazy" else "0",
+            "REQUEST_LOG_LEVEL": "WARNING",
+            "PYTHONPATH": os.pathsep.join(filter(None, [str(settings.BASE_DIR), os.environ.get("PYTHONPATH")])),
+        }
+        code = f"MARKER = {MARKER!r}\nWATCHED = {WATCHED!r}\n{PROBE}"
+        command = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", code, path]
+        process = subprocess.run(command, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True)
+        for line in process.stdout.splitlines():
+            if line.startswith(MARKER):
+                return json.loads(line[len(MARKER):]), process.stderr
+        tail = "\n".join(line for line in process.stderr.splitlines() if not line.startswith("import time:"))
+        raise CommandError(f"The {mode} cold start failed:\n{tail[-2000:]}")
+
+    def profile(self, mode, path, runs, top):
+        # One run under -X importtime for the per-module breakdown; its own
+        # overhead would skew the timings, so those come from plain runs.
+        first, stderr = self.probe(mode, path, importtime=True)
+        imports = _importtime(stderr)
+        packages = defaultdict(int)
+        for _depth, name, self_us, _cumulative in imports:
+            packages[name.split(".")[0]] += self_us
+
+        samples = [self.probe(mode, path)[0] for _ in range(runs)]
+        median = {
+            key: round(statistics.median(sample[key] for sample in samples), 2)
+            for key in ("import_ms", "first_response_ms")
+        }
+        median["total_ms"] = round(median["import_ms"] + median["first_response_ms"], 2)
+        return {
+            "median": median,
+            "status": samples[-1]["status"],
+            "modules_at_import": samples[-1]["modules_at_import"],
+            "modules_at_response": samples[-1]["modules_at_response"],
+            "loaded": samples[-1]["loaded"],
+            "slowest_imports": [
+                {"module": name, "depth": depth, "self_ms": round(self_us / 1000, 2), "cumulative_ms": round(cumulative / 1000, 2)}
+                for depth, name, self_us, cumulative in sorted(imports, key=lambda row: -row[3])[:top]
+            ],
+            "packages": {
+                name: round(self_us / 1000, 2)
+                for name, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]
+            },
+            "samples": samples,
+            "importtime_run": first,
+        }
+
+    def report(self, mode, result):
+        median = result["median"]
+        self.stdout.write(
+            f"{mode:<6} import {median['import_ms']:>8.1f} ms  first response {median['first_response_ms']:>8.1f} ms  "
+            f"total {median['total_ms']:>8.1f} ms  status {result['status']}  "
+            f"modules {result['modules_at_import']} -> {result['modules_at_response']}"
+        )
+        if result["status"] >= 400:
+            self.stdout.write(self.style.WARNING(f"  the first request answered {result['status']}"))
+        loaded = [name for name, present in result["loaded"].items() if present]
+        self.stdout.write(f"  loaded: {', '.join(loaded) or '-'}")
+        self.stdout.write("  slowest imports (cumulative):")
+        for row in result["slowest_imports"]:
+            self.stdout.write(f"    {row['cumulative_ms']:>8.2f} ms  {'  ' * row['depth']}{row['module']}")
+        self.stdout.write("  self time by package:")
+        for name, self_ms in result["packages"].items():
+            self.stdout.write(f"    {self_ms:>8.2f} ms  {name}")
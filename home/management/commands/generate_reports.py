@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.reports import run_pending_reports
+
+
+class Command(BaseCommand):
+    help = "Build queued Report artifacts (CSV/XLSX exports) and store them."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop", action="store_true",
+            help="Keep polling for queued reports instead of exiting once none are left.",
+        )
+        parser.add_argument(
+            "--interval", type=float, default=5.0,
+            help="Seconds to sleep between polls of an empty queue with --loop (default: 5).",
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            done = run_pending_reports()
+            total += done
+            if done:
+                self.stdout.write(f"Built {done} reports.")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS(f"Built {total} reports."))
@@ -0,0 +1,185 @@
+import random
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from department.models import Fest, dEvent
+from event.models import Club, Department, Event, Notice
+from event.signals import VERSIONED_MODELS
+from event.versions import bump
+
+# Marks generated departments, so a second run into the same database is
+# refused instead of colliding on primary keys.
+SYNTHETIC_MARKER = "[synthetic]"
+
+SUBJECTS = [
+    "Computer Science", "Electrical", "Mechanical", "Civil", "Chemical",
+    "Electronics", "Physics", "Mathematics", "Chemistry", "Biotech",
+    "Architecture", "Management", "Humanities", "Design", "Aerospace",
+    "Metallurgy", "Data Science", "Economics", "Mining", "Textile",
+]
+CLUB_THEMES = [
+    "Robotics", "Coding", "Music", "Dance", "Drama", "Photography", "Quiz",
+    "Literary", "Astronomy", "Chess", "Debate", "Film", "Art", "Entrepreneur",
+    "Finance", "Gaming", "Nature", "Cycling", "AI", "Security",
+]
+EVENT_KINDS = [
+    "Workshop", "Hackathon", "Talk", "Meetup", "Contest", "Bootcamp",
+    "Showcase", "Seminar", "Quiz", "Jam", "Expo", "Open Mic",
+]
+TOPICS = [
+    "Python", "Web", "Cloud", "IoT", "Drones", "Design", "Poetry", "Startups",
+    "Rust", "Stocks", "Robots", "Space", "Jazz", "Sketching", "ML", "CTF",
+]
+VENUES = ["Main Auditorium", "Seminar Hall", "Lab", "Lecture Hall", "Open Air Theatre", "Library Hall"]
+TIMES = ["9:00 AM", "10:30 AM", "12:00 PM", "2:00 PM", "4:30 PM", "6:00 PM"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with a reproducible synthetic dataset for load testing. "
+        "Meant for an empty, throwaway database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--departments", type=int, default=100)
+        parser.add_argument("--clubs", type=int, default=2000)
+        parser.add_argument("--fests", type=int, default=300)
+        parser.add_argument("--events", type=int, default=150000, help="Club events (Event rows).")
+        parser.add_argument(
+            "--department-events", type=int, default=50000, help="Department events (dEvent rows).",
+        )
+        parser.add_argument("--notices", type=int, default=50000)
+        parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42).")
+        parser.add_argument(
+            "--anchor", type=date.fromisoformat, default=None,
+            help="Date the events are spread around, YYYY-MM-DD (default: today).",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=2000,
+            help="Rows inserted per batch (default: 2000).",
+        )
+
+    def handle(self, *args, **options):
+        if Department.objects.filter(department_description__startswith=SYNTHETIC_MARKER).exists():
+            raise CommandError("This database already holds a synthetic dataset.")
+        if options["departments"] < 1:
+            raise CommandError("--departments must be at least 1.")
+        if options["events"] and options["clubs"] < 1:
+            raise CommandError("Club events need at least one club.")
+
+        self.rng = random.Random(options["seed"])
+        self.anchor = options["anchor"] or date.today()
+        self.batch_size = options["batch_size"]
+
+        with transaction.atomic():
+            departments = self.create(Department, self.departments(options["departments"]))
+            clubs = self.create(Club, self.clubs(options["clubs"], departments))
+            fests = self.create(Fest, self.fests(options["fests"], departments))
+            self.create(Event, self.events(options["events"], clubs))
+            self.create(dEvent, self.department_events(options["department_events"], departments, fests))
+            self.create(Notice, self.notices(options["notices"], clubs))
+
+        # bulk_create skips the save signals: rebuild what they maintain.
+        call_command("rebuild_event_index", batch_size=self.batch_size, stdout=self.stdout)
+        for model in VERSIONED_MODELS:
+            bump(model)
+        cache.clear()
+        self.stdout.write(self.style.SUCCESS("Synthetic dataset created."))
+
+    def create(self, model, rows):
+        """Insert ``rows`` in batches; returns the primary keys created."""
+        keys = []
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                model.objects.bulk_create(batch)
+                keys.extend(obj.pk for obj in batch)
+                batch = []
+        if batch:
+            model.objects.bulk_create(batch)
+            keys.extend(obj.pk for obj in batch)
+        self.stdout.write(f"{model.__name__}: {len(keys)} rows")
+        return keys
+
+    def day(self, spread=365):
+        # Most activity sits close to the anchor, like a real semester.
+        offset = int(self.rng.triangular(-spread, spread, 0))
+        return self.anchor + timedelta(days=offset)
+
+    def departments(self, count):
+        for i in range(count):
+            subject = SUBJECTS[i % len(SUBJECTS)]
+            yield Department(
+                department_name=f"{subject} {i // len(SUBJECTS) + 1}",
+                password="synthetic",
+                department_description=f"{SYNTHETIC_MARKER} Department of {subject}.",
+            )
+
+    def clubs(self, count, departments):
+        for i in range(count):
+            theme = CLUB_THEMES[i % len(CLUB_THEMES)]
+            yield Club(
+                club_name=f"{theme} Club {i + 1}",
+                department_name_id=self.rng.choice(departments),
+                club_description=f"The {theme.lower()} club.",
+            )
+
+    def fests(self, count, departments):
+        for i in range(count):
+            start = self.day()
+            yield Fest(
+                fest_name=f"{self.rng.choice(CLUB_THEMES)}fest {i + 1}",
+                department_name_id=departments[i % len(departments)],
+                event_start_date=start,
+                event_end_date=start + timedelta(days=self.rng.randint(1, 4)),
+            )
+
+    def event_fields(self, start):
+        return {
+            "event_name": f"{self.rng.choice(TOPICS)} {self.rng.choice(EVENT_KINDS)}",
+            "event_start_date": start,
+            "event_end_date": start + timedelta(days=self.rng.choice((0, 0, 0, 1, 2))),
+            "event_time": self.rng.choice(TIMES),
+            "event_venue": f"{self.rng.choice(VENUES)} {self.rng.randint(1, 20)}",
+            "registration_link": "https://example.com/register" if self.rng.random() < 0.5 else None,
+        }
+
+    def events(self, count, clubs):
+        club_departments = dict(Club.objects.filter(pk__in=clubs).values_list("pk", "department_name"))
+        for _ in range(count):
+            club = self.rng.choice(clubs)
+            yield Event(club_name_id=club, department_name_id=club_departments[club], **self.event_fields(self.day()))
+
+    def department_events(self, count, departments, fests):
+        fest_rows = {
+            fest.pk: fest for fest in Fest.objects.filter(pk__in=fests).only(
+                "department_name", "event_start_date", "event_end_date",
+            )
+        }
+        for _ in range(count):
+            # Roughly two in three department events belong to a fest and
+            # fall inside its dates: the fest-season spike.
+            if fests and self.rng.random() < 0.65:
+                fest = fest_rows[self.rng.choice(fests)]
+                length = (fest.event_end_date - fest.event_start_date).days
+                start = fest.event_start_date + timedelta(days=self.rng.randint(0, length))
+                yield dEvent(department_name_id=fest.department_name_id, fest_name_id=fest.pk, **self.event_fields(start))
+            else:
+                yield dEvent(department_name_id=self.rng.choice(departments), **self.event_fields(self.day()))
+
+    def notices(self, count, clubs):
+        club_departments = dict(Club.objects.filter(pk__in=clubs).values_list("pk", "department_name"))
+        for i in range(count):
+            club = self.rng.choice(clubs) if clubs and self.rng.random() < 0.7 else None
+            yield Notice(
+                title=f"{self.rng.choice(TOPICS)} {self.rng.choice(EVENT_KINDS)} update {i + 1}",
+                description=f"Details about the upcoming {self.rng.choice(TOPICS).lower()} session.",
+                date_posted=self.day(spread=180),
+                club_name_id=club,
+                department_name_id=club_departments[club] if club else None,
+            )
@@ -0,0 +1,39 @@
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from api.gallery import IMAGE_EXTENSIONS, describe_image, gallery_path, record_gallery_image
+from event.models import Event, GalleryImage
+
+
+class Command(BaseCommand):
+    help = "Record GalleryImage rows for gallery files already in storage (one-off backfill)."
+
+    def handle(self, *args, **options):
+        root = "event_gallery/"
+        if not default_storage.exists(root):
+            self.stdout.write("No event_gallery/ directory in storage.")
+            return
+
+        known = set(GalleryImage.objects.values_list("path", flat=True))
+        folders, _files = default_storage.listdir(root)
+        events = Event.objects.in_bulk([int(folder) for folder in folders if folder.isdigit()])
+        added = 0
+        for folder in folders:
+            event = events.get(int(folder)) if folder.isdigit() else None
+            if event is None:
+                self.stderr.write(f"Skipping {root}{folder}/: no such event.")
+                continue
+            _dirs, filenames = default_storage.listdir(gallery_path(event.pk))
+            for filename in filenames:
+                path = gallery_path(event.pk) + filename
+                if path in known or not filename.lower().endswith(IMAGE_EXTENSIONS):
+                    continue
+                with default_storage.open(path, "rb") as file:
+                    info = describe_image(file)
+                if GalleryImage.objects.filter(event=event, content_hash=info["content_hash"]).exists():
+                    self.stderr.write(f"Skipping {path}: same content is already in the gallery.")
+                    continue
+                record_gallery_image(event, path, info)
+                added += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {added} gallery images."))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from event.models import Event
+from department.models import dEvent
+from home.models import EventIndex
+
+
+class Command(BaseCommand):
+    help = "Rebuild the EventIndex table from every Event and dEvent."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Rows read and inserted per batch (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        sources = [
+            (Event.objects.order_by("pk"), EventIndex.from_event),
+            (dEvent.objects.order_by("pk"), EventIndex.from_devent),
+        ]
+
+        total = 0
+        with transaction.atomic():
+            EventIndex.objects.all().delete()
+            for queryset, build in sources:
+                batch = []
+                for obj in queryset.iterator(chunk_size=batch_size):
+                    batch.append(build(obj))
+                    if len(batch) >= batch_size:
+                        EventIndex.objects.bulk_create(batch)
+                        total += len(batch)
+                        batch = []
+                if batch:
+                    EventIndex.objects.bulk_create(batch)
+                    total += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} events."))
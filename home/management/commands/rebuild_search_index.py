@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from home.search import SEARCH_FIELDS, _rowid_column, create_search_index, drop_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Recreate the full-text search column (PostgreSQL) or FTS5 tables and "
+        "triggers (SQLite). Run after a migration that rebuilds one of the "
+        "searched tables on SQLite, since the rebuild drops its triggers."
+    )
+
+    def handle(self, *args, **options):
+        with connection.schema_editor() as editor:
+            for model, fields in SEARCH_FIELDS.items():
+                table = model._meta.db_table
+                drop_search_index(editor, table)
+                create_search_index(editor, table, fields, _rowid_column(model))
+                self.stdout.write(f"Rebuilt search index for {table}.")
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from signup.outbox import MAX_ATTEMPTS, send_queued
+
+
+class Command(BaseCommand):
+    help = "Deliver queued OutgoingEmail messages in batches over one SMTP connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=50,
+            help="Messages sent per connection (default: 50).",
+        )
+        parser.add_argument(
+            "--max-attempts", type=int, default=MAX_ATTEMPTS,
+            help=f"Tries before a message is marked failed (default: {MAX_ATTEMPTS}).",
+        )
+        parser.add_argument(
+            "--loop", action="store_true",
+            help="Keep polling the queue instead of exiting once it is drained.",
+        )
+        parser.add_argument(
+            "--interval", type=float, default=5.0,
+            help="Seconds to sleep between polls of an empty queue with --loop (default: 5).",
+        )
+
+    def handle(self, *args, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = send_queued(options["batch_size"], options["max_attempts"])
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed}.")
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS(f"Sent {total_sent} emails, {total_failed} failures."))
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.5 on 2026-10-17 19:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('department', '0002_alter_devent_fest_name'),
+        ('event', '0003_notice_department_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('club', 'Club'), ('department', 'Department')], max_length=10)),
+                ('source_id', models.BigIntegerField()),
+                ('event_name', models.CharField(max_length=25)),
+                ('event_start_date', models.DateField()),
+                ('event_end_date', models.DateField()),
+                ('event_venue', models.CharField(max_length=40)),
+                ('club_name', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='event.club')),
+                ('department_name', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='event.department')),
+                ('fest_name', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='department.fest')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['event_start_date'], name='eventindex_start_idx'), models.Index(fields=['department_name', 'event_start_date'], name='eventindex_dept_start_idx')],
+                'constraints': [models.UniqueConstraint(fields=('event_type', 'source_id'), name='eventindex_unique_source')],
+            },
+        ),
+    ]
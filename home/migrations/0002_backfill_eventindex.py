@@ -0,0 +1,45 @@
+from django.db import migrations
+
+
+def backfill(apps, schema_editor):
+    EventIndex = apps.get_model("home", "EventIndex")
+    Event = apps.get_model("event", "Event")
+    dEvent = apps.get_model("department", "dEvent")
+
+    rows = [
+        EventIndex(
+            event_type="club",
+            source_id=e.pk,
+            event_name=e.event_name,
+            event_start_date=e.event_start_date,
+            event_end_date=e.event_end_date,
+            event_venue=e.event_venue,
+            department_name_id=e.department_name_id,
+            club_name_id=e.club_name_id,
+        )
+        for e in Event.objects.iterator()
+    ] + [
+        EventIndex(
+            event_type="department",
+            source_id=d.pk,
+            event_name=d.event_name,
+            event_start_date=d.event_start_date,
+            event_end_date=d.event_end_date,
+            event_venue=d.event_venue,
+            department_name_id=d.department_name_id,
+            fest_name_id=d.fest_name_id,
+        )
+        for d in dEvent.objects.iterator()
+    ]
+    EventIndex.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("home", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
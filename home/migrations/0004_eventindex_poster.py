@@ -0,0 +1,49 @@
+# Generated by Django 5.1.5 on 2026-10-17 21:02
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+from home.search_schema import create_search_index, drop_search_index
+
+
+def backfill_posters(apps, schema_editor):
+    EventIndex = apps.get_model("home", "EventIndex")
+    for event_type, model in (("club", apps.get_model("event", "Event")),
+                              ("department", apps.get_model("department", "dEvent"))):
+        source = model.objects.filter(pk=OuterRef("source_id"))
+        EventIndex.objects.filter(event_type=event_type).update(
+            event_poster=Subquery(source.values("event_poster")[:1]),
+            poster_rendered=Subquery(source.values("poster_rendered")[:1]),
+        )
+
+
+def create_search(apps, schema_editor):
+    create_search_index(schema_editor, "home_eventindex", ["event_name", "event_venue"])
+
+
+def drop_search(apps, schema_editor):
+    drop_search_index(schema_editor, "home_eventindex")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0003_cache_table'),
+        ('event', '0010_poster_rendered'),
+        ('department', '0005_poster_rendered'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventindex',
+            name='event_poster',
+            field=models.ImageField(blank=True, upload_to='event_posters/'),
+        ),
+        migrations.AddField(
+            model_name='eventindex',
+            name='poster_rendered',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+        migrations.RunPython(backfill_posters, migrations.RunPython.noop),
+        migrations.RunPython(create_search, drop_search),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.5 on 2026-10-17 21:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('department', '0005_poster_rendered'),
+        ('event', '0011_report_started_at'),
+        ('home', '0004_eventindex_poster'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='eventindex',
+            index=models.Index(fields=['event_end_date', 'event_start_date'], name='eventindex_end_start_idx'),
+        ),
+    ]
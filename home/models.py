@@ -1,3 +1,97 @@
 from django.db import models
 
-# Create your models here.
+
+class EventIndex(models.Model):
+    """
+    Denormalized row per Event and dEvent so cross-type listings can be
+    filtered, ordered and paginated in one query. It carries everything the
+    home, search and calendar pages show, so they never read the source
+    tables. Kept in sync by ``home.signals``; rebuild with ``manage.py
+    rebuild_event_index``.
+    """
+    CLUB = 'club'
+    DEPARTMENT = 'department'
+    EVENT_TYPES = [
+        (CLUB, 'Club'),
+        (DEPARTMENT, 'Department'),
+    ]
+
+    event_type = models.CharField(max_length=10, choices=EVENT_TYPES)
+    source_id = models.BigIntegerField()
+    event_name = models.CharField(max_length=25)
+    event_start_date = models.DateField()
+    event_end_date = models.DateField()
+    event_venue = models.CharField(max_length=40)
+    department_name = models.ForeignKey('event.Department', on_delete=models.CASCADE)
+    club_name = models.ForeignKey('event.Club', null=True, blank=True, on_delete=models.CASCADE)
+    fest_name = models.ForeignKey('department.Fest', null=True, blank=True, on_delete=models.CASCADE)
+    event_poster = models.ImageField(upload_to='event_posters/', blank=True)
+    # Copied from the source row; event.posters.mark_rendered updates both.
+    poster_rendered = models.CharField(max_length=100, blank=True, default='', editable=False)
+
+    # Columns copied from the source row by ``sync``.
+    SYNCED_FIELDS = ['event_name', 'event_start_date', 'event_end_date', 'event_venue',
+                     'department_name_id', 'club_name_id', 'fest_name_id',
+                     'event_poster', 'poster_rendered']
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['event_type', 'source_id'], name='eventindex_unique_source'),
+        ]
+        indexes = [
+            models.Index(fields=['event_start_date'], name='eventindex_start_idx'),
+            models.Index(fields=['event_end_date', 'event_start_date'], name='eventindex_end_start_idx'),
+            models.Index(fields=['department_name', 'event_start_date'], name='eventindex_dept_start_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.event_name} ({self.get_event_type_display()})"
+
+    @classmethod
+    def from_event(cls, event):
+        return cls(
+            event_type=cls.CLUB,
+            source_id=event.pk,
+            event_name=event.event_name,
+            event_start_date=event.event_start_date,
+            event_end_date=event.event_end_date,
+            event_venue=event.event_venue,
+            department_name_id=event.department_name_id,
+            club_name_id=event.club_name_id,
+            event_poster=event.event_poster.name,
+            poster_rendered=event.poster_rendered,
+        )
+
+    @classmethod
+    def from_devent(cls, devent):
+        return cls(
+            event_type=cls.DEPARTMENT,
+            source_id=devent.pk,
+            event_name=devent.event_name,
+            event_start_date=devent.event_start_date,
+            event_end_date=devent.event_end_date,
+            event_venue=devent.event_venue,
+            department_name_id=devent.department_name_id,
+            fest_name_id=devent.fest_name_id,
+            event_poster=devent.event_poster.name,
+            poster_rendered=devent.poster_rendered,
+        )
+
+    @classmethod
+    def sync(cls, instance):
+        """Insert or refresh the index row for an Event or dEvent."""
+        from event.models import Event
+
+        row = cls.from_event(instance) if isinstance(instance, Event) else cls.from_devent(instance)
+        cls.objects.update_or_create(
+            event_type=row.event_type,
+            source_id=row.source_id,
+            defaults={name: getattr(row, name) for name in cls.SYNCED_FIELDS},
+        )
+
+    @classmethod
+    def remove(cls, instance):
+        from event.models import Event
+
+        event_type = cls.CLUB if isinstance(instance, Event) else cls.DEPARTMENT
+        cls.objects.filter(event_type=event_type, source_id=instance.pk).delete()
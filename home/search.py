@@ -0,0 +1,198 @@
+"""
+Pluggable full-text search over Event, dEvent, Notice, Club and EventIndex.
+
+Each backend takes a queryset and a user query and returns the matching rows
+annotated with ``search_rank`` (higher is better), so callers can keep
+filtering, order by rank and paginate in the database:
+
+* ``PostgresSearchBackend`` matches against a stored, GIN-indexed
+  ``search_vector`` tsvector column.
+* ``SQLiteSearchBackend`` matches against an external-content FTS5 table
+  kept in sync by triggers.
+* ``ContainsSearchBackend`` falls back to ``icontains`` for other databases.
+
+The column and FTS5 table are created by the ``search_index`` migrations in
+the event and department apps, from the frozen SQL in ``home.search_schema``.
+Set ``SEARCH_BACKEND`` to a dotted path to force a backend; by default it is
+picked from the database vendor.
+"""
+import re
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from event.models import Club, Event, Notice
+from department.models import dEvent
+from .models import EventIndex
+
+# Searchable columns per model; the first column carries the most weight.
+SEARCH_FIELDS = {
+    Event: ("event_name", "event_venue"),
+    dEvent: ("event_name", "event_venue"),
+    Notice: ("title", "description"),
+    Club: ("club_name", "club_description"),
+    EventIndex: ("event_name", "event_venue"),
+}
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_tokens(query: str):
+    """Split user input into plain word tokens, dropping query syntax."""
+    return _TOKEN_RE.findall(query or "")[:16]
+
+
+def _fts_table(model) -> str:
+    return f"{model._meta.db_table}_fts"
+
+
+def _rowid_column(model) -> str:
+    # Club is keyed by its name, so FTS5 maps rows through SQLite's rowid.
+    pk = model._meta.pk
+    return pk.column if pk.get_internal_type() in ("AutoField", "BigAutoField") else "rowid"
+
+
+class BaseSearchBackend:
+    def search(self, queryset, query: str):
+        raise NotImplementedError
+
+    def no_match(self, queryset):
+        # Annotated like a result so callers can still order by rank.
+        return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class ContainsSearchBackend(BaseSearchBackend):
+    """``icontains`` matching; name hits rank above other column hits."""
+
+    def search(self, queryset, query):
+        tokens = search_tokens(query)
+        if not tokens:
+            return self.no_match(queryset)
+        fields = SEARCH_FIELDS[queryset.model]
+        for token in tokens:
+            queryset = queryset.filter(reduce(or_, (Q(**{f"{f}__icontains": token}) for f in fields)))
+        return queryset.annotate(
+            search_rank=Case(
+                When(**{f"{fields[0]}__icontains": tokens[0]}, then=Value(2.0)),
+                default=Value(1.0),
+                output_field=FloatField(),
+            )
+        )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    def search(self, queryset, query):
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+
+        tokens = search_tokens(query)
+        if not tokens:
+            return self.no_match(queryset)
+        # Prefix-match every token so results update while typing.
+        ts_query = SearchQuery(" & ".join(f"{t}:*" for t in tokens), config="english", search_type="raw")
+        table = queryset.model._meta.db_table
+        vector = RawSQL(f'"{table}"."search_vector"', [], output_field=SearchVectorField())
+        return (
+            queryset.alias(search_vector=vector)
+            .filter(search_vector=ts_query)
+            .annotate(search_rank=SearchRank(vector, ts_query))
+        )
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    def search(self, queryset, query):
+        tokens = search_tokens(query)
+        if not tokens:
+            return self.no_match(queryset)
+        match = " ".join('"{}"*'.format(t) for t in tokens)
+        model = queryset.model
+        table = model._meta.db_table
+        fts = _fts_table(model)
+        rowid_col = _rowid_column(model)
+        weights = ", ".join(["10.0"] + ["1.0"] * (len(SEARCH_FIELDS[model]) - 1))
+
+        matched_sql = f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s"
+        if rowid_col == "rowid":
+            matched_sql = f'SELECT "{model._meta.pk.column}" FROM "{table}" WHERE rowid IN ({matched_sql})'
+        rank = RawSQL(
+            f'SELECT -bm25({fts}, {weights}) FROM {fts} '
+            f'WHERE {fts} MATCH %s AND {fts}.rowid = "{table}"."{rowid_col}"',
+            (match,),
+            output_field=FloatField(),
+        )
+        return queryset.filter(pk__in=RawSQL(matched_sql, (match,))).annotate(search_rank=rank)
+
+
+_VENDOR_BACKENDS = {
+    "postgresql": "home.search.PostgresSearchBackend",
+    "sqlite": "home.search.SQLiteSearchBackend",
+}
+
+
+def get_search_backend() -> BaseSearchBackend:
+    path = getattr(settings, "SEARCH_BACKEND", "") or _VENDOR_BACKENDS.get(
+        connection.vendor, "home.search.ContainsSearchBackend"
+    )
+    return import_string(path)()
+
+
+def search(queryset, query: str):
+    """Rows of ``queryset`` matching ``query``, best match first."""
+    return get_search_backend().search(queryset, query).order_by("-search_rank", "-pk")
+
+
+# ---------------------------------------------------------------------------
+# Schema helpers for manage.py rebuild_search_index (migrations use the
+# frozen copies in home.search_schema)
+# ---------------------------------------------------------------------------
+
+def create_search_index(schema_editor, table: str, columns, rowid: str = "id") -> None:
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        parts = [
+            f"setweight(to_tsvector('english', coalesce({col}, '')), '{'A' if i == 0 else 'B'}')"
+            for i, col in enumerate(columns)
+        ]
+        schema_editor.execute(
+            f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({' || '.join(parts)}) STORED"
+        )
+        schema_editor.execute(f"CREATE INDEX {table}_search_idx ON {table} USING GIN (search_vector)")
+    elif vendor == "sqlite":
+        fts = f"{table}_fts"
+        cols = ", ".join(columns)
+        new_vals = ", ".join(f"new.{c}" for c in columns)
+        old_vals = ", ".join(f"old.{c}" for c in columns)
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table}', content_rowid='{rowid}')"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.{rowid}, {new_vals}); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{rowid}, {old_vals}); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {fts}_au AFTER UPDATE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{rowid}, {old_vals}); "
+            f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.{rowid}, {new_vals}); END"
+        )
+        schema_editor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def drop_search_index(schema_editor, table: str) -> None:
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_search_idx")
+        schema_editor.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+    elif vendor == "sqlite":
+        fts = f"{table}_fts"
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {fts}")
@@ -0,0 +1,71 @@
+"""
+Frozen SQL for the full-text search schema, for migrations only.
+
+Migrations run long after they are written, so they must not import code
+that keeps changing, such as ``home.search`` (which also loads the models).
+This module imports nothing from the project. Never change what an existing
+function emits: add a new function for a new schema and use it from new
+migrations. ``manage.py rebuild_search_index`` uses the live helpers in
+``home.search`` instead.
+"""
+
+
+def create_search_index(schema_editor, table: str, columns, rowid: str = "id") -> None:
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        parts = [
+            f"setweight(to_tsvector('english', coalesce({col}, '')), '{'A' if i == 0 else 'B'}')"
+            for i, col in enumerate(columns)
+        ]
+        schema_editor.execute(
+            f"ALTER TABLE {table} ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS ({' || '.join(parts)}) STORED"
+        )
+        schema_editor.execute(f"CREATE INDEX {table}_search_idx ON {table} USING GIN (search_vector)")
+    elif vendor == "sqlite":
+        fts = f"{table}_fts"
+        cols = ", ".join(columns)
+        new_vals = ", ".join(f"new.{c}" for c in columns)
+        old_vals = ", ".join(f"old.{c}" for c in columns)
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{table}', content_rowid='{rowid}')"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.{rowid}, {new_vals}); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{rowid}, {old_vals}); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {fts}_au AFTER UPDATE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.{rowid}, {old_vals}); "
+            f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.{rowid}, {new_vals}); END"
+        )
+        schema_editor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def drop_search_index(schema_editor, table: str) -> None:
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table}_search_idx")
+        schema_editor.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector")
+    elif vendor == "sqlite":
+        fts = f"{table}_fts"
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {fts}")
+
+
+def restore_search_index(schema_editor, table: str, columns, rowid: str = "id") -> None:
+    """
+    Recreate a SQLite FTS5 index after a migration remade ``table``.
+
+    SQLite applies most ``AddField``/``AlterField`` operations by copying the
+    table, which drops its triggers and can renumber rowids; PostgreSQL keeps
+    the generated column, so this is a no-op there.
+    """
+    if schema_editor.connection.vendor == "sqlite":
+        drop_search_index(schema_editor, table)
+        create_search_index(schema_editor, table, columns, rowid)
@@ -0,0 +1,48 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from event.models import Event
+from event.signals import bulk_created
+from department.models import dEvent
+from .calendar_grid import invalidate_months
+from .models import EventIndex
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=dEvent)
+def invalidate_calendar_on_save(sender, instance, **kwargs):
+    invalidate_months(instance.event_start_date, instance.event_end_date)
+    # event.signals stashes the stored row before an update.
+    previous = getattr(instance, "_previous_state", None)
+    if previous:
+        invalidate_months(previous["event_start_date"], previous["event_end_date"])
+
+
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=dEvent)
+def invalidate_calendar_on_delete(sender, instance, **kwargs):
+    invalidate_months(instance.event_start_date, instance.event_end_date)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=dEvent)
+def sync_event_index(sender, instance, **kwargs):
+    EventIndex.sync(instance)
+
+
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=dEvent)
+def remove_from_event_index(sender, instance, **kwargs):
+    EventIndex.remove(instance)
+
+
+@receiver(bulk_created, sender=Event)
+@receiver(bulk_created, sender=dEvent)
+def index_bulk_created_events(sender, instances, **kwargs):
+    build = EventIndex.from_event if sender is Event else EventIndex.from_devent
+    EventIndex.objects.bulk_create([build(instance) for instance in instances])
+    if instances:
+        invalidate_months(
+            min(instance.event_start_date for instance in instances),
+            max(instance.event_end_date for instance in instances),
+        )
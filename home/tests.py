@@ -1,3 +1,381 @@
-from django.test import TestCase
+import json
+import shutil
+import tempfile
+from datetime import date
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.module_loading import import_string
+
+from department.models import Fest, dEvent
+from event.models import Club, Department, Event, Notice
+from home.calendar_grid import build_month_grid, get_month_grid, month_cache_key
+from home import search as search_index
+from home.models import EventIndex
+
+SMALL_DATASET = {
+    "departments": 4, "clubs": 10, "fests": 3, "events": 60,
+    "department_events": 30, "notices": 20, "seed": 7, "anchor": date(2025, 3, 1),
+}
+
+
+def generate(**options):
+    call_command("generate_synthetic_data", stdout=StringIO(), **{**SMALL_DATASET, **options})
+
+
+@override_settings(STORAGES={
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+})
+class SyntheticDataTests(TestCase):
+    def test_generates_requested_counts_and_index(self):
+        generate()
+        self.assertEqual(Department.objects.count(), 4)
+        self.assertEqual(Club.objects.count(), 10)
+        self.assertEqual(Fest.objects.count(), 3)
+        self.assertEqual(Event.objects.count(), 60)
+        self.assertEqual(dEvent.objects.count(), 30)
+        self.assertEqual(Notice.objects.count(), 20)
+        self.assertEqual(EventIndex.objects.count(), 90)
+        for event in dEvent.objects.exclude(fest_name=None).select_related("fest_name"):
+            self.assertEqual(event.department_name_id, event.fest_name.department_name_id)
+            self.assertGreaterEqual(event.event_start_date, event.fest_name.event_start_date)
+
+    def test_same_seed_same_data(self):
+        generate()
+        first = list(Event.objects.order_by("pk").values_list("event_name", "event_start_date", "club_name"))
+        Department.objects.all().delete()
+        generate()
+        second = list(Event.objects.order_by("pk").values_list("event_name", "event_start_date", "club_name"))
+        self.assertEqual(first, second)
+
+    def test_refuses_to_run_twice(self):
+        generate()
+        with self.assertRaises(CommandError):
+            generate()
+
+    def test_benchmark_writes_results(self):
+        generate()
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / "run.json"
+            call_command(
+                "benchmark", iterations=2, warmup=1, concurrency=0,
+                output=output, stdout=StringIO(),
+            )
+            data = json.loads(output.read_text())
+        self.assertEqual(data["meta"]["rows"]["Event"], 60)
+        self.assertEqual(
+            set(data["results"]),
+            {"home", "calendar", "search", "admin_dashboard", "api_events", "api_stats"},
+        )
+        for result in data["results"].values():
+            self.assertEqual(result["status"], 200, result["url"])
+            self.assertLessEqual(result["p50_ms"], result["max_ms"])
+
+    def test_coldstart_profile_parses_importtime(self):
+        from home.management.commands.coldstart_profile import _importtime
+
+        stderr = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     rest_framework.compat",
+            "import time:       300 |        420 |   rest_framework.views",
+            "import time:        80 |        500 | api.views",
+            "2025-01-01 [DEBUG] not an import line",
+        ])
+        self.assertEqual(_importtime(stderr), [
+            (2, "rest_framework.compat", 120, 120),
+            (1, "rest_framework.views", 300, 420),
+            (0, "api.views", 80, 500),
+        ])
+
+
+@override_settings(STORAGES={
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+})
+class AsyncPageTests(TestCase):
+    """The async read views, served through the ASGI handler."""
+
+    def setUp(self):
+        generate()
+
+    async def test_pages_render_and_count_queries(self):
+        for url in ("/home/", "/home/calendar/?month=3&year=2025", "/home/search/?q=workshop&page=1"):
+            response = await self.async_client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertRegex(response["Server-Timing"], r'desc="[1-9]\d* queries"', url)
+
+    async def test_search_pages_match_sync_paginator(self):
+        response = await self.async_client.get("/home/search/?q=workshop")
+        page = response.context["club_events"]
+        expected = await Event.objects.filter(event_name__icontains="workshop").acount()
+        self.assertEqual(page.paginator.count, expected)
+        self.assertEqual(len(page), min(expected, 12))
+
+        response = await self.async_client.get("/home/search/?q=workshop&page=999")
+        self.assertEqual(response.context["club_events"], [])
+        self.assertFalse(response.context["has_next_page"])
+
+    async def test_calendar_grid_matches_sync_build(self):
+        response = await self.async_client.get("/home/calendar/?month=3&year=2025")
+        weeks = await sync_to_async(build_month_grid)(2025, 3)
+        self.assertEqual(response.context["weeks"], weeks)
+
+
+class CalendarGridTests(TestCase):
+    def setUp(self):
+        dept = Department.objects.create(department_name="CS", password="x", department_description="d")
+        club = Club.objects.create(club_name="GDSC", department_name=dept, club_description="c")
+        self.event = Event.objects.create(
+            event_name="Hackathon", event_start_date=date(2025, 1, 31), event_end_date=date(2025, 2, 4),
+            event_time="10:00", department_name=dept, club_name=club, event_venue="Hall",
+        )
+
+    def days_with(self, weeks, name):
+        return [
+            day["date"] for week in weeks for day in week
+            if any(entry["name"] == name for entry in day["events"])
+        ]
+
+    def test_multi_day_event_spans_weeks_and_months(self):
+        # Friday 31 January to Tuesday 4 February crosses a week and a month.
+        january, february = build_month_grid(2025, 1), build_month_grid(2025, 2)
+        self.assertEqual(self.days_with(january, "Hackathon"), [date(2025, 1, 31)])
+        self.assertEqual(
+            self.days_with(february, "Hackathon"),
+            [date(2025, 2, 1), date(2025, 2, 2), date(2025, 2, 3), date(2025, 2, 4)],
+        )
+        week_of_first = next(i for i, week in enumerate(february) if week[5]["day"] == 1)
+        self.assertEqual(self.days_with(february[week_of_first + 1:week_of_first + 2], "Hackathon"),
+                         [date(2025, 2, 3), date(2025, 2, 4)])
+
+    def test_moving_an_event_invalidates_old_and_new_months(self):
+        for month in (1, 2, 3, 4):
+            get_month_grid(2025, month)
+        self.event.event_start_date = date(2025, 3, 30)
+        self.event.event_end_date = date(2025, 4, 2)
+        self.event.save()
+
+        for month in (1, 2, 3, 4):
+            self.assertIsNone(cache.get(month_cache_key(2025, month)), month)
+        self.assertEqual(self.days_with(get_month_grid(2025, 1), "Hackathon"), [])
+        self.assertEqual(self.days_with(get_month_grid(2025, 2), "Hackathon"), [])
+        self.assertEqual(self.days_with(get_month_grid(2025, 3), "Hackathon"), [date(2025, 3, 30), date(2025, 3, 31)])
+        self.assertEqual(self.days_with(get_month_grid(2025, 4), "Hackathon"), [date(2025, 4, 1), date(2025, 4, 2)])
+
+
+@override_settings(STORAGES={
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+})
+class EventIndexTests(TestCase):
+    """EventIndex follows its sources, and the pages read it instead of them."""
+
+    def setUp(self):
+        generate()
+
+    def index_row(self, event):
+        event_type = EventIndex.CLUB if isinstance(event, Event) else EventIndex.DEPARTMENT
+        return EventIndex.objects.get(event_type=event_type, source_id=event.pk)
+
+    def test_follows_saves_and_deletes(self):
+        event = Event.objects.first()
+        event.event_name = "Renamed workshop"
+        event.event_end_date = event.event_start_date
+        event.save()
+        row = self.index_row(event)
+        self.assertEqual(row.event_name, "Renamed workshop")
+        self.assertEqual(row.event_end_date, event.event_start_date)
+
+        d_event = dEvent.objects.first()
+        event.delete()
+        d_event.delete()
+        self.assertFalse(EventIndex.objects.filter(event_type=EventIndex.CLUB, source_id=event.pk).exists())
+        self.assertFalse(EventIndex.objects.filter(event_type=EventIndex.DEPARTMENT, source_id=d_event.pk).exists())
+        self.assertEqual(EventIndex.objects.count(), 88)
+
+    def test_follows_club_and_department_moves(self):
+        event = Event.objects.first()
+        club = Club.objects.exclude(pk=event.club_name_id).first()
+        event.club_name = club
+        event.department_name = club.department_name
+        event.save()
+        row = self.index_row(event)
+        self.assertEqual(row.club_name_id, club.pk)
+        self.assertEqual(row.department_name_id, club.department_name_id)
+
+        d_event = dEvent.objects.first()
+        department = Department.objects.exclude(pk=d_event.department_name_id).first()
+        d_event.department_name = department
+        d_event.fest_name = None
+        d_event.save()
+        row = self.index_row(d_event)
+        self.assertEqual(row.department_name_id, department.pk)
+        self.assertIsNone(row.fest_name_id)
+
+    def test_pages_read_the_index(self):
+        for url in ("/home/", "/home/calendar/?month=3&year=2025", "/home/search/?q=workshop",
+                    f"/home/search/?department={Department.objects.first().pk}"):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            sql = " ".join(query["sql"] for query in queries)
+            self.assertIn("home_eventindex", sql, url)
+            self.assertNotIn('"event_event"', sql, url)
+            self.assertNotIn('"department_devent"', sql, url)
+
+    def test_home_avoids_sliced_subqueries(self):
+        # MySQL rejects LIMIT inside IN (SELECT ...).
+        with CaptureQueriesContext(connection) as queries, \
+                mock.patch("home.views.localdate", return_value=SMALL_DATASET["anchor"]):
+            response = self.client.get("/home/")
+        self.assertEqual(len(response.context["events"]), 5)
+        self.assertEqual(len(response.context["d_events"]), 5)
+        for query in queries:
+            self.assertNotRegex(query["sql"], r"IN \(SELECT.*LIMIT")
+        dates = [row.event_start_date for row in response.context["events"]]
+        self.assertEqual(dates, sorted(dates))
+        self.assertGreaterEqual(dates[0], SMALL_DATASET["anchor"])
+
+    def test_search_counts_both_types_in_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/home/search/?q=workshop")
+        counts = [query for query in queries if "COUNT(" in query["sql"] and "home_eventindex" in query["sql"]]
+        self.assertEqual(len(counts), 1)
+
+
+@override_settings(STORAGES={
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+})
+class SearchBackendTests(TestCase):
+    def setUp(self):
+        dept = Department.objects.create(department_name="CS", password="x", department_description="d")
+        for name, venue in [("Quiz night", "Robotics lab"), ("Robotics workshop", "Main hall"), ("Chess", "Library")]:
+            Event.objects.create(
+                event_name=name, event_start_date=date(2025, 3, 1), event_end_date=date(2025, 3, 1),
+                event_time="10:00", department_name=dept, event_venue=venue,
+            )
+
+    def backends(self):
+        vendor = search_index._VENDOR_BACKENDS.get(connection.vendor)
+        return [path for path in (vendor, "home.search.ContainsSearchBackend") if path]
+
+    def test_backend_follows_setting_then_vendor(self):
+        expected = search_index._VENDOR_BACKENDS.get(connection.vendor, "home.search.ContainsSearchBackend")
+        with override_settings(SEARCH_BACKEND=""):
+            self.assertEqual(type(search_index.get_search_backend()), import_string(expected))
+        with override_settings(SEARCH_BACKEND="home.search.ContainsSearchBackend"):
+            self.assertIsInstance(search_index.get_search_backend(), search_index.ContainsSearchBackend)
+
+    def test_name_hits_rank_above_venue_hits(self):
+        for path in self.backends():
+            with self.subTest(backend=path), override_settings(SEARCH_BACKEND=path):
+                for queryset in (Event.objects.all(), EventIndex.objects.all()):
+                    names = [row.event_name for row in search_index.search(queryset, "robot")]
+                    self.assertEqual(names, ["Robotics workshop", "Quiz night"])
+
+    def test_every_token_must_match_and_syntax_is_ignored(self):
+        for path in self.backends():
+            with self.subTest(backend=path), override_settings(SEARCH_BACKEND=path):
+                names = [row.event_name for row in search_index.search(Event.objects.all(), 'robotics "lab" chess*')]
+                self.assertEqual(names, [])
+                names = [row.event_name for row in search_index.search(Event.objects.all(), 'quiz" (robotics')]
+                self.assertEqual(names, ["Quiz night"])
+                self.assertFalse(search_index.search(Event.objects.all(), "  ** ").exists())
+                self.assertEqual(self.client.get("/home/search/?q=**").status_code, 200)
+
+
+VITE_MANIFEST = {
+    "index.html": {
+        "file": "assets/index-B7xk2Qa1.js", "src": "index.html", "isEntry": True,
+        "imports": ["_react-vendor-Cq9dLx3e.js"], "css": ["assets/index-D4fRt0Lm.css"],
+        "dynamicImports": ["_reports-Ee81jKw2.js"],
+    },
+    "_react-vendor-Cq9dLx3e.js": {"file": "assets/react-vendor-Cq9dLx3e.js"},
+    "_reports-Ee81jKw2.js": {"file": "assets/reports-Ee81jKw2.js", "imports": ["_react-vendor-Cq9dLx3e.js"]},
+}
+
+
+class FrontendTests(TestCase):
+    """The Vite bundle through collectstatic, WhiteNoise and the index view."""
+
+    def setUp(self):
+        root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, root)
+        self.dist, site, self.static_root = root / "dist", root / "site", root / "collected"
+        (self.dist / ".vite").mkdir(parents=True)
+        (self.dist / "assets").mkdir()
+        (self.dist / ".vite" / "manifest.json").write_text(json.dumps(VITE_MANIFEST))
+        for chunk in VITE_MANIFEST.values():
+            (self.dist / chunk["file"]).write_text("export const x = 1;\n" * 200)
+        (self.dist / "assets" / "index-D4fRt0Lm.css").write_text("body { margin: 0; }\n" * 200)
+        site.mkdir()
+        (site / "site.css").write_text("p { color: red; }\n")
+
+        overrides = override_settings(
+            STATICFILES_DIRS=[str(site), ("app", str(self.dist))],
+            STATICFILES_FINDERS=["django.contrib.staticfiles.finders.FileSystemFinder"],
+            STATIC_ROOT=str(self.static_root),
+            FRONTEND_MANIFEST=str(self.dist / ".vite" / "manifest.json"),
+            STORAGES={
+                "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+                "staticfiles": {"BACKEND": "clue.staticfiles.StaticFilesStorage"},
+            },
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        call_command("collectstatic", interactive=False, verbosity=0)
+
+    def test_collectstatic_keeps_vite_names_and_precompresses(self):
+        assets = self.static_root / "app" / "assets"
+        for suffix in ("", ".gz", ".br"):
+            self.assertTrue((assets / f"index-B7xk2Qa1.js{suffix}").exists(), suffix)
+        self.assertEqual(len(list(assets.glob("index-B7xk2Qa1.*.js"))), 0)
+        self.assertFalse((self.static_root / "app" / ".vite").exists())
+        paths = json.loads((self.static_root / "staticfiles.json").read_text())["paths"]
+        self.assertEqual(paths["app/assets/index-B7xk2Qa1.js"], "app/assets/index-B7xk2Qa1.js")
+        self.assertRegex(paths["site.css"], r"^site\.[0-9a-f]{12}\.css$")
+
+    def test_bundle_is_served_immutable_and_precompressed(self):
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+        from clue.middleware import WhiteNoiseMiddleware
+
+        middleware = WhiteNoiseMiddleware(lambda request: HttpResponse())
+        request = RequestFactory().get("/static/app/assets/index-B7xk2Qa1.js", HTTP_ACCEPT_ENCODING="gzip, br")
+        response = middleware(request)
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertIn("immutable", response["Cache-Control"])
+
+        response = middleware(RequestFactory().get("/static/app/.vite/manifest.json"))
+        self.assertNotIn("immutable", response.get("Cache-Control", ""))
+
+    def test_index_preloads_entry_chunks_and_revalidates(self):
+        response = self.client.get("/app/events/12")
+        self.assertEqual(response.status_code, 200)
+        html = response.content.decode()
+        self.assertIn('<script type="module" src="/static/app/assets/index-B7xk2Qa1.js">', html)
+        self.assertIn('<link rel="stylesheet" href="/static/app/assets/index-D4fRt0Lm.css">', html)
+        self.assertIn('<link rel="modulepreload" href="/static/app/assets/react-vendor-Cq9dLx3e.js">', html)
+        self.assertNotIn("reports-Ee81jKw2.js", html)
+        self.assertIn("</static/app/assets/react-vendor-Cq9dLx3e.js>; rel=modulepreload", response["Link"])
+
+        response = self.client.get("/app/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_index_is_404_before_a_build(self):
+        (self.dist / ".vite" / "manifest.json").unlink()
+        with override_settings(STORAGES={
+            "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+            "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+        }):
+            self.assertEqual(self.client.get("/app/").status_code, 404)
@@ -1,28 +1,86 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect
-from django.utils.timezone import now
+from django.utils.timezone import localdate, now
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.models import User
 from django.urls import reverse
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from datetime import date
-import calendar
 
 from event.models import Event, Notice, Department, Club
+from event.versions import conditional_response, last_changed, make_etag, set_validators
 from department.models import dEvent
+from .calendar_grid import aget_month_grid
+from .models import EventIndex
+from . import search as search_index
+
+SEARCH_PAGE_SIZE = 12
+HOME_EVENTS = 5
 
 
 # -----------------------------
 # 🏠 Home Page View
 # -----------------------------
-def home(request):
-    events = Event.objects.filter(event_start_date__gte=now()).order_by('event_start_date')[:5]
-    d_events = dEvent.objects.filter(event_start_date__gte=now()).order_by('event_start_date')[:5]
-    notices = Notice.objects.all().order_by('-date_posted')[:5]
+# The home, calendar and search pages are async views. Under ASGI a worker
+# keeps serving other requests while theirs wait on the database; under WSGI
+# Django runs them in an event loop per request. Their independent queries
+# are issued together with asyncio.gather, and templates are rendered in a
+# worker thread since rendering may still touch the ORM (request.user,
+# related fields).
+
+async def _alist(queryset):
+    return [row async for row in queryset]
+
+
+def _viewer_state(request):
+    # Loads the session and user in the thread the template render will use,
+    # so both are read once per request.
+    viewer = (request.user.pk, request.session.get('coordinator_name'))
+    return viewer, bool(len(get_messages(request)))
+
+
+def _upcoming(today, event_type, count):
+    """The next ``count`` events of ``event_type``, from EventIndex."""
+    return EventIndex.objects.filter(
+        event_type=event_type, event_start_date__gte=today,
+    ).order_by('event_start_date', 'source_id')[:count]
+
+
+async def home(request):
+    # The page embeds the visitor's name and any flash messages, so the ETag
+    # covers who is asking and pages showing messages are never validated.
+    # No Last-Modified: a login changes the page without changing any stamp.
+    (viewer, has_messages), changed = await asyncio.gather(
+        sync_to_async(_viewer_state)(request),
+        sync_to_async(last_changed)(Event, dEvent, Notice),
+    )
+    etag = make_etag(changed.isoformat(), now().date(), viewer)
+    if not has_messages:
+        not_modified = conditional_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+    # Two sliced queries rather than one with sliced IN subqueries, which
+    # MySQL does not support.
+    today = localdate()
+    events, d_events, notices = await asyncio.gather(
+        _alist(_upcoming(today, EventIndex.CLUB, HOME_EVENTS)),
+        _alist(_upcoming(today, EventIndex.DEPARTMENT, HOME_EVENTS)),
+        _alist(Notice.objects.all().order_by('-date_posted')[:5]),
+    )
 
-    return render(request, 'index.html', {
+    response = await sync_to_async(render)(request, 'index.html', {
         'events': events,
         'd_events': d_events,
         'notices': notices
     })
+    return response if has_messages else set_validators(response, etag)
 
 
 # -----------------------------
@@ -53,7 +111,7 @@ def dept_page(request):
 # -----------------------------
 # 🗓️ Calendar View
 # -----------------------------
-def calendar_view(request):
+async def calendar_view(request):
     today = date.today()
     month = request.GET.get("month")
     year = request.GET.get("year")
@@ -75,33 +133,7 @@ def calendar_view(request):
     ]
     month_name = month_names[month - 1]
 
-    cal = calendar.Calendar()
-    month_days = cal.monthdatescalendar(year, month)
-
-    weeks = []
-    for week in month_days:
-        week_data = []
-        for day in week:
-            if day.month == month:
-                events = Event.objects.filter(event_start_date=day).values("event_name", "id", "club_name")
-                devents = dEvent.objects.filter(event_start_date=day).values("event_name", "id", "department_name")
-
-                all_events = [
-                    {"name": e["event_name"], "type": "Club", "id": e["id"], "club_name": e["club_name"]}
-                    for e in events
-                ] + [
-                    {"name": d["event_name"], "type": "Department", "id": d["id"], "department_name": d["department_name"]}
-                    for d in devents
-                ]
-
-                week_data.append({
-                    "date": day,
-                    "day": day.day,
-                    "events": all_events
-                })
-            else:
-                week_data.append({"date": day, "day": 0, "events": []})
-        weeks.append(week_data)
+    weeks = await aget_month_grid(year, month)
 
     context = {
         "weeks": weeks,
@@ -113,87 +145,198 @@ def calendar_view(request):
         "next_month": next_month,
         "next_year": next_year
     }
-    return render(request, "calender.html", context)
+    return await sync_to_async(render)(request, "calender.html", context)
 
 
 # -----------------------------
 # 🔍 Search Functionality
 # -----------------------------
-def search(request):
+def _paginator(count):
+    paginator = Paginator([], SEARCH_PAGE_SIZE)
+    paginator.count = count
+    return paginator
+
+
+async def _apage(queryset, number):
+    """Page ``number`` of ``queryset``, or [] past the last page."""
+    # Setting the cached count keeps the paginator from counting synchronously.
+    paginator = _paginator(await queryset.acount())
+    if number > paginator.num_pages:
+        return []
+    bottom = (number - 1) * SEARCH_PAGE_SIZE
+    objects = await _alist(queryset[bottom:bottom + SEARCH_PAGE_SIZE])
+    return Page(objects, number, paginator)
+
+
+# Ordering of the event sections, with and without a text query.
+SEARCH_RANK_ORDERING = ('-search_rank', '-source_id')
+SEARCH_DATE_ORDERING = ('-event_start_date', '-source_id')
+
+
+def _on_date(events, day):
+    """``events`` running on ``day``."""
+    return events.filter(event_start_date__lte=day, event_end_date__gte=day)
+
+
+def _event_section(events, event_type, ordering, number):
+    """The rows of page ``number`` of one event section."""
+    bottom = (number - 1) * SEARCH_PAGE_SIZE
+    return events.filter(event_type=event_type).order_by(*ordering)[bottom:bottom + SEARCH_PAGE_SIZE]
+
+
+async def _aevent_pages(events, ordering, number):
+    """
+    Page ``number`` of the club and of the department events in ``events``
+    (EventIndex rows), as ``{event_type: Page or []}``. Both sections are
+    counted in one query.
+    """
+    counts, *sections = await asyncio.gather(
+        events.order_by().aaggregate(**{
+            event_type: Count('pk', filter=Q(event_type=event_type))
+            for event_type, _label in EventIndex.EVENT_TYPES
+        }),
+        *(
+            _alist(_event_section(events, event_type, ordering, number))
+            for event_type, _label in EventIndex.EVENT_TYPES
+        ),
+    )
+    pages = {}
+    for (event_type, _label), rows in zip(EventIndex.EVENT_TYPES, sections):
+        paginator = _paginator(counts[event_type])
+        pages[event_type] = [] if number > paginator.num_pages else Page(rows, number, paginator)
+    return pages
+
+
+async def search(request):
     query = request.GET.get('q', '').strip()
     date_str = request.GET.get('date', '').strip()
     department = request.GET.get('department', '').strip()
     event_type = request.GET.get('type', '').strip()
 
-    club_events = Event.objects.all()
-    dept_events = dEvent.objects.all()
+    # Club and department events are both read from EventIndex.
+    events = EventIndex.objects.all()
+    notices = Notice.objects.none()
+    clubs = Club.objects.none()
 
     if query:
-        club_events = club_events.filter(event_name__icontains=query)
-        dept_events = dept_events.filter(event_name__icontains=query)
+        events = search_index.get_search_backend().search(events, query)
+        ordering = SEARCH_RANK_ORDERING
+        # Notices and clubs are only listed for text searches.
+        if not event_type and not date_str:
+            notices = search_index.search(Notice.objects.all(), query)
+            clubs = search_index.search(Club.objects.all(), query)
+    else:
+        ordering = SEARCH_DATE_ORDERING
 
     if date_str:
         try:
             from datetime import datetime
             filter_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-            club_events = club_events.filter(event_start_date__lte=filter_date, event_end_date__gte=filter_date)
-            dept_events = dept_events.filter(event_start_date__lte=filter_date, event_end_date__gte=filter_date)
+            events = _on_date(events, filter_date)
         except ValueError:
             pass
 
     if department:
-        club_events = club_events.filter(department_name__department_name__iexact=department)
-        dept_events = dept_events.filter(department_name__department_name__iexact=department)
+        # Department is keyed by its name, so EventIndex needs no join.
+        events = events.filter(
+            department_name__in=Department.objects.filter(department_name__iexact=department).values('pk')
+        )
+        notices = notices.filter(department_name__department_name__iexact=department)
+        clubs = clubs.filter(department_name__department_name__iexact=department)
+
+    if event_type in (EventIndex.CLUB, EventIndex.DEPARTMENT):
+        events = events.filter(event_type=event_type)
 
-    if event_type == 'club':
-        dept_events = dept_events.none()
-    elif event_type == 'department':
-        club_events = club_events.none()
+    try:
+        page_number = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page_number = 1
+
+    # Every section shares the page number; a section that runs out of
+    # results renders empty rather than repeating its last page.
+    event_pages, notice_page, club_page, departments = await asyncio.gather(
+        _aevent_pages(events, ordering, page_number),
+        _apage(notices, page_number),
+        _apage(clubs, page_number),
+        _alist(Department.objects.all().order_by('department_name')),
+    )
+    pages = {
+        'club_events': event_pages[EventIndex.CLUB],
+        'dept_events': event_pages[EventIndex.DEPARTMENT],
+        'notices': notice_page,
+        'clubs': club_page,
+    }
 
-    departments = Department.objects.all().order_by('department_name')
     context = {
         'query': query,
         'date': date_str,
         'department': department,
         'type': event_type,
-        'club_events': club_events.order_by('-event_start_date'),
-        'dept_events': dept_events.order_by('-event_start_date'),
         'departments': departments,
+        'page_number': page_number,
+        'has_next_page': any(p and p.has_next() for p in pages.values()),
+        **pages,
     }
-    return render(request, 'search_results.html', context)
+    return await sync_to_async(render)(request, 'search_results.html', context)
 
 
 # -----------------------------
 # ⚙️ Admin Dashboard (Restricted)
 # -----------------------------
-@login_required
-@user_passes_test(lambda u: u.is_staff)
-def admin_dashboard(request):
+ADMIN_DASHBOARD_CACHE_KEY = "home:admin_dashboard"
+ADMIN_DASHBOARD_CACHE_TIMEOUT = 60
+
+
+def _department_event_count(model, **filters):
+    """Per-department row count of ``model`` as a correlated subquery.
+
+    Counting through subqueries keeps the Event and dEvent joins from
+    multiplying each other's rows.
+    """
+    counts = (
+        model.objects.filter(department_name=OuterRef("pk"), **filters)
+        .order_by()
+        .values("department_name")
+        .annotate(c=Count("id"))
+        .values("c")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def _admin_dashboard_context():
     today = now().date()
-    total_users = User.objects.count()
-    total_departments = Department.objects.count()
-    total_clubs = Club.objects.count()
-    total_events = Event.objects.count() + dEvent.objects.count()
-    upcoming_events = (
-        Event.objects.filter(event_start_date__gte=today).count() +
-        dEvent.objects.filter(event_start_date__gte=today).count()
+    departments = list(
+        Department.objects.annotate(
+            event_count=_department_event_count(Event),
+            devent_count=_department_event_count(dEvent),
+            upcoming_count=_department_event_count(Event, event_start_date__gte=today),
+            upcoming_devent_count=_department_event_count(dEvent, event_start_date__gte=today),
+        )
+        .order_by("department_name")
+        .values("department_name", "event_count", "devent_count", "upcoming_count", "upcoming_devent_count")
     )
 
     dept_counts = [
-        {
-            "name": dept.department_name,
-            "count": Event.objects.filter(department_name=dept).count() +
-                     dEvent.objects.filter(department_name=dept).count()
-        }
-        for dept in Department.objects.all().order_by("department_name")
+        {"name": d["department_name"], "count": d["event_count"] + d["devent_count"]}
+        for d in departments
     ]
 
-    context = {
-        "total_users": total_users,
-        "total_departments": total_departments,
-        "total_clubs": total_clubs,
-        "total_events": total_events,
-        "upcoming_events": upcoming_events,
+    return {
+        "total_users": User.objects.count(),
+        "total_departments": len(departments),
+        "total_clubs": Club.objects.count(),
+        "total_events": sum(d["count"] for d in dept_counts),
+        "upcoming_events": sum(d["upcoming_count"] + d["upcoming_devent_count"] for d in departments),
         "dept_counts": dept_counts,
     }
+
+
+@login_required
+@user_passes_test(lambda u: u.is_staff)
+def admin_dashboard(request):
+    fresh = request.GET.get("fresh") == "1" and request.user.is_staff
+    context = None if fresh else cache.get(ADMIN_DASHBOARD_CACHE_KEY)
+    if context is None:
+        context = _admin_dashboard_context()
+        cache.set(ADMIN_DASHBOARD_CACHE_KEY, context, ADMIN_DASHBOARD_CACHE_TIMEOUT)
     return render(request, "admin_dashboard.html", context)
@@ -1,6 +1,14 @@
 from django.contrib import admin
 from .models import PasswordReset
 from .models import Coordinator
+from .models import OutgoingEmail
 
 admin.site.register(PasswordReset)
-admin.site.register(Coordinator)
\ No newline at end of file
+admin.site.register(Coordinator)
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "to", "status", "attempts", "next_attempt_at", "sent_when")
+    list_filter = ("status",)
+    search_fields = ("to", "subject")
@@ -0,0 +1,91 @@
+"""
+Coordinator resolution for coordinator-only pages.
+
+The session only stores ``coordinator_name``. Views that need a coordinator
+use ``@coordinator_required``, which turns that into ``request.coordinator``,
+a Coordinator with its club and department already loaded, or redirects to
+the login page. Only those views read the session or the cache for it, so
+other requests (API calls, feed polls) are not marked ``Vary: Cookie``.
+
+The record is cached under the coordinator's name, so every session of that
+coordinator shares it, without the password columns, which must never be
+copied into the cache; ``signup.signals`` drops the entry when the
+coordinator, their club or their department is saved or deleted.
+"""
+from functools import wraps
+from urllib.parse import quote
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib import messages
+from django.core.cache import cache
+from django.shortcuts import redirect
+
+from .models import Coordinator
+
+COORDINATOR_CACHE_TIMEOUT = 60 * 60
+
+
+def coordinator_cache_key(coordinator_name: str) -> str:
+    return f"coordinator:{quote(coordinator_name)}"
+
+
+def invalidate_coordinators(*coordinator_names) -> None:
+    cache.delete_many([coordinator_cache_key(name) for name in coordinator_names])
+
+
+def _coordinators():
+    return (
+        Coordinator.objects.select_related("club_name", "department_name")
+        .defer("password", "department_name__password")
+    )
+
+
+def resolve_coordinator(coordinator_name: str):
+    """The Coordinator named ``coordinator_name`` with club and department, or None."""
+    key = coordinator_cache_key(coordinator_name)
+    coordinator = cache.get(key)
+    if coordinator is None:
+        coordinator = _coordinators().filter(coordinator_name=coordinator_name).first()
+        if coordinator is not None:
+            cache.set(key, coordinator, COORDINATOR_CACHE_TIMEOUT)
+    return coordinator
+
+
+async def aresolve_coordinator(coordinator_name: str):
+    key = coordinator_cache_key(coordinator_name)
+    coordinator = await cache.aget(key)
+    if coordinator is None:
+        coordinator = await _coordinators().filter(coordinator_name=coordinator_name).afirst()
+        if coordinator is not None:
+            await cache.aset(key, coordinator, COORDINATOR_CACHE_TIMEOUT)
+    return coordinator
+
+
+def coordinator_required(view):
+    """
+    Set ``request.coordinator`` from the session's ``coordinator_name``, or
+    redirect to the coordinator login unless a coordinator is signed in.
+    """
+    def login(request, coordinator_name):
+        if coordinator_name:
+            messages.error(request, "Coordinator not found.")
+        return redirect("coordinator_login")
+
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def awrapped(request, *args, **kwargs):
+            coordinator_name = await request.session.aget("coordinator_name")
+            request.coordinator = await aresolve_coordinator(coordinator_name) if coordinator_name else None
+            if request.coordinator is None:
+                return login(request, coordinator_name)
+            return await view(request, *args, **kwargs)
+        return awrapped
+
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        coordinator_name = request.session.get("coordinator_name")
+        request.coordinator = resolve_coordinator(coordinator_name) if coordinator_name else None
+        if request.coordinator is None:
+            return login(request, coordinator_name)
+        return view(request, *args, **kwargs)
+    return wrapped
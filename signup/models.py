@@ -30,4 +30,33 @@ class Coordinator(models.Model):
     phone_no = models.CharField(max_length=15, null=True, blank=True, default=None)
 
     def __str__(self):
-        return f"{self.coordinator_name} ({self.get_coordinator_type_display()})"
\ No newline at end of file
+        return f"{self.coordinator_name} ({self.get_coordinator_type_display()})"
+
+class OutgoingEmail(models.Model):
+    """A queued message, delivered by ``python manage.py send_queued_mail``."""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.TextField(help_text="Comma separated recipients")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(auto_now_add=True)
+    last_error = models.TextField(blank=True, default="")
+    created_when = models.DateTimeField(auto_now_add=True)
+    sent_when = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+    def recipients(self):
+        return [address for address in self.to.split(",") if address]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to} ({self.status})"
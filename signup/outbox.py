@@ -0,0 +1,150 @@
+"""
+Outgoing mail queue.
+
+Views call ``queue_email`` which only inserts an ``OutgoingEmail`` row, so a
+request never waits on SMTP. ``send_queued`` (run by the ``send_queued_mail``
+management command, or by the cron endpoint ``drain_mail_queue`` on hosts
+without a worker) delivers due messages in batches over one connection from
+``get_connection()`` and reschedules failures with exponential backoff.
+
+A batch is claimed in a short transaction (status ``sending`` with a lease
+in ``next_attempt_at``) and each result is committed as soon as the message
+is handed to the server, so a worker that dies mid-batch resends at most the
+message it was on once the lease runs out. Each claim counts as an attempt,
+so such a message is given up on after ``MAX_ATTEMPTS`` like any other.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection as db_connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 60
+# A claimed message not sent within this long is claimed again.
+SENDING_LEASE = timedelta(minutes=10)
+
+
+def queue_email(subject: str, body: str, to, from_email: str = None) -> OutgoingEmail:
+    """Queue a plain-text message for the mail worker."""
+    if isinstance(to, str):
+        to = [to]
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=",".join(to),
+    )
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff before the next try: 1, 2, 4, 8... minutes."""
+    return timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+
+
+def _claim(batch_size: int, max_attempts: int):
+    """
+    Mark up to ``batch_size`` due messages as ``sending`` and return them.
+    Claiming counts as an attempt, so a message whose sends never finish
+    (a hung server, a killed worker) still runs out of attempts.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        abandoned = OutgoingEmail.objects.filter(
+            status="sending", next_attempt_at__lte=now, attempts__gte=max_attempts,
+        ).update(status="failed", last_error="Not sent before the lease ran out")
+        if abandoned:
+            logger.error("Giving up on %d emails whose sends never finished", abandoned)
+        queryset = OutgoingEmail.objects.filter(
+            Q(status="pending") | Q(status="sending"), next_attempt_at__lte=now,
+        ).order_by("next_attempt_at", "pk")
+        if db_connection.features.has_select_for_update_skip_locked:
+            # Lets several workers drain the queue without sending twice.
+            queryset = queryset.select_for_update(skip_locked=True)
+        batch = list(queryset[:batch_size])
+        OutgoingEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+            status="sending", next_attempt_at=now + SENDING_LEASE, attempts=F("attempts") + 1,
+        )
+    for email in batch:
+        email.attempts += 1
+    return batch
+
+
+def _record_failure(email: OutgoingEmail, error: Exception, max_attempts: int) -> None:
+    email.last_error = repr(error)
+    if email.attempts >= max_attempts:
+        email.status = "failed"
+        logger.error("Giving up on email %s to %s: %r", email.pk, email.to, error)
+    else:
+        email.status = "pending"
+        email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+        logger.warning("Email %s to %s failed, retry %d: %r", email.pk, email.to, email.attempts, error)
+    email.save(update_fields=["last_error", "status", "next_attempt_at"])
+
+
+def send_queued(batch_size: int = 50, max_attempts: int = MAX_ATTEMPTS) -> tuple:
+    """
+    Send up to ``batch_size`` due messages over a single connection.
+
+    Returns ``(sent, failed)`` counts for this batch.
+    """
+    batch = _claim(batch_size, max_attempts)
+    if not batch:
+        return 0, 0
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as error:
+        # Nothing can go out; push the whole batch back.
+        for email in batch:
+            _record_failure(email, error, max_attempts)
+        return 0, len(batch)
+
+    sent = failed = 0
+    try:
+        for email in batch:
+            message = EmailMessage(
+                email.subject, email.body, email.from_email, email.recipients(),
+                connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as error:
+                _record_failure(email, error, max_attempts)
+                failed += 1
+                # The server may have dropped us; start the rest on a fresh connection.
+                connection.close()
+                try:
+                    connection.open()
+                except Exception:
+                    pass  # the next send retries the open and records its own failure
+                continue
+            email.status = "sent"
+            email.sent_when = timezone.now()
+            email.save(update_fields=["status", "sent_when"])
+            sent += 1
+    finally:
+        connection.close()
+    return sent, failed
+
+
+def drain(budget_seconds: float, batch_size: int = 10) -> tuple:
+    """Send batches until the queue is empty or ``budget_seconds`` have passed."""
+    deadline = time.monotonic() + budget_seconds
+    total_sent = total_failed = 0
+    while time.monotonic() < deadline:
+        sent, failed = send_queued(batch_size)
+        if not sent and not failed:
+            break
+        total_sent += sent
+        total_failed += failed
+    return total_sent, total_failed
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from event.models import Club, Department
+from .coordinators import invalidate_coordinators
+from .models import Coordinator
+
+
+@receiver(post_save, sender=Coordinator)
+@receiver(post_delete, sender=Coordinator)
+def invalidate_cached_coordinator(sender, instance, **kwargs):
+    invalidate_coordinators(instance.pk)
+
+
+@receiver(post_save, sender=Club)
+@receiver(post_save, sender=Department)
+def invalidate_coordinators_of(sender, instance, **kwargs):
+    # Cached coordinators carry a copy of their club and department.
+    field = "club_name" if sender is Club else "department_name"
+    names = list(Coordinator.objects.filter(**{field: instance.pk}).values_list("pk", flat=True))
+    if names:
+        invalidate_coordinators(*names)
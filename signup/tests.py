@@ -1,3 +1,172 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from event.models import Club, Department
+from .models import Coordinator, OutgoingEmail
+from .coordinators import coordinator_cache_key
+from .outbox import queue_email, send_queued
+
+
+@override_settings(
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    },
+)
+class OutboxTests(TestCase):
+    def test_register_only_enqueues(self):
+        response = self.client.post(reverse("register"), {
+            "first_name": "A", "last_name": "B", "username": "ab",
+            "email": "ab@banasthali.in", "password": "secret1",
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(mail.outbox), 0)
+        queued = OutgoingEmail.objects.get()
+        self.assertEqual(queued.to, "ab@banasthali.in")
+        self.assertIn("/verify-email/", queued.body)
+
+    def test_batch_shares_one_connection(self):
+        for i in range(3):
+            queue_email("Hi", "body", [f"user{i}@banasthali.in"])
+
+        with mock.patch("signup.outbox.get_connection", wraps=mail.get_connection) as get_connection:
+            self.assertEqual(send_queued(), (3, 0))
+        get_connection.assert_called_once()
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(OutgoingEmail.objects.exclude(status="sent").exists())
+
+    def test_failure_is_retried_with_backoff(self):
+        queued = queue_email("Hi", "body", ["user@banasthali.in"])
+        with mock.patch("django.core.mail.EmailMessage.send", side_effect=OSError("down")):
+            self.assertEqual(send_queued(), (0, 1))
+
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, "pending")
+        self.assertEqual(queued.attempts, 1)
+        self.assertGreater(queued.next_attempt_at, timezone.now())
+        # Not due yet, so the next run leaves it alone.
+        self.assertEqual(send_queued(), (0, 0))
+
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(send_queued(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_each_send_is_committed_on_its_own(self):
+        first = queue_email("Hi", "body", ["first@banasthali.in"])
+        second = queue_email("Hi", "body", ["second@banasthali.in"])
+        calls = []
+
+        def send(message):
+            calls.append(message)
+            if len(calls) == 2:
+                raise KeyboardInterrupt  # the worker dies mid-batch
+            return 1
+
+        with mock.patch("django.core.mail.EmailMessage.send", autospec=True, side_effect=send):
+            with self.assertRaises(KeyboardInterrupt):
+                send_queued()
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.status, "sent")
+        self.assertEqual(second.status, "sending")
+        self.assertEqual(send_queued(), (0, 0))  # still leased
+
+        OutgoingEmail.objects.filter(pk=second.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(send_queued(), (1, 0))
+        self.assertEqual([m.to for m in mail.outbox], [["second@banasthali.in"]])
+
+    def test_sends_that_never_finish_run_out_of_attempts(self):
+        queued = queue_email("Hi", "body", ["user@banasthali.in"])
+        with mock.patch("django.core.mail.EmailMessage.send", side_effect=KeyboardInterrupt):
+            for attempt in range(1, 4):
+                with self.assertRaises(KeyboardInterrupt):
+                    send_queued(max_attempts=3)
+                queued.refresh_from_db()
+                self.assertEqual((queued.status, queued.attempts), ("sending", attempt))
+                OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+
+        self.assertEqual(send_queued(max_attempts=3), (0, 0))
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, "failed")
+        self.assertEqual(len(mail.outbox), 0)
+
+    @override_settings(CRON_SECRET="s3cret")
+    def test_cron_endpoint_drains_the_queue(self):
+        queue_email("Hi", "body", ["user@banasthali.in"])
+        url = reverse("drain-mail-queue")
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION="Bearer wrong").status_code, 401)
+
+        response = self.client.get(url, HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(response.json(), {"sent": 1, "failed": 0})
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_cron_endpoint_is_off_without_a_secret(self):
+        self.assertEqual(self.client.get(reverse("drain-mail-queue")).status_code, 404)
+
+
+@override_settings(STORAGES={
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+})
+class CoordinatorTests(TestCase):
+    def setUp(self):
+        dept = Department.objects.create(department_name="CS", password="x", department_description="d")
+        self.club = Club.objects.create(club_name="GDSC", department_name=dept, club_description="c")
+        Coordinator.objects.create(
+            coordinator_name="lead", coordinator_type="club", club_name=self.club,
+            department_name=dept, email="lead@x.in", password="x",
+        )
+        session = self.client.session
+        session["coordinator_name"] = "lead"
+        session.save()
+
+    def coordinator_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [q["sql"] for q in queries if "signup_coordinator" in q["sql"]]
+
+    def test_coordinator_is_resolved_once_and_cached(self):
+        first = self.coordinator_queries(reverse("notices"))
+        self.assertEqual(len(first), 1)
+        self.assertIn("event_club", first[0])  # club and department joined in
+        self.assertEqual(self.coordinator_queries(reverse("eventspage1")), [])
+
+    def test_cached_coordinator_has_no_passwords(self):
+        self.coordinator_queries(reverse("notices"))
+        cached = cache.get(coordinator_cache_key("lead"))
+        self.assertEqual(cached.email, "lead@x.in")
+        self.assertNotIn("password", cached.__dict__)
+        self.assertNotIn("password", cached.department_name.__dict__)
+
+    def test_club_change_invalidates_cached_coordinator(self):
+        self.coordinator_queries(reverse("notices"))
+        self.club.club_description = "changed"
+        self.club.save()
+        self.assertEqual(len(self.coordinator_queries(reverse("notices"))), 1)
+
+    def test_other_pages_do_not_look_up_the_coordinator(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/event/feeds/events.ics")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q for q in queries if "signup_coordinator" in q["sql"]])
+        self.assertNotIn("Cookie", response.get("Vary", ""))
+        self.assertIsNone(cache.get(coordinator_cache_key("lead")))
+
+    def test_missing_coordinator_redirects_to_login(self):
+        Coordinator.objects.all().delete()
+        response = self.client.get(reverse("eventspage1"))
+        self.assertRedirects(response, reverse("coordinator_login"), fetch_redirect_response=False)
+
+        self.client.cookies.clear()
+        response = self.client.get(reverse("notices"))
+        self.assertRedirects(response, reverse("coordinator_login"), fetch_redirect_response=False)
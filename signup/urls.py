@@ -14,6 +14,7 @@ urlpatterns = [
     path('profile/', views.profile, name='profile'),
     path('coordinator_login/', views.coordinator_view, name='coordinator_login'),
     path('coordinator_dashboard/', views.coordinator_dashboard, name='coordinator_dashboard'),
+    path('cron/send-queued-mail/', views.drain_mail_queue, name='drain-mail-queue'),
     #path('coordinator_dashboard_dept/', views.coordinator_dash_dept, name='coordinator_dashboard_dept'),
 
 
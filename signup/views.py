@@ -4,21 +4,24 @@ from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.conf import settings
-from django.core.mail import EmailMessage
 from django.utils import timezone
 from django.urls import reverse
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes
 from django.contrib.auth.tokens import default_token_generator
+from .coordinators import coordinator_required
 from .models import Coordinator, PasswordReset  # explicitly import models used
 from .models import *  # if you have many local models; consider listing explicitly
+from .outbox import drain, queue_email
+from django.http import JsonResponse
+from clue.cron import cron_job
 import re
 
 
 def _send_verification_email(request, user: User) -> None:
     """
-    Build and send an email verification link. Uses DEFAULT_FROM_EMAIL if set,
-    fails silently to avoid raising errors on email send in production.
+    Build an email verification link and queue it for the mail worker
+    (``manage.py send_queued_mail``), so registration never waits on SMTP.
     """
     uid = urlsafe_base64_encode(force_bytes(user.pk))
     token = default_token_generator.make_token(user)
@@ -32,13 +35,7 @@ def _send_verification_email(request, user: User) -> None:
         'If you did not request this, ignore this email.'
     )
     from_email = getattr(settings, "DEFAULT_FROM_EMAIL", settings.EMAIL_HOST_USER)
-    email_message = EmailMessage(subject, body, from_email, [user.email])
-    email_message.fail_silently = True
-    try:
-        email_message.send()
-    except Exception:
-        # fail silently, but you can log the exception if you want
-        pass
+    queue_email(subject, body, [user.email], from_email)
 
 
 def RegisterView(request):
@@ -159,7 +156,7 @@ def LogoutView(request):
 
 def ForgotPassword(request):
     """
-    Request a password reset link. Creates a PasswordReset entry (model) and emails the reset link.
+    Request a password reset link. Creates a PasswordReset entry (model) and queues the reset link email.
     """
     if request.method == "POST":
         email = request.POST.get('email', '').strip().lower()
@@ -175,18 +172,7 @@ def ForgotPassword(request):
 
             email_body = f'Reset your password using the link below:\n\n{full_password_reset_url}'
             from_email = getattr(settings, "DEFAULT_FROM_EMAIL", settings.EMAIL_HOST_USER)
-
-            email_message = EmailMessage(
-                'Reset your password',
-                email_body,
-                from_email,
-                [email]
-            )
-            email_message.fail_silently = True
-            try:
-                email_message.send()
-            except Exception:
-                pass
+            queue_email('Reset your password', email_body, [email], from_email)
 
             return redirect('password-reset-sent', reset_id=new_password_reset.reset_id)
 
@@ -313,22 +299,16 @@ def coordinator_view(request):
     return render(request, 'coordinator_login.html')
 
 
+@coordinator_required
 def coordinator_dashboard(request):
     """
     Displays coordinator stats for department or club.
-    Requires that coordinator_name is in session.
+    Requires a signed-in coordinator.
     """
-    if 'coordinator_name' not in request.session:
-        return redirect('coordinator_login')
-
-    coordinator_name = request.session['coordinator_name']
+    coordinator = request.coordinator
+    coordinator_name = coordinator.coordinator_name
     email = request.session.get('email', None)
 
-    try:
-        coordinator = Coordinator.objects.get(coordinator_name=coordinator_name)
-    except Coordinator.DoesNotExist:
-        return redirect('coordinator_login')
-
     from event.models import Event, Notice
     from department.models import dEvent
     from django.utils.timezone import now as tz_now
@@ -356,3 +336,16 @@ def coordinator_dashboard(request):
         'notices_count': notices_count,
     })
     return render(request, 'coordinator_dashboard.html', context)
+
+
+@cron_job
+def drain_mail_queue(request):
+    """
+    Send queued mail for up to ``MAIL_CRON_BUDGET`` seconds.
+
+    Called by the Vercel cron job in vercel.json (or any scheduler), see
+    ``clue.cron``; hosts that run the ``send_queued_mail --loop`` worker
+    leave ``CRON_SECRET`` unset, which turns the endpoint off.
+    """
+    sent, failed = drain(settings.MAIL_CRON_BUDGET)
+    return JsonResponse({'sent': sent, 'failed': failed})